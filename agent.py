@@ -7,17 +7,75 @@ Analyzes founder voice check-ins and matches them with relevant founders
 import os
 import json
 import asyncio
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from dotenv import load_dotenv
 
+from embedding_matrix import EmbeddingMatrix
+from founder_embeddings import build_founder_index, load_founders
+from hybrid_search import HybridRanker
+from keyword_index import FounderKeywordSearch
+from model_holder import ModelHolder
+
 load_dotenv()
 
+MODEL_NAME = "claude-3-5-sonnet-20241022"
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
 class FounderMatchingAgent:
-    """Agent that processes voice check-ins and finds matching founders"""
+    """Agent that processes voice check-ins and finds matching founders
     
-    def __init__(self):
-        self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+    Uses the async Anthropic client: at most `max_concurrency` requests are
+    in flight, and each one is abandoned after `timeout` seconds. Reasons for
+    all matches come from one batched call; any the batch misses are
+    requested individually, in parallel.
+    """
+    
+    def __init__(self, client=None, max_concurrency: int = 4, timeout: float = 30.0,
+                 founders_path: str = "founders_db.json", semantic_search: bool = True):
+        self.client = client or AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        # Created on first use, inside the running event loop (Python 3.9)
+        self._semaphore = None
         
+        # Founder database, indexed once; the same hybrid (BM25 + embedding)
+        # ranker as the MCP hybrid_search tool. The founder vectors come from
+        # the shared founder_embeddings artifact and are loaded on first use.
+        data, source_hash = load_founders(founders_path)
+        self._founders = data["founders"]
+        self._founders_hash = source_hash
+        self._founder_index = None
+        self.embedding_model = ModelHolder(EMBEDDING_MODEL_NAME) if semantic_search else None
+        self.ranker = HybridRanker(
+            FounderKeywordSearch(self._founders),
+            vector_index=self._get_founder_index if semantic_search else None,
+            encode=self.embedding_model.encode if semantic_search else None
+        )
+    
+    def _get_founder_index(self):
+        """Founder vector index over the shared artifact, built on first use"""
+        if self._founder_index is None:
+            matrix = EmbeddingMatrix(os.getenv("FOUNDER_EMBEDDINGS_PATH", "founder_embeddings"))
+            self._founder_index = build_founder_index(self._founders, self._founders_hash, matrix,
+                                                      EMBEDDING_MODEL_NAME, self.embedding_model.encode)
+        return self._founder_index
+    
+    async def _complete(self, prompt: str, max_tokens: int) -> str:
+        """Run one messages.create call under the concurrency limit and timeout"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            response = await asyncio.wait_for(
+                self.client.messages.create(
+                    model=MODEL_NAME,
+                    max_tokens=max_tokens,
+                    messages=[{"role": "user", "content": prompt}]
+                ),
+                self.timeout
+            )
+        return response.content[0].text
+    
     async def analyze_checkin(self, transcript: str) -> dict:
         """
         Analyze a voice check-in transcript and match with founders
@@ -52,13 +110,7 @@ Respond in JSON format:
 
         print("🔍 Analyzing check-in transcript...\n")
         
-        extraction_response = self.client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1024,
-            messages=[{"role": "user", "content": extraction_prompt}]
-        )
-        
-        extracted_info = json.loads(extraction_response.content[0].text)
+        extracted_info = json.loads(await self._complete(extraction_prompt, max_tokens=1024))
         print("📊 Extracted Information:")
         print(json.dumps(extracted_info, indent=2))
         print()
@@ -71,7 +123,7 @@ Respond in JSON format:
         all_skills = extracted_info.get("skills_needed", [])
         stuck_on = extracted_info.get("stuck_on", "")
         
-        # Create a detailed search description for vector search
+        # Create a detailed search description for semantic search
         search_description = f"""
         The founder is working on: {extracted_info.get('worked_on', '')}
         
@@ -84,80 +136,30 @@ Respond in JSON format:
         Topics: {', '.join(extracted_info.get('topics', []))}
         """
         
-        # For demo purposes, we'll simulate the MCP tool calls
-        # In production, these would be actual MCP tool calls
         print("🔎 Searching for matching founders...\n")
         
-        # Load founder database for simulation
-        with open("founders_db.json", "r") as f:
-            db = json.load(f)
-            founders = db["founders"]
-        
-        # Simple matching logic (in production, this would use vector_search tool)
-        matches = []
+        # One hybrid ranking pass: BM25 on the extracted terms, embeddings on
+        # the full description (off the event loop; the model may be loading)
         search_terms = all_needs + all_skills + extracted_info.get("topics", [])
-        
-        for founder in founders:
-            score = 0
-            searchable = (
-                " ".join(founder["expertise"]) + " " +
-                " ".join(founder["helpfulIn"]) + " " +
-                founder["bio"]
-            ).lower()
-            
-            for term in search_terms:
-                if term.lower() in searchable:
-                    score += searchable.count(term.lower())
-            
-            if score > 0:
-                matches.append({
-                    "founder": founder,
-                    "score": score
-                })
-        
-        # Sort by score and get top 3
-        matches.sort(key=lambda x: x["score"], reverse=True)
-        top_matches = matches[:3]
+        top_matches = await asyncio.to_thread(
+            self.ranker.search, " ".join(search_terms), 3, semantic_query=search_description
+        )
         
         print(f"✅ Found {len(top_matches)} matching founders\n")
         
-        # Step 3: Generate reasons for each match
-        matched_founders = []
+        # Step 3: Generate reasons for all matches
+        needs_context = {"stuck_on": stuck_on, "needs": all_needs, "skills": all_skills}
+        reasons = await self.generate_reasons([m["founder"] for m in top_matches], needs_context)
         
+        matched_founders = []
         for match in top_matches:
             founder = match["founder"]
-            
-            # Generate personalized reason
-            reason_prompt = f"""Given this founder's needs and this expert's profile, write a short 1-2 sentence explanation of why this is a good match.
-
-Founder needs:
-- Stuck on: {stuck_on}
-- Needs help with: {', '.join(all_needs)}
-- Skills needed: {', '.join(all_skills)}
-
-Expert profile:
-- Name: {founder['name']}
-- Company: {founder['company']}
-- Expertise: {', '.join(founder['expertise'])}
-- Helpful in: {', '.join(founder['helpfulIn'])}
-- Bio: {founder['bio']}
-
-Write a short, friendly reason why this expert can help. Be specific about the skill match."""
-
-            reason_response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=150,
-                messages=[{"role": "user", "content": reason_prompt}]
-            )
-            
-            reason = reason_response.content[0].text.strip()
-            
             matched_founders.append({
                 "id": founder["id"],
                 "name": founder["name"],
                 "company": founder["company"],
                 "expertise": founder["expertise"][:3],
-                "reason": reason
+                "reason": reasons[founder["id"]]
             })
         
         # Step 4: Create summary
@@ -172,6 +174,72 @@ Write a short, friendly reason why this expert can help. Be specific about the s
         
         return result
     
+    @staticmethod
+    def _needs_section(needs_context: dict) -> str:
+        return f"""Founder needs:
+- Stuck on: {needs_context['stuck_on']}
+- Needs help with: {', '.join(needs_context['needs'])}
+- Skills needed: {', '.join(needs_context['skills'])}"""
+    
+    @staticmethod
+    def _profile_section(founder: dict) -> str:
+        return f"""- Name: {founder['name']}
+- Company: {founder['company']}
+- Expertise: {', '.join(founder['expertise'])}
+- Helpful in: {', '.join(founder['helpfulIn'])}
+- Bio: {founder['bio']}"""
+    
+    async def generate_reasons(self, founders: list, needs_context: dict) -> dict:
+        """Return {founder id: reason}, from one batched call where possible"""
+        if not founders:
+            return {}
+        
+        profiles = "\n\n".join(
+            f"Expert id: {founder['id']}\n{self._profile_section(founder)}" for founder in founders
+        )
+        batch_prompt = f"""Given this founder's needs and these experts' profiles, write a short 1-2 sentence explanation for each expert of why they are a good match.
+
+{self._needs_section(needs_context)}
+
+Experts:
+{profiles}
+
+Write a short, friendly reason why each expert can help. Be specific about the skill match.
+Respond with ONLY valid JSON mapping each expert id to its reason:
+{{"expert_id": "reason"}}"""
+        
+        reasons = {}
+        try:
+            batch = json.loads(await self._complete(batch_prompt, max_tokens=150 * len(founders)))
+            reasons = {founder["id"]: str(batch[founder["id"]]).strip()
+                       for founder in founders if batch.get(founder["id"])}
+        except Exception as e:
+            print(f"Batched reason generation failed: {e}, asking per match")
+        
+        missing = [founder for founder in founders if founder["id"] not in reasons]
+        if missing:
+            results = await asyncio.gather(
+                *(self._single_reason(founder, needs_context) for founder in missing)
+            )
+            reasons.update(zip((founder["id"] for founder in missing), results))
+        return reasons
+    
+    async def _single_reason(self, founder: dict, needs_context: dict) -> str:
+        """Reason for one match; falls back to a template if the call fails"""
+        reason_prompt = f"""Given this founder's needs and this expert's profile, write a short 1-2 sentence explanation of why this is a good match.
+
+{self._needs_section(needs_context)}
+
+Expert profile:
+{self._profile_section(founder)}
+
+Write a short, friendly reason why this expert can help. Be specific about the skill match."""
+        try:
+            return (await self._complete(reason_prompt, max_tokens=150)).strip()
+        except Exception as e:
+            print(f"Reason generation failed for {founder['id']}: {e}")
+            return f"{founder['name']} has expertise in {', '.join(founder['expertise'][:3])}."
+    
     def format_output(self, result: dict) -> str:
         """Format the result as a nice JSON string"""
         return json.dumps(result, indent=2)
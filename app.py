@@ -4,10 +4,12 @@ Flask Backend for Founder Matching System
 Complete API with all endpoints for hackathon requirements
 """
 
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, Response, stream_with_context, g, has_request_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import json
 import os
+from contextlib import ExitStack
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -15,11 +17,34 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from db_manager_supabase import DatabaseManager
-from sentence_transformers import SentenceTransformer
-import numpy as np
+from db_manager_sqlite import DatabaseManager as SQLiteDatabaseManager
+from change_feed import ChangeFeed, FeedFull
+from enrichment import enrich
+from extraction_cache import ExtractionCache
+from embedding_store import EmbeddingStore
+from job_queue import JobQueue, run_stages
+from matching_engine import MatchingEngine
+from model_holder import ModelHolder
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor, iter_pages
+from serialization import dumps, dumps_bytes
+from vector_index import create_index
 import google.generativeai as genai
 
+
+class CompactJSONProvider(DefaultJSONProvider):
+    """jsonify() through the compact (orjson when installed) encoder
+    
+    Pretty-printed only when the request asks for it with ?pretty=1.
+    """
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = has_request_context() and request.args.get('pretty') == '1'
+        return self._app.response_class(dumps_bytes(obj, pretty=pretty, default=self.default), mimetype=self.mimetype)
+
+
 app = Flask(__name__)
+app.json = CompactJSONProvider(app)
 CORS(app)
 
 # Session configuration for admin authentication
@@ -28,17 +53,81 @@ app.secret_key = os.getenv('SECRET_KEY', 'hackathon-demo-secret-key-change-in-pr
 # Admin password (from environment or default for demo)
 ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin123')
 
-# Initialize database (Supabase - uses SUPABASE_URL and SUPABASE_KEY env vars)
-db = DatabaseManager()
+# Initialize database (DATABASE_BACKEND: supabase (default) or sqlite)
+# Supabase uses SUPABASE_URL and SUPABASE_KEY; SQLite uses SQLITE_DB_PATH
+# Every write is published to the change feed that backs the admin SSE stream.
+# Each open stream holds a server thread, so at most SSE_MAX_SUBSCRIBERS
+# (default 2 of gunicorn's 8 threads per worker) are served at once
+DATABASE_BACKEND = os.getenv('DATABASE_BACKEND', 'supabase')
+change_feed = ChangeFeed(max_subscribers=int(os.getenv('SSE_MAX_SUBSCRIBERS', 2)))
+if DATABASE_BACKEND == 'supabase':
+    db = DatabaseManager(change_feed=change_feed)
+elif DATABASE_BACKEND == 'sqlite':
+    db = SQLiteDatabaseManager(os.getenv('SQLITE_DB_PATH', 'founder_matching.sqlite3'), change_feed=change_feed)
+else:
+    raise ValueError(f"Unknown DATABASE_BACKEND: {DATABASE_BACKEND}. Choose 'supabase' or 'sqlite'")
 
 # Initialize AI client (Gemini)
+GEMINI_MODEL_NAME = 'gemini-2.5-flash'
 gemini_model = None
 if os.getenv("GEMINI_API_KEY"):
     genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-    gemini_model = genai.GenerativeModel('gemini-2.5-flash')
+    gemini_model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+
+# Cache of LLM extractions so repeated or retried check-in text costs nothing
+# EXTRACTION_CACHE_PATH adds a SQLite tier shared by workers and restarts
+# Bump EXTRACTION_PROMPT_VERSION whenever the extraction prompt changes
+EXTRACTION_PROMPT_VERSION = '1'
+extraction_cache = ExtractionCache(
+    max_entries=int(os.getenv('EXTRACTION_CACHE_SIZE', 1024)),
+    ttl_seconds=int(os.getenv('EXTRACTION_CACHE_TTL', 7 * 24 * 3600)),
+    path=os.getenv('EXTRACTION_CACHE_PATH') or None
+)
 
 # Initialize embedding model
-embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+# Loaded on a background thread (EMBEDDING_MODEL_LOADING=lazy defers it to
+# first use) so cold starts serve non-embedding endpoints right away.
+# EMBEDDING_MODEL_LOADING=eager loads it at import instead; gunicorn.conf.py
+# uses that with preload_app so every worker shares the master's copy.
+# Label embeddings are cached on disk (shared by all workers) so each label is encoded once
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+EMBEDDING_MODEL_LOADING = os.getenv('EMBEDDING_MODEL_LOADING', 'background')
+embedding_model = ModelHolder(EMBEDDING_MODEL_NAME)
+if EMBEDDING_MODEL_LOADING == 'background':
+    embedding_model.start()
+elif EMBEDDING_MODEL_LOADING == 'eager':
+    embedding_model.get()
+embedding_store = EmbeddingStore(os.getenv('EMBEDDING_STORE_PATH', 'embeddings.sqlite3'), EMBEDDING_MODEL_NAME)
+learning_index = create_index(os.getenv('VECTOR_INDEX_BACKEND', 'flat'))
+matching_engine = MatchingEngine(embedding_model, embedding_store=embedding_store,
+                                 learning_index=learning_index)
+
+# Background workers for the check-in pipeline, so slow check-ins don't hold
+# gunicorn request threads (CHECKIN_QUEUE_BACKEND: thread or process; the
+# process backend skips the change feed, learning index and stage progress)
+# JOB_STORE_PATH keeps job status in a SQLite file so any worker can report
+# it; with several workers (WEB_CONCURRENCY > 1) it defaults to jobs.sqlite3
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))
+checkin_jobs = JobQueue(
+    max_workers=int(os.getenv('CHECKIN_WORKERS', 4)),
+    backend=os.getenv('CHECKIN_QUEUE_BACKEND', 'thread'),
+    store_path=os.getenv('JOB_STORE_PATH') or ('jobs.sqlite3' if WEB_CONCURRENCY > 1 else None)
+)
+
+
+@app.before_request
+def open_identity_map():
+    """Fetch each database row at most once per request"""
+    g.db_scope = ExitStack()
+    g.db_scope.enter_context(db.identity_map())
+
+
+@app.teardown_request
+def close_identity_map(error=None):
+    scope = g.pop('db_scope', None)
+    if scope is not None:
+        scope.close()
+
 
 # Load founder profiles for reference
 with open('founders_db.json', 'r') as f:
@@ -46,12 +135,32 @@ with open('founders_db.json', 'r') as f:
     FOUNDER_PROFILES_MAP = {f['id']: f for f in founder_profiles}
 
 
+def preload_shared_state():
+    """Load everything workers can share before gunicorn forks them
+
+    Called from gunicorn.conf.py in the master: the model weights, the
+    learning index and the founder profiles are then shared copy-on-write
+    by every worker instead of being loaded once per worker.
+    """
+    embedding_model.get()
+    try:
+        matching_engine.preload_learning_index(db.get_all_active_learnings())
+    except Exception as e:
+        # Workers rebuild the index on the first check-in instead
+        print(f"Could not preload the learning index: {e}")
+    print(f"Preloaded {EMBEDDING_MODEL_NAME}, {len(learning_index)} learnings "
+          f"and {len(FOUNDER_PROFILES_MAP)} founder profiles")
+
+
 # =============== MCP TOOL IMPLEMENTATIONS ===============
 
 def extract_needs_learnings_tool(text: str, user_id: str = "unknown") -> dict:
     """MCP Tool: Extract needs and learnings from text"""
     
     if gemini_model:
+        cached = extraction_cache.get(text, GEMINI_MODEL_NAME, EXTRACTION_PROMPT_VERSION)
+        if cached is not None:
+            return cached
         try:
             prompt = f"""You are analyzing a startup founder's weekly check-in. Extract concrete needs (things they need help with) and learnings/skills (things they learned or can help others with).
 
@@ -83,6 +192,7 @@ Respond with ONLY valid JSON in this exact format:
                 response_text = response_text.split('```')[1].split('```')[0].strip()
             
             result = json.loads(response_text)
+            extraction_cache.put(text, GEMINI_MODEL_NAME, EXTRACTION_PROMPT_VERSION, result)
             return result
         except Exception as e:
             print(f"AI extraction failed: {e}, using fallback")
@@ -119,67 +229,49 @@ Respond with ONLY valid JSON in this exact format:
 
 def compute_matches_tool(needs: list, learnings: list, limit: int = 3) -> dict:
     """MCP Tool: Compute matches between needs and learnings"""
-    
-    matches = []
-    
-    for need in needs:
-        need_id = need.get("id", "")
-        need_user_id = need.get("user_id", "")
-        need_label = need.get("label", "")
-        need_category = need.get("category", "")
-        
-        need_embedding = embedding_model.encode([need_label])[0]
-        
-        scored_learnings = []
-        
-        for learning in learnings:
-            learning_user_id = learning.get("user_id", "")
-            
-            # Don't match a founder with themselves
-            if learning_user_id == need_user_id:
-                continue
-            
-            learning_label = learning.get("label", "")
-            learning_category = learning.get("category", "")
-            
-            # Compute semantic similarity
-            learning_embedding = embedding_model.encode([learning_label])[0]
-            similarity = np.dot(need_embedding, learning_embedding) / (
-                np.linalg.norm(need_embedding) * np.linalg.norm(learning_embedding)
-            )
-            
-            # Category bonus
-            category_bonus = 0.2 if need_category == learning_category else 0
-            
-            # Final score
-            score = float(similarity) + category_bonus
-            
-            # Generate reason
-            if need_category == learning_category:
-                reason = f"Both focus on {need_category}. The expert's experience with '{learning_label}' directly addresses your need for '{need_label}'"
-            else:
-                reason = f"The expert's experience with '{learning_label}' can help with your need for '{need_label}'"
-            
-            scored_learnings.append({
-                "need_id": need_id,
-                "expert_user_id": learning_user_id,
-                "score": round(score, 3),
-                "reason": reason,
-                "matched_learning": learning_label
-            })
-        
-        # Sort by score and take top N
-        scored_learnings.sort(key=lambda x: x["score"], reverse=True)
-        matches.extend(scored_learnings[:limit])
-    
-    return {
-        "total_matches": len(matches),
-        "matches": matches
-    }
+    return matching_engine.compute_matches(needs, learnings, limit=limit)
 
 
 # =============== API ENDPOINTS ===============
 
+
+def list_response(key: str, table: str, list_all, relations: dict = None, status: str = None):
+    """Body of a list endpoint, in one of three modes
+    
+    - no parameters: the whole list, as before
+    - ?limit=N[&cursor=C]: one keyset page plus "next_cursor" (null on the last page)
+    - ?format=ndjson (or Accept: application/x-ndjson): every row after the
+      cursor as newline-delimited JSON, read and enriched one page at a time
+      so memory stays bounded and the first rows go out immediately
+    """
+    try:
+        after = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    limit = request.args.get('limit', type=int)
+    page_size = max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+    fetch_page = lambda cursor, size: db.get_page(table, size, cursor, status=status)
+    
+    if request.args.get('format') == 'ndjson' or 'application/x-ndjson' in request.headers.get('Accept', ''):
+        def stream():
+            for page in iter_pages(fetch_page, page_size, after):
+                for row in (enrich(db, page, relations) if relations else page):
+                    yield dumps(row) + "\n"
+        return Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+    
+    if limit is None and after is None:
+        rows = list_all()
+        next_cursor = None
+    else:
+        rows = fetch_page(after, page_size)
+        next_cursor = encode_cursor(rows[-1]) if len(rows) == page_size else None
+    
+    body = {key: enrich(db, rows, relations) if relations else rows}
+    if limit is not None or after is not None:
+        body["next_cursor"] = next_cursor
+    return jsonify(body)
+
+
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     """Founder login/signup page"""
@@ -303,9 +395,8 @@ def get_current_user():
 
 @app.route('/api/users', methods=['GET'])
 def get_users():
-    """Get all users"""
-    users = db.get_all_users()
-    return jsonify({"users": users})
+    """Get all users (paginated / NDJSON, see list_response)"""
+    return list_response("users", "users", db.get_all_users)
 
 
 @app.route('/api/users/<user_id>', methods=['GET'])
@@ -415,9 +506,125 @@ def create_user():
 
 # ========== NEEDS & LEARNINGS SUBMISSION ==========
 
+# Check-in pipeline stages. Each stage reads and extends a plain-data context
+# dict so the pipeline can run on the job queue's thread or process backend.
+
+def checkin_stage_extract(ctx: dict):
+    """Step 1: Extract needs and learnings using MCP tool"""
+    ctx['extraction'] = extract_needs_learnings_tool(ctx['text'], ctx['user_id'])
+
+
+def checkin_stage_save(ctx: dict):
+    """Step 2: Save needs/learnings and update the user's skills"""
+    user_id = ctx['user_id']
+    extraction = ctx['extraction']
+    ctx['created'] = db.create_needs_and_learnings(
+        user_id=user_id,
+        needs=extraction['needs'],
+        learnings=extraction['learnings']
+    )
+    created = ctx['created']
+    matching_engine.warm([item['label'] for item in created['needs'] + created['learnings']])
+    
+    # Update user's skills based on their learnings
+    db.update_user_skills(user_id, extraction['learnings'])
+
+
+def checkin_stage_award_xp(ctx: dict):
+    """Step 3: Award XP for submitting check-in"""
+    ctx['xp_result'] = db.award_xp(ctx['user_id'], 10, "Weekly check-in submitted",
+                                   stats={"total_checkins": 1})
+
+
+def checkin_stage_match(ctx: dict):
+    """Step 4: Incrementally score only what changed and store new suggestions"""
+    created = ctx['created']
+    all_needs = db.get_all_active_needs()
+    all_learnings = db.get_all_active_learnings()
+    
+    # (new needs x all learnings) and (other needs x new learnings)
+    matches_result = matching_engine.compute_incremental_matches(
+        created['needs'], created['learnings'], all_needs, all_learnings, limit=3
+    )
+    
+    # Merge candidates into each need's stored top matches
+    new_need_ids = {n['id'] for n in created['needs']}
+    affected_need_ids = {m['need_id'] for m in matches_result['matches']} - new_need_ids
+    existing_matches = db.get_matches_for_needs(list(affected_need_ids))
+    
+    # One bulk upsert; (need_id, expert_user_id) pairs are never duplicated
+    selected = MatchingEngine.select_new_candidates(matches_result['matches'], existing_matches, limit=3)
+    need_owners = {need['id']: need['user_id'] for need in all_needs}
+    db.create_matches_bulk([dict(match, need_user_id=need_owners[match['need_id']]) for match in selected],
+                           upsert=True)
+    
+    # Then trim every need that gained suggestions back to its top 3
+    touched_need_ids = {m['need_id'] for m in selected}
+    surplus = MatchingEngine.surplus_matches(db.get_matches_for_needs(list(touched_need_ids)), limit=3)
+    if surplus:
+        db.delete_matches([m['id'] for m in surplus])
+
+
+def checkin_stage_respond(ctx: dict):
+    """Step 5: Enrich the user's matches and build the response payload"""
+    user_id = ctx['user_id']
+    created = ctx['created']
+    xp_result = ctx['xp_result']
+    
+    user_matches = enrich(db, db.get_matches_for_user(user_id)[:3], {
+        "expert": ("expert_user_id", "users")
+    })
+    enriched_matches = []
+    
+    for match in user_matches:
+        expert = match['expert']
+        if expert:
+            enriched_matches.append({
+                "match_id": match['id'],
+                "expert": expert,
+                "score": match['score'],
+                "reason": match['reason'],
+                "status": match['status']
+            })
+    
+    # Get updated user profile with skills
+    updated_user = db.get_user(user_id)
+    
+    ctx['response'] = {
+        "summary": f"Extracted {len(created['needs'])} needs and {len(created['learnings'])} learnings from your check-in. Your skill profile has been updated!",
+        "needs": created['needs'],
+        "learnings": created['learnings'],
+        "skills": updated_user.get('skills', []),
+        "matches": enriched_matches,
+        "xp_gained": xp_result.get('xp_gained', 0) if xp_result else 0,
+        "total_xp": xp_result.get('total_xp', 0) if xp_result else 0,
+        "level": xp_result.get('level', 1) if xp_result else 1,
+        "leveled_up": xp_result.get('leveled_up', False) if xp_result else False,
+        "new_badges": xp_result.get('new_badges', []) if xp_result else []
+    }
+
+
+def checkin_scope():
+    """Share one identity map across all stages of a check-in job"""
+    return db.identity_map()
+
+
+CHECKIN_STAGES = [
+    ("extract", checkin_stage_extract),
+    ("save", checkin_stage_save),
+    ("award_xp", checkin_stage_award_xp),
+    ("match", checkin_stage_match),
+    ("respond", checkin_stage_respond),
+]
+
+
 @app.route('/api/submit-checkin', methods=['POST'])
 def submit_checkin():
-    """Submit weekly check-in and extract needs/learnings"""
+    """Submit weekly check-in; processing runs in the background job queue
+    
+    Returns 202 with a job id to poll at /api/jobs/<job_id>. Pass ?wait=1
+    to run the pipeline inline and get the result in this response.
+    """
     try:
         # Check if user is logged in
         if not session.get('user_id'):
@@ -430,77 +637,33 @@ def submit_checkin():
         if not text or len(text.strip()) < 20:
             return jsonify({"error": "Please provide a longer check-in"}), 400
         
-        # Step 1: Extract needs and learnings using MCP tool
-        extraction = extract_needs_learnings_tool(text, user_id)
-        
-        # Step 2: Save to database
-        result = db.create_needs_and_learnings(
-            user_id=user_id,
-            needs=extraction['needs'],
-            learnings=extraction['learnings']
-        )
-        
-        # Step 2.5: Update user's skills based on their learnings
-        db.update_user_skills(user_id, extraction['learnings'])
-        
-        # Step 2.6: Award XP for submitting check-in
-        xp_result = db.award_xp(user_id, 10, "Weekly check-in submitted")
-        db.update_user_stats(user_id, "total_checkins", 1)
-        
-        # Step 3: Get all active needs and learnings for matching
-        all_needs = db.get_all_active_needs()
-        all_learnings = db.get_all_active_learnings()
-        
-        # Step 4: Compute matches using MCP tool
-        matches_result = compute_matches_tool(all_needs, all_learnings, limit=3)
-        
-        # Step 5: Save top matches to database
-        for match in matches_result['matches'][:5]:
-            if match['expert_user_id'] != user_id:  # Don't create self-matches
-                db.create_match(
-                    need_id=match['need_id'],
-                    need_user_id=user_id,
-                    expert_user_id=match['expert_user_id'],
-                    score=match['score'],
-                    reason=match['reason']
-                )
+        context = {"user_id": user_id, "text": text}
         
-        # Step 6: Get user details for matches
-        user_matches = db.get_matches_for_user(user_id)
-        enriched_matches = []
-        
-        for match in user_matches[:3]:
-            expert = db.get_user(match['expert_user_id'])
-            if expert:
-                enriched_matches.append({
-                    "match_id": match['id'],
-                    "expert": expert,
-                    "score": match['score'],
-                    "reason": match['reason'],
-                    "status": match['status']
-                })
-        
-        # Get updated user profile with skills
-        updated_user = db.get_user(user_id)
+        if request.args.get('wait'):
+            return jsonify(run_stages(CHECKIN_STAGES, context, scope=checkin_scope)['response'])
         
+        job_id = checkin_jobs.submit(CHECKIN_STAGES, context, owner=user_id, scope=checkin_scope)
         return jsonify({
-            "summary": f"Extracted {len(result['needs'])} needs and {len(result['learnings'])} learnings from your check-in. Your skill profile has been updated!",
-            "needs": result['needs'],
-            "learnings": result['learnings'],
-            "skills": updated_user.get('skills', []),
-            "matches": enriched_matches,
-            "xp_gained": xp_result.get('xp_gained', 0) if xp_result else 0,
-            "total_xp": xp_result.get('total_xp', 0) if xp_result else 0,
-            "level": xp_result.get('level', 1) if xp_result else 1,
-            "leveled_up": xp_result.get('leveled_up', False) if xp_result else False,
-            "new_badges": xp_result.get('new_badges', []) if xp_result else []
-        })
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/api/jobs/{job_id}"
+        }), 202
     
     except Exception as e:
         print(f"Error in submit_checkin: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Poll the status (and, once completed, the result) of a background job"""
+    job = checkin_jobs.get(job_id)
+    if not job or job['owner'] != session.get('user_id'):
+        return jsonify({"error": "Job not found"}), 404
+    
+    return jsonify(job)
+
+
 # ========== MATCH ENDPOINTS ==========
 
 @app.route('/api/matches/<user_id>', methods=['GET'])
@@ -509,16 +672,11 @@ def get_user_matches(user_id):
     matches = db.get_matches_for_user(user_id)
     
     # Enrich with user details
-    enriched = []
-    for match in matches:
-        expert = db.get_user(match['expert_user_id'])
-        need = db.get_need(match['need_id'])
-        if expert and need:
-            enriched.append({
-                **match,
-                "expert": expert,
-                "need": need
-            })
+    enriched = enrich(db, matches, {
+        "expert": ("expert_user_id", "users"),
+        "need": ("need_id", "needs")
+    })
+    enriched = [m for m in enriched if m['expert'] and m['need']]
     
     return jsonify({"matches": enriched})
 
@@ -536,12 +694,15 @@ def get_expert_matches(user_id):
     user_skill_categories = {s['category'].lower() for s in user_skills}
     
     # Get all matches where user is the expert
-    matches = db.get_matches_for_expert(user_id)
+    matches = enrich(db, db.get_matches_for_expert(user_id), {
+        "requester": ("need_user_id", "users"),
+        "need": ("need_id", "needs")
+    })
     
     # Filter matches based on user's skills
     filtered_matches = []
     for match in matches:
-        need = db.get_need(match['need_id'])
+        need = match['need']
         if not need:
             continue
         
@@ -564,14 +725,8 @@ def get_expert_matches(user_id):
                 is_relevant = True
                 break
         
-        if is_relevant:
-            requester = db.get_user(match['need_user_id'])
-            if requester:
-                filtered_matches.append({
-                    **match,
-                    "requester": requester,
-                    "need": need
-                })
+        if is_relevant and match['requester']:
+            filtered_matches.append(match)
     
     return jsonify({"matches": filtered_matches})
 
@@ -587,8 +742,8 @@ def accept_match(match_id):
     db.update_match_status(match_id, "accepted")
     
     # Award XP to expert for accepting
-    xp_result = db.award_xp(match['expert_user_id'], 10, "Accepted a match")
-    db.update_user_stats(match['expert_user_id'], "total_matches", 1)
+    xp_result = db.award_xp(match['expert_user_id'], 10, "Accepted a match",
+                            stats={"total_matches": 1})
     
     # Create coffee chat
     chat = db.create_coffee_chat(
@@ -619,18 +774,16 @@ def get_user_chats(user_id):
     chats = db.get_coffee_chats_by_user(user_id)
     
     # Enrich with user details
-    enriched = []
-    for chat in chats:
-        requester = db.get_user(chat['requester_id'])
-        expert = db.get_user(chat['expert_id'])
-        slots = db.get_slots_for_chat(chat['id'])
-        
-        enriched.append({
-            **chat,
-            "requester": requester,
-            "expert": expert,
-            "proposed_slots": slots
-        })
+    enriched = enrich(db, chats, {
+        "requester": ("requester_id", "users"),
+        "expert": ("expert_id", "users")
+    })
+    
+    slots_by_chat = {}
+    for slot in db.get_slots_for_chats([chat['id'] for chat in chats]):
+        slots_by_chat.setdefault(slot['coffee_chat_id'], []).append(slot)
+    for chat in enriched:
+        chat['proposed_slots'] = slots_by_chat.get(chat['id'], [])
     
     return jsonify({"coffee_chats": enriched})
 
@@ -767,86 +920,88 @@ def get_admin_stats():
 
 @app.route('/api/admin/needs', methods=['GET'])
 def get_all_needs():
-    """Get all needs"""
-    needs = db.get_all_active_needs()
-    
-    # Enrich with user info
-    enriched = []
-    for need in needs:
-        user = db.get_user(need['user_id'])
-        enriched.append({
-            **need,
-            "user": user
-        })
-    
-    return jsonify({"needs": enriched})
+    """Get all active needs, with user info (paginated / NDJSON, see list_response)"""
+    return list_response("needs", "needs", db.get_all_active_needs,
+                         {"user": ("user_id", "users")}, status="active")
 
 
 @app.route('/api/admin/learnings', methods=['GET'])
 def get_all_learnings():
-    """Get all learnings"""
-    learnings = db.get_all_active_learnings()
-    
-    # Enrich with user info
-    enriched = []
-    for learning in learnings:
-        user = db.get_user(learning['user_id'])
-        enriched.append({
-            **learning,
-            "user": user
-        })
-    
-    return jsonify({"learnings": enriched})
+    """Get all active learnings, with user info (paginated / NDJSON, see list_response)"""
+    return list_response("learnings", "learnings", db.get_all_active_learnings,
+                         {"user": ("user_id", "users")}, status="active")
 
 
 @app.route('/api/admin/matches', methods=['GET'])
 def get_all_matches_admin():
-    """Get all matches"""
-    matches = db.get_all_matches()
-    
-    # Enrich with details
-    enriched = []
-    for match in matches:
-        requester = db.get_user(match['need_user_id'])
-        expert = db.get_user(match['expert_user_id'])
-        need = db.get_need(match['need_id'])
-        
-        enriched.append({
-            **match,
-            "requester": requester,
-            "expert": expert,
-            "need": need
-        })
-    
-    return jsonify({"matches": enriched})
+    """Get all matches, with details (paginated / NDJSON, see list_response)"""
+    # Enriched with one bulk query per table (per page)
+    return list_response("matches", "match_suggestions", db.get_all_matches, {
+        "requester": ("need_user_id", "users"),
+        "expert": ("expert_user_id", "users"),
+        "need": ("need_id", "needs")
+    })
 
 
 @app.route('/api/admin/coffee-chats', methods=['GET'])
 def get_all_chats_admin():
-    """Get all coffee chats"""
-    chats = db.get_all_coffee_chats()
-    
-    # Enrich
-    enriched = []
-    for chat in chats:
-        requester = db.get_user(chat['requester_id'])
-        expert = db.get_user(chat['expert_id'])
-        
-        enriched.append({
-            **chat,
-            "requester": requester,
-            "expert": expert
-        })
+    """Get all coffee chats, with participants (paginated / NDJSON, see list_response)"""
+    return list_response("coffee_chats", "coffee_chats", db.get_all_coffee_chats, {
+        "requester": ("requester_id", "users"),
+        "expert": ("expert_id", "users")
+    })
+
+
+@app.route('/api/admin/events', methods=['GET'])
+def admin_events():
+    """Server-Sent Events stream of database changes for the admin dashboard
     
-    return jsonify({"coffee_chats": enriched})
+    503 once SSE_MAX_SUBSCRIBERS streams are open; the dashboard then falls
+    back to polling.
+    """
+    if not session.get('admin_authenticated'):
+        return jsonify({"error": "Unauthorized"}), 401
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    
+    try:
+        stream = change_feed.stream(last_event_id)
+    except FeedFull as e:
+        return jsonify({"error": str(e)}), 503, {'Retry-After': '60'}
+    
+    # The stream needs no request context; the server's close() releases it
+    return Response(
+        stream,
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
 # ========== UTILITY ENDPOINTS ==========
 
 @app.route('/health')
 def health():
-    """Health check"""
-    return jsonify({"status": "ok"})
+    """Health check with embedding model readiness
+    
+    Stays 200 while the model loads (status "starting") so the instance
+    keeps serving non-embedding endpoints; 503 only if loading failed.
+    """
+    model = embedding_model.status()
+    if model['state'] == 'failed':
+        return jsonify({"status": "degraded", "ready": False, "model": model}), 503
+    return jsonify({
+        "status": "ok" if embedding_model.ready else "starting",
+        "ready": embedding_model.ready,
+        "model": model
+    })
+
+
+@app.route('/_ah/warmup')
+def warmup():
+    """App Engine warmup request: start loading the model before traffic arrives"""
+    embedding_model.start()
+    return '', 200
 
 
 @app.route('/api/test-extraction', methods=['POST'])
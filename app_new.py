@@ -10,8 +10,9 @@ import json
 import os
 from datetime import datetime, timedelta
 from db_manager import DatabaseManager
-from sentence_transformers import SentenceTransformer
-import numpy as np
+from embedding_store import EmbeddingStore
+from matching_engine import MatchingEngine
+from model_holder import ModelHolder
 from anthropic import Anthropic
 
 app = Flask(__name__)
@@ -26,7 +27,15 @@ if os.getenv("ANTHROPIC_API_KEY"):
     anthropic_client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
 
 # Initialize embedding model
-embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+# Loaded on a background thread (EMBEDDING_MODEL_LOADING=lazy defers it to
+# first use) so cold starts serve non-embedding endpoints right away.
+# Label embeddings are cached on disk (shared by all workers) so each label is encoded once
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+embedding_model = ModelHolder(EMBEDDING_MODEL_NAME)
+if os.getenv('EMBEDDING_MODEL_LOADING', 'background') == 'background':
+    embedding_model.start()
+embedding_store = EmbeddingStore(os.getenv('EMBEDDING_STORE_PATH', 'embeddings.sqlite3'), EMBEDDING_MODEL_NAME)
+matching_engine = MatchingEngine(embedding_model, embedding_store=embedding_store)
 
 # Load founder profiles for reference
 with open('founders_db.json', 'r') as f:
@@ -105,63 +114,7 @@ Respond with ONLY valid JSON in this exact format:
 
 def compute_matches_tool(needs: list, learnings: list, limit: int = 3) -> dict:
     """MCP Tool: Compute matches between needs and learnings"""
-    
-    matches = []
-    
-    for need in needs:
-        need_id = need.get("id", "")
-        need_user_id = need.get("user_id", "")
-        need_label = need.get("label", "")
-        need_category = need.get("category", "")
-        
-        need_embedding = embedding_model.encode([need_label])[0]
-        
-        scored_learnings = []
-        
-        for learning in learnings:
-            learning_user_id = learning.get("user_id", "")
-            
-            # Don't match a founder with themselves
-            if learning_user_id == need_user_id:
-                continue
-            
-            learning_label = learning.get("label", "")
-            learning_category = learning.get("category", "")
-            
-            # Compute semantic similarity
-            learning_embedding = embedding_model.encode([learning_label])[0]
-            similarity = np.dot(need_embedding, learning_embedding) / (
-                np.linalg.norm(need_embedding) * np.linalg.norm(learning_embedding)
-            )
-            
-            # Category bonus
-            category_bonus = 0.2 if need_category == learning_category else 0
-            
-            # Final score
-            score = float(similarity) + category_bonus
-            
-            # Generate reason
-            if need_category == learning_category:
-                reason = f"Both focus on {need_category}. The expert's experience with '{learning_label}' directly addresses your need for '{need_label}'"
-            else:
-                reason = f"The expert's experience with '{learning_label}' can help with your need for '{need_label}'"
-            
-            scored_learnings.append({
-                "need_id": need_id,
-                "expert_user_id": learning_user_id,
-                "score": round(score, 3),
-                "reason": reason,
-                "matched_learning": learning_label
-            })
-        
-        # Sort by score and take top N
-        scored_learnings.sort(key=lambda x: x["score"], reverse=True)
-        matches.extend(scored_learnings[:limit])
-    
-    return {
-        "total_matches": len(matches),
-        "matches": matches
-    }
+    return matching_engine.compute_matches(needs, learnings, limit=limit)
 
 
 # =============== API ENDPOINTS ===============
@@ -231,6 +184,7 @@ def submit_checkin():
             needs=extraction['needs'],
             learnings=extraction['learnings']
         )
+        matching_engine.warm([item['label'] for item in result['needs'] + result['learnings']])
         
         # Step 3: Get all active needs and learnings for matching
         all_needs = db.get_all_active_needs()
@@ -560,8 +514,19 @@ def get_all_chats_admin():
 
 @app.route('/health')
 def health():
-    """Health check"""
-    return jsonify({"status": "ok"})
+    """Health check with embedding model readiness
+    
+    Stays 200 while the model loads (status "starting") so the instance
+    keeps serving non-embedding endpoints; 503 only if loading failed.
+    """
+    model = embedding_model.status()
+    if model['state'] == 'failed':
+        return jsonify({"status": "degraded", "ready": False, "model": model}), 503
+    return jsonify({
+        "status": "ok" if embedding_model.ready else "starting",
+        "ready": embedding_model.ready,
+        "model": model
+    })
 
 
 @app.route('/api/test-extraction', methods=['POST'])
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Serialization Benchmark
+Compares payload size and encode time of pretty vs compact JSON, stdlib vs orjson
+
+Usage:
+    python benchmark_serialization.py                          # bundled fixtures
+    python benchmark_serialization.py --files founders_db.json --repeat 500
+"""
+
+import argparse
+import json
+import os
+import time
+
+import serialization
+
+
+def encoders() -> dict:
+    modes = {
+        "stdlib indent=2": lambda obj: json.dumps(obj, indent=2).encode("utf-8"),
+        "stdlib compact": lambda obj: json.dumps(obj, separators=serialization.COMPACT_SEPARATORS,
+                                                 ensure_ascii=False).encode("utf-8"),
+    }
+    if serialization.orjson is not None:
+        modes["orjson compact"] = lambda obj: serialization.dumps_bytes(obj)
+        modes["orjson indent=2"] = lambda obj: serialization.dumps_bytes(obj, pretty=True)
+    return modes
+
+
+def time_encode(encode, obj, repeat: int) -> float:
+    """Mean encode time in microseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encode(obj)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(path: str, repeat: int):
+    with open(path, "rb") as f:
+        obj = json.loads(f.read())
+
+    print(f"\n📊 {path} ({os.path.getsize(path)} bytes on disk), {repeat} encodes")
+    print(f"  {'encoder':<18}{'bytes':>10}{'vs indent':>11}{'encode (µs)':>13}{'speedup':>9}")
+    baseline_bytes = baseline_us = None
+    for name, encode in encoders().items():
+        size = len(encode(obj))
+        encode_us = time_encode(encode, obj, repeat)
+        if baseline_bytes is None:
+            baseline_bytes, baseline_us = size, encode_us
+        print(f"  {name:<18}{size:>10}{size / baseline_bytes:>10.0%} {encode_us:>13.1f}"
+              f"{baseline_us / encode_us:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization modes")
+    parser.add_argument("--files", nargs="+", default=["founders_db.json", "database.json"])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📦 SERIALIZATION BENCHMARK")
+    print("=" * 60)
+    if serialization.orjson is None:
+        print("orjson is not installed; only the stdlib encoders are measured")
+    for path in args.files:
+        if not os.path.exists(path):
+            print(f"\nSkipping {path} (not found)")
+            continue
+        run(path, args.repeat)
+    print("\nResponses, MCP results and snapshots use the compact encoder;")
+    print("pass ?pretty=1 (API) or MCP_PRETTY_JSON=1 (MCP server) for indented output.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Vector Index Benchmark
+Compares recall@k and query latency of each index backend against brute force
+
+Usage:
+    python benchmark_vector_index.py                 # default sizes
+    python benchmark_vector_index.py --sizes 500 5000 50000 --nprobe 0 8 16   # 0 = default nprobe
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from vector_index import FlatIndex, IVFIndex, normalize
+
+
+def make_embeddings(n: int, dim: int, clusters: int, rng) -> np.ndarray:
+    """Clustered unit vectors, roughly shaped like sentence embeddings of topics"""
+    centers = normalize(rng.normal(size=(clusters, dim)))
+    labels = rng.integers(0, clusters, size=n)
+    return normalize(centers[labels] + 0.35 * rng.normal(size=(n, dim)) / np.sqrt(dim) * 4)
+
+
+def brute_force(vectors: np.ndarray, query: np.ndarray, k: int) -> list:
+    """The original per-call path: score every vector, sort everything"""
+    scores = vectors @ query
+    return list(np.argsort(-scores)[:k])
+
+
+def python_loop(vectors: np.ndarray, query: np.ndarray, k: int) -> list:
+    """The pre-index vector_search: per-row cosine in Python, sort a list of dicts"""
+    similarities = []
+    for idx, vector in enumerate(vectors):
+        similarity = np.dot(query, vector) / (np.linalg.norm(query) * np.linalg.norm(vector))
+        similarities.append({"idx": idx, "similarity": float(similarity)})
+    similarities.sort(key=lambda x: x["similarity"], reverse=True)
+    return [s["idx"] for s in similarities[:k]]
+
+
+def time_queries(search, queries) -> float:
+    """Mean latency per query in microseconds"""
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def run(size: int, dim: int, k: int, nprobes: list, n_queries: int, seed: int):
+    rng = np.random.default_rng(seed)
+    vectors = make_embeddings(size, dim, clusters=max(8, size // 200), rng=rng)
+    queries = make_embeddings(n_queries, dim, clusters=max(8, size // 200), rng=rng)
+    ids = [str(i) for i in range(size)]
+
+    truth = [set(str(i) for i in brute_force(vectors, q, k)) for q in queries]
+    brute_us = time_queries(lambda q: brute_force(vectors, q, k), queries)
+
+    print(f"\n📊 {size} vectors x {dim} dims, top-{k}, {n_queries} queries")
+    print(f"  {'backend':<18}{'build (ms)':>12}{'query (µs)':>12}{'recall@k':>10}")
+    if size <= 5000:
+        loop_us = time_queries(lambda q: python_loop(vectors, q, k), queries[:10])
+        print(f"  {'python loop':<18}{'-':>12}{loop_us:>12.1f}{1.0:>10.3f}")
+    print(f"  {'brute force':<18}{'-':>12}{brute_us:>12.1f}{1.0:>10.3f}")
+
+    start = time.perf_counter()
+    flat = FlatIndex()
+    flat.add(ids, vectors)
+    build_ms = (time.perf_counter() - start) * 1000
+    flat_us = time_queries(lambda q: flat.search(q, k), queries)
+    print(f"  {'flat':<18}{build_ms:>12.1f}{flat_us:>12.1f}{1.0:>10.3f}")
+
+    start = time.perf_counter()
+    ivf = IVFIndex(train_threshold=min(size, 1024))
+    ivf.add(ids, vectors)
+    if not ivf.is_trained:
+        ivf.train()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    for nprobe in nprobes:
+        ivf.nprobe = nprobe or None
+        ivf_us = time_queries(lambda q: ivf.search(q, k), queries)
+        found = [set(i for i, _ in ivf.search(q, k)) for q in queries]
+        recall = np.mean([len(f & t) / k for f, t in zip(found, truth)])
+        label = f"ivf nprobe={ivf.probes}" + ("" if nprobe else "*")
+        print(f"  {label:<18}{build_ms:>12.1f}{ivf_us:>12.1f}{recall:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vector index backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--dim", type=int, default=384, help="all-MiniLM-L6-v2 uses 384")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[0, 8, 16],
+                        help="cells probed per IVF query; 0 means the index default")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔎 VECTOR INDEX BENCHMARK")
+    print("=" * 60)
+    for size in args.sizes:
+        run(size, args.dim, args.k, args.nprobe, args.queries, args.seed)
+    print("\n* = default nprobe (3.5 * sqrt(cells)).")
+    print("Rule of thumb: 'flat' is exact and, below a few tens of thousands of vectors, also")
+    print("faster. 'ivf' trades recall for latency: consider VECTOR_INDEX_BACKEND=ivf only when")
+    print("flat query latency dominates and the recall@k above is acceptable for matching.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Change Feed for Founder Matching System
+In-process pub/sub of database writes, streamed to the admin page over SSE
+"""
+
+import json
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+
+class FeedFull(RuntimeError):
+    """Raised when the feed already has its maximum number of subscribers"""
+
+
+class Subscription:
+    """One listener's bounded event queue"""
+
+    def __init__(self, maxsize: int):
+        self.events = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+
+class ChangeFeed:
+    """Publishes create/update events from DatabaseManager write methods
+
+    Events carry a monotonically increasing id so SSE clients can resume
+    with Last-Event-ID. Only the last `history` events are kept for replay;
+    a client that falls further behind (or whose queue overflows) is told to
+    reset, i.e. reload everything once. The feed is per process, so writes
+    made in other processes are not seen.
+
+    Each open stream occupies a server thread for as long as the client
+    stays connected, so `max_subscribers` (None = unlimited) caps them.
+    """
+
+    def __init__(self, history: int = 1000, subscriber_queue_size: int = 1000,
+                 max_subscribers: Optional[int] = None):
+        self.subscriber_queue_size = subscriber_queue_size
+        self.max_subscribers = max_subscribers
+        self._history = deque(maxlen=history)
+        self._subscribers: List[Subscription] = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def publish(self, table: str, action: str, row: Optional[Dict]) -> Optional[Dict]:
+        """Record a change and fan it out to every subscriber"""
+        if not row:
+            return None
+
+        with self._lock:
+            event = {
+                "id": self._next_id,
+                "table": table,
+                "action": action,
+                "row": dict(row),
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            }
+            self._next_id += 1
+            self._history.append(event)
+
+            for subscription in self._subscribers:
+                if subscription.overflowed:
+                    continue
+                try:
+                    subscription.events.put_nowait(event)
+                except queue.Full:
+                    subscription.overflowed = True
+
+        return event
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """Register a listener, replaying events after `last_event_id` if possible
+
+        Raises FeedFull when `max_subscribers` listeners are already registered.
+        """
+        subscription = Subscription(self.subscriber_queue_size)
+        with self._lock:
+            if self.max_subscribers is not None and len(self._subscribers) >= self.max_subscribers:
+                raise FeedFull(f"Change feed already has {len(self._subscribers)} subscribers")
+            if last_event_id is not None:
+                oldest = self._history[0]["id"] if self._history else self._next_id
+                # Too old to replay, or from before a server restart
+                if last_event_id < oldest - 1 or last_event_id >= self._next_id:
+                    subscription.overflowed = True
+                else:
+                    try:
+                        for event in self._history:
+                            if event["id"] > last_event_id:
+                                subscription.events.put_nowait(event)
+                    except queue.Full:
+                        subscription.overflowed = True
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def stream(self, last_event_id: Optional[int] = None, heartbeat_seconds: float = 15.0) -> "EventStream":
+        """Subscribe now (raising FeedFull at the cap) and return the client's SSE text iterator"""
+        return EventStream(self, self.subscribe(last_event_id), heartbeat_seconds)
+
+
+class EventStream:
+    """Server-Sent Events text for one client until it disconnects
+
+    The subscription is taken when the stream is created, so a full feed can
+    be refused before the response starts. close() (called by the WSGI
+    server when the client goes away) releases it even if the stream was
+    never iterated.
+    """
+
+    def __init__(self, feed: ChangeFeed, subscription: Subscription, heartbeat_seconds: float):
+        self._feed = feed
+        self._subscription = subscription
+        self._events = self._generate(heartbeat_seconds)
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        return next(self._events)
+
+    def close(self):
+        self._events.close()
+        self._feed.unsubscribe(self._subscription)
+
+    def _generate(self, heartbeat_seconds: float) -> Iterator[str]:
+        subscription = self._subscription
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                if subscription.overflowed:
+                    yield format_sse({"reason": "client fell behind"}, event="reset")
+                    return
+                try:
+                    event = subscription.events.get(timeout=heartbeat_seconds)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event, event="change", event_id=event["id"])
+        finally:
+            self._feed.unsubscribe(subscription)
+
+
+def format_sse(data: Dict, event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    """Encode one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
@@ -1,42 +1,272 @@
 """
 Database Manager for Founder Matching System
 Handles all database operations with JSON-based storage
+
+Writes go to an append-only operation log (<db_path>.log, one JSON line per
+changed row) that is replayed on load and periodically compacted into the
+JSON snapshot at db_path.
 """
 
+import heapq
 import json
 import os
+import threading
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from typing import List, Dict, Optional
 import uuid
 
+from gamification import apply_increment, validate_stats
+from pagination import DEFAULT_PAGE_SIZE, Cursor, check_table, sort_key
+from serialization import dumps, dumps_bytes, loads
+
+
+# Log entries written before the log is folded into the snapshot
+COMPACT_AFTER_OPS = 1000
+
+TABLES = ("users", "needs", "learnings", "match_suggestions", "coffee_chats", "proposed_slots")
+
+# Secondary (non-unique) hash indexes kept per table, besides the id index
+SECONDARY_INDEXES = {
+    "users": (),
+    "needs": ("user_id", "status"),
+    "learnings": ("user_id", "status"),
+    "match_suggestions": ("need_id", "need_user_id", "expert_user_id", "status"),
+    "coffee_chats": ("requester_id", "expert_id", "status"),
+    "proposed_slots": ("coffee_chat_id", "status"),
+}
+
 
 class DatabaseManager:
     """Manages all database operations"""
     
-    def __init__(self, db_path="database.json"):
+    def __init__(self, db_path="database.json", change_feed=None,
+                 compact_after: int = COMPACT_AFTER_OPS, fsync: bool = False, pretty: bool = False):
         self.db_path = db_path
+        self.log_path = db_path + ".log"
+        self.compact_after = compact_after
+        self.fsync = fsync
+        # Snapshots are compact JSON unless pretty (indented) output is asked for
+        self.pretty = pretty
+        self._log_lock = threading.RLock()
+        self._log_ops = 0
+        self._batch = threading.local()
         self.data = self._load_db()
+        self._build_indexes()
+        # Opened on the first write, so read-only use never creates a log
+        self._log_file = None
+        if self._log_ops >= self.compact_after:
+            self.compact()
+        
+        # Optional ChangeFeed that receives an event for every write
+        self.change_feed = change_feed
+        
+        # Serializes read-modify-write increments across request threads
+        self._increment_lock = threading.Lock()
     
     def _load_db(self) -> dict:
-        """Load database from JSON file"""
+        """Load the JSON snapshot and replay the operation log on top of it"""
         if os.path.exists(self.db_path):
-            with open(self.db_path, 'r') as f:
-                return json.load(f)
+            with open(self.db_path, 'rb') as f:
+                data = loads(f.read())
         else:
             # Initialize empty database
-            return {
-                "users": [],
-                "needs": [],
-                "learnings": [],
-                "match_suggestions": [],
-                "coffee_chats": [],
-                "proposed_slots": []
-            }
-    
-    def _save_db(self):
-        """Save database to JSON file"""
-        with open(self.db_path, 'w') as f:
-            json.dump(self.data, f, indent=2)
+            data = {}
+        for table in TABLES:
+            data.setdefault(table, [])
+        
+        if os.path.exists(self.log_path):
+            self._replay_log(data)
+        return data
+    
+    def _replay_log(self, data: dict):
+        """Apply logged rows (and deletions) in order, dropping a torn final line"""
+        positions = {table: {row["id"]: i for i, row in enumerate(rows)} for table, rows in data.items()}
+        good_bytes = 0
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Crash mid-append: the tail never completed
+                    break
+                good_bytes += len(line)
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    print(f"Skipping unreadable entry in {self.log_path}")
+                    continue
+                rows = data.setdefault(op["table"], [])
+                index = positions.setdefault(op["table"], {})
+                row = op["row"]
+                if op.get("deleted"):
+                    position = index.pop(row["id"], None)
+                    if position is not None:
+                        rows[position] = None
+                elif row["id"] in index:
+                    rows[index[row["id"]]] = row
+                else:
+                    index[row["id"]] = len(rows)
+                    rows.append(row)
+                self._log_ops += 1
+        
+        for table, rows in data.items():
+            rows[:] = [row for row in rows if row is not None]
+        
+        if good_bytes != os.path.getsize(self.log_path):
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(good_bytes)
+    
+    def _append_op(self, table: str, row: Dict, deleted: bool = False):
+        """Durably record the new state of one row (O(row size), not O(database))"""
+        if deleted:
+            op = {"table": table, "row": {"id": row["id"]}, "deleted": True}
+        else:
+            op = {"table": table, "row": row}
+        line = dumps(op) + "\n"
+        batch = getattr(self._batch, "lines", None)
+        if batch is not None:
+            batch.append(line)
+        else:
+            self._write_log([line])
+    
+    def _write_log(self, lines: List[str]):
+        """Append log lines with a single write (and fsync)"""
+        with self._log_lock:
+            if self._log_file is None:
+                self._log_file = open(self.log_path, "a", encoding="utf-8")
+            self._log_file.write("".join(lines))
+            self._log_file.flush()
+            if self.fsync:
+                os.fsync(self._log_file.fileno())
+            self._log_ops += len(lines)
+            if self._log_ops >= self.compact_after:
+                self.compact()
+    
+    @contextmanager
+    def batch_writes(self):
+        """Group the log appends made inside this block into one write
+        
+        In-memory data and indexes update immediately as usual; only the
+        log write is deferred to the end of the (outermost) block.
+        """
+        if getattr(self._batch, "lines", None) is not None:
+            yield
+            return
+        self._batch.lines = []
+        try:
+            yield
+        finally:
+            lines, self._batch.lines = self._batch.lines, None
+            if lines:
+                self._write_log(lines)
+    
+    def compact(self):
+        """Fold the operation log into a fresh snapshot
+        
+        The snapshot is written to a temp file and atomically renamed over
+        db_path before the log is truncated. Replaying whole rows is
+        idempotent, so a crash between the two steps loses nothing.
+        """
+        with self._log_lock:
+            tmp_path = self.db_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(dumps_bytes(self.data, pretty=self.pretty))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.db_path)
+            if self._log_file is not None:
+                self._log_file.truncate(0)
+            elif os.path.exists(self.log_path):
+                open(self.log_path, "w").close()
+            self._log_ops = 0
+    
+    def close(self):
+        """Compact pending log entries and release the log file"""
+        with self._log_lock:
+            if self._log_ops:
+                self.compact()
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+    
+    def _commit(self, table: str, action: str, row: Dict):
+        """Index and log a written row, then send it to the change feed"""
+        with self._log_lock:
+            self._index_row(table, row)
+            self._append_op(table, row)
+        self._publish(table, action, row)
+    
+    # ============ INDEXES ============
+    
+    def _build_indexes(self):
+        """Build the id and secondary indexes from self.data
+        
+        _by_id[table][id] -> row
+        _by_field[table][field][value] -> {id: row} (dicts keep insertion order)
+        _indexed_values[table][id] -> {field: value} last indexed, so updates
+        that mutate a row in place can be moved to their new buckets.
+        """
+        self._by_id = {}
+        self._by_field = {}
+        self._indexed_values = {}
+        for table, rows in self.data.items():
+            self._by_id[table] = {}
+            self._by_field[table] = {field: {} for field in SECONDARY_INDEXES.get(table, ())}
+            self._indexed_values[table] = {}
+            for row in rows:
+                self._index_row(table, row)
+    
+    def _index_row(self, table: str, row: Dict):
+        """Add a new row to the indexes, or re-bucket a changed one"""
+        row_id = row["id"]
+        self._by_id[table][row_id] = row
+        previous = self._indexed_values[table].get(row_id, {})
+        current = {}
+        for field, buckets in self._by_field[table].items():
+            value = row.get(field)
+            current[field] = value
+            if field in previous and previous[field] != value:
+                old_bucket = buckets.get(previous[field])
+                if old_bucket is not None:
+                    old_bucket.pop(row_id, None)
+                    if not old_bucket:
+                        del buckets[previous[field]]
+            buckets.setdefault(value, {})[row_id] = row
+        self._indexed_values[table][row_id] = current
+    
+    def _unindex_row(self, table: str, row_id: str):
+        """Drop a deleted row from the indexes"""
+        self._by_id[table].pop(row_id, None)
+        for field, value in self._indexed_values[table].pop(row_id, {}).items():
+            bucket = self._by_field[table][field].get(value)
+            if bucket is not None:
+                bucket.pop(row_id, None)
+                if not bucket:
+                    del self._by_field[table][field][value]
+    
+    def _lookup(self, table: str, field: str, value) -> List[Dict]:
+        """Rows whose indexed field equals value, in insertion order"""
+        return list(self._by_field[table][field].get(value, {}).values())
+    
+    def _lookup_many(self, table: str, field: str, values) -> List[Dict]:
+        """Rows whose indexed field is any of values, without duplicates"""
+        buckets = self._by_field[table][field]
+        found = {}
+        for value in dict.fromkeys(values):
+            found.update(buckets.get(value, {}))
+        return list(found.values())
+    
+    def _get_by_ids(self, table: str, row_ids: List[str]) -> List[Dict]:
+        rows = self._by_id[table]
+        return [rows[row_id] for row_id in dict.fromkeys(row_ids) if row_id in rows]
+    
+    def _publish(self, table: str, action: str, row: Dict):
+        """Send a written row to the change feed, if one is attached"""
+        if self.change_feed:
+            self.change_feed.publish(table, action, row)
+    
+    def identity_map(self):
+        """Rows already live in memory here, so request scopes are a no-op"""
+        return nullcontext()
     
     def _generate_id(self, prefix: str) -> str:
         """Generate unique ID with prefix"""
@@ -46,14 +276,26 @@ class DatabaseManager:
         """Get current timestamp in ISO format"""
         return datetime.utcnow().isoformat() + "Z"
     
+    # ============ PAGINATION ============
+    
+    def get_page(self, table: str, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Cursor] = None,
+                 status: Optional[str] = None) -> List[Dict]:
+        """Next `limit` rows ordered by (created_at, id), strictly after the cursor"""
+        check_table(table)
+        rows = self._lookup(table, "status", status) if status else self.data[table]
+        if after is not None:
+            rows = (row for row in rows if sort_key(row) > after)
+        return heapq.nsmallest(limit, rows, key=sort_key)
+    
     # ============ USER OPERATIONS ============
     
     def get_user(self, user_id: str) -> Optional[Dict]:
         """Get user by ID"""
-        for user in self.data["users"]:
-            if user["id"] == user_id:
-                return user
-        return None
+        return self._by_id["users"].get(user_id)
+    
+    def get_users_by_ids(self, user_ids: List[str]) -> List[Dict]:
+        """Get many users at once"""
+        return self._get_by_ids("users", user_ids)
     
     def get_all_users(self) -> List[Dict]:
         """Get all users"""
@@ -71,25 +313,26 @@ class DatabaseManager:
             "created_at": self._get_timestamp()
         }
         self.data["users"].append(user)
-        self._save_db()
+        self._commit("users", "create", user)
         return user
     
     # ============ NEED OPERATIONS ============
     
     def get_need(self, need_id: str) -> Optional[Dict]:
         """Get need by ID"""
-        for need in self.data["needs"]:
-            if need["id"] == need_id:
-                return need
-        return None
+        return self._by_id["needs"].get(need_id)
+    
+    def get_needs_by_ids(self, need_ids: List[str]) -> List[Dict]:
+        """Get many needs at once"""
+        return self._get_by_ids("needs", need_ids)
     
     def get_needs_by_user(self, user_id: str) -> List[Dict]:
         """Get all needs for a user"""
-        return [n for n in self.data["needs"] if n["user_id"] == user_id]
+        return self._lookup("needs", "user_id", user_id)
     
     def get_all_active_needs(self) -> List[Dict]:
         """Get all active needs"""
-        return [n for n in self.data["needs"] if n.get("status") == "active"]
+        return self._lookup("needs", "status", "active")
     
     def create_need(self, user_id: str, label: str, category: str) -> Dict:
         """Create a new need"""
@@ -102,34 +345,31 @@ class DatabaseManager:
             "created_at": self._get_timestamp()
         }
         self.data["needs"].append(need)
-        self._save_db()
+        self._commit("needs", "create", need)
         return need
     
     def update_need_status(self, need_id: str, status: str):
         """Update need status"""
-        for need in self.data["needs"]:
-            if need["id"] == need_id:
-                need["status"] = status
-                self._save_db()
-                return True
-        return False
+        need = self._by_id["needs"].get(need_id)
+        if not need:
+            return False
+        need["status"] = status
+        self._commit("needs", "update", need)
+        return True
     
     # ============ LEARNING OPERATIONS ============
     
     def get_learning(self, learning_id: str) -> Optional[Dict]:
         """Get learning by ID"""
-        for learning in self.data["learnings"]:
-            if learning["id"] == learning_id:
-                return learning
-        return None
+        return self._by_id["learnings"].get(learning_id)
     
     def get_learnings_by_user(self, user_id: str) -> List[Dict]:
         """Get all learnings for a user"""
-        return [l for l in self.data["learnings"] if l["user_id"] == user_id]
+        return self._lookup("learnings", "user_id", user_id)
     
     def get_all_active_learnings(self) -> List[Dict]:
         """Get all active learnings"""
-        return [l for l in self.data["learnings"] if l.get("status") == "active"]
+        return self._lookup("learnings", "status", "active")
     
     def create_learning(self, user_id: str, label: str, category: str) -> Dict:
         """Create a new learning"""
@@ -142,34 +382,35 @@ class DatabaseManager:
             "created_at": self._get_timestamp()
         }
         self.data["learnings"].append(learning)
-        self._save_db()
+        self._commit("learnings", "create", learning)
         return learning
     
     # ============ MATCH OPERATIONS ============
     
     def get_match(self, match_id: str) -> Optional[Dict]:
         """Get match by ID"""
-        for match in self.data["match_suggestions"]:
-            if match["id"] == match_id:
-                return match
-        return None
+        return self._by_id["match_suggestions"].get(match_id)
     
     def get_matches_for_user(self, user_id: str) -> List[Dict]:
         """Get all matches where user is the one needing help"""
-        return [m for m in self.data["match_suggestions"] if m["need_user_id"] == user_id]
+        return self._lookup("match_suggestions", "need_user_id", user_id)
     
     def get_matches_for_expert(self, user_id: str) -> List[Dict]:
         """Get all matches where user is the expert who can help"""
-        return [m for m in self.data["match_suggestions"] if m["expert_user_id"] == user_id]
+        return self._lookup("match_suggestions", "expert_user_id", user_id)
+    
+    def get_matches_for_needs(self, need_ids: List[str]) -> List[Dict]:
+        """Get all matches suggested for any of the given needs"""
+        return self._lookup_many("match_suggestions", "need_id", need_ids)
     
     def get_all_matches(self) -> List[Dict]:
         """Get all match suggestions"""
         return self.data["match_suggestions"]
     
-    def create_match(self, need_id: str, need_user_id: str, expert_user_id: str, 
-                     score: float, reason: str) -> Dict:
-        """Create a new match suggestion"""
-        match = {
+    def _match_row(self, need_id: str, need_user_id: str, expert_user_id: str,
+                   score: float, reason: str) -> Dict:
+        """Build a new pending match suggestion row"""
+        return {
             "id": self._generate_id("m"),
             "need_id": need_id,
             "need_user_id": need_user_id,
@@ -179,32 +420,86 @@ class DatabaseManager:
             "status": "pending",
             "created_at": self._get_timestamp()
         }
+    
+    def create_match(self, need_id: str, need_user_id: str, expert_user_id: str, 
+                     score: float, reason: str) -> Dict:
+        """Create a new match suggestion"""
+        match = self._match_row(need_id, need_user_id, expert_user_id, score, reason)
         self.data["match_suggestions"].append(match)
-        self._save_db()
+        self._commit("match_suggestions", "create", match)
         return match
     
+    def create_matches_bulk(self, matches: List[Dict], upsert: bool = False) -> List[Dict]:
+        """Store many match suggestions at once and return the written rows
+        
+        Each item needs need_id, need_user_id, expert_user_id, score and
+        reason. With upsert=True a (need_id, expert_user_id) pair that is
+        already stored gets its score and reason refreshed instead of a
+        duplicate row (id, status and created_at are kept), and repeated
+        pairs within `matches` are written once.
+        """
+        written = []
+        with self._log_lock, self.batch_writes():
+            stored = {}
+            if upsert:
+                for match in self.get_matches_for_needs([m["need_id"] for m in matches]):
+                    stored.setdefault((match["need_id"], match["expert_user_id"]), match)
+            
+            for match in matches:
+                pair = (match["need_id"], match["expert_user_id"])
+                existing = stored.get(pair)
+                if existing is not None:
+                    existing.update(score=match["score"], reason=match["reason"])
+                    self._commit("match_suggestions", "update", existing)
+                    if existing not in written:
+                        written.append(existing)
+                    continue
+                
+                row = self._match_row(match["need_id"], match["need_user_id"],
+                                      match["expert_user_id"], match["score"], match["reason"])
+                self.data["match_suggestions"].append(row)
+                self._commit("match_suggestions", "create", row)
+                written.append(row)
+                if upsert:
+                    stored[pair] = row
+        return written
+    
+    def delete_matches(self, match_ids: List[str]) -> List[Dict]:
+        """Delete match suggestions by id and return the removed rows"""
+        with self._log_lock, self.batch_writes():
+            removed = self._get_by_ids("match_suggestions", match_ids)
+            if not removed:
+                return []
+            removed_ids = {match["id"] for match in removed}
+            matches = self.data["match_suggestions"]
+            matches[:] = [match for match in matches if match["id"] not in removed_ids]
+            for match in removed:
+                self._unindex_row("match_suggestions", match["id"])
+                self._append_op("match_suggestions", match, deleted=True)
+        for match in removed:
+            self._publish("match_suggestions", "delete", match)
+        return removed
+    
     def update_match_status(self, match_id: str, status: str):
         """Update match status (pending, accepted, declined)"""
-        for match in self.data["match_suggestions"]:
-            if match["id"] == match_id:
-                match["status"] = status
-                self._save_db()
-                return True
-        return False
+        match = self._by_id["match_suggestions"].get(match_id)
+        if not match:
+            return False
+        match["status"] = status
+        self._commit("match_suggestions", "update", match)
+        return True
     
     # ============ COFFEE CHAT OPERATIONS ============
     
     def get_coffee_chat(self, chat_id: str) -> Optional[Dict]:
         """Get coffee chat by ID"""
-        for chat in self.data["coffee_chats"]:
-            if chat["id"] == chat_id:
-                return chat
-        return None
+        return self._by_id["coffee_chats"].get(chat_id)
     
     def get_coffee_chats_by_user(self, user_id: str) -> List[Dict]:
         """Get all coffee chats for a user (as requester or expert)"""
-        return [c for c in self.data["coffee_chats"] 
-                if c["requester_id"] == user_id or c["expert_id"] == user_id]
+        chats = {c["id"]: c for c in self._lookup("coffee_chats", "requester_id", user_id)}
+        chats.update((c["id"], c) for c in self._lookup("coffee_chats", "expert_id", user_id))
+        return list(chats.values())
     
     def get_all_coffee_chats(self) -> List[Dict]:
         """Get all coffee chats"""
@@ -225,24 +520,28 @@ class DatabaseManager:
             "updated_at": self._get_timestamp()
         }
         self.data["coffee_chats"].append(chat)
-        self._save_db()
+        self._commit("coffee_chats", "create", chat)
         return chat
     
     def update_coffee_chat(self, chat_id: str, updates: Dict):
         """Update coffee chat"""
-        for chat in self.data["coffee_chats"]:
-            if chat["id"] == chat_id:
-                chat.update(updates)
-                chat["updated_at"] = self._get_timestamp()
-                self._save_db()
-                return True
-        return False
+        chat = self._by_id["coffee_chats"].get(chat_id)
+        if not chat:
+            return False
+        chat.update(updates)
+        chat["updated_at"] = self._get_timestamp()
+        self._commit("coffee_chats", "update", chat)
+        return True
     
     # ============ TIME SLOT OPERATIONS ============
     
+    def get_slots_for_chats(self, chat_ids: List[str]) -> List[Dict]:
+        """Get proposed time slots for many coffee chats at once"""
+        return self._lookup_many("proposed_slots", "coffee_chat_id", chat_ids)
+    
     def get_slots_for_chat(self, chat_id: str) -> List[Dict]:
         """Get all proposed time slots for a coffee chat"""
-        return [s for s in self.data["proposed_slots"] if s["coffee_chat_id"] == chat_id]
+        return self._lookup("proposed_slots", "coffee_chat_id", chat_id)
     
     def create_slot(self, chat_id: str, proposed_by: str, slot_time: str) -> Dict:
         """Create a proposed time slot"""
@@ -255,30 +554,31 @@ class DatabaseManager:
             "created_at": self._get_timestamp()
         }
         self.data["proposed_slots"].append(slot)
-        self._save_db()
+        self._commit("proposed_slots", "create", slot)
         return slot
     
     def update_slot_status(self, slot_id: str, status: str):
         """Update time slot status"""
-        for slot in self.data["proposed_slots"]:
-            if slot["id"] == slot_id:
-                slot["status"] = status
-                self._save_db()
-                return True
-        return False
+        slot = self._by_id["proposed_slots"].get(slot_id)
+        if not slot:
+            return False
+        slot["status"] = status
+        self._commit("proposed_slots", "update", slot)
+        return True
     
     # ============ BATCH OPERATIONS ============
     
     def create_needs_and_learnings(self, user_id: str, needs: List[Dict], learnings: List[Dict]) -> Dict:
-        """Create multiple needs and learnings at once"""
+        """Create multiple needs and learnings at once (one log write)"""
         created_needs = []
         created_learnings = []
         
-        for need in needs:
-            created_needs.append(self.create_need(user_id, need["label"], need["category"]))
-        
-        for learning in learnings:
-            created_learnings.append(self.create_learning(user_id, learning["label"], learning["category"]))
+        with self.batch_writes():
+            for need in needs:
+                created_needs.append(self.create_need(user_id, need["label"], need["category"]))
+            
+            for learning in learnings:
+                created_learnings.append(self.create_learning(user_id, learning["label"], learning["category"]))
         
         return {
             "needs": created_needs,
@@ -287,36 +587,60 @@ class DatabaseManager:
     
     def update_user_skills(self, user_id: str, skills: List[Dict]):
         """Update user's inferred skills from their learnings"""
-        for user in self.data["users"]:
-            if user["id"] == user_id:
-                # Merge new skills with existing, avoiding duplicates
-                existing_skills = user.get("skills", [])
-                skill_labels = {s["label"] for s in existing_skills}
-                
-                for skill in skills:
-                    if skill["label"] not in skill_labels:
-                        existing_skills.append(skill)
-                        skill_labels.add(skill["label"])
-                
-                user["skills"] = existing_skills
-                self._save_db()
-                return True
-        return False
+        user = self._by_id["users"].get(user_id)
+        if not user:
+            return False
+        
+        # Merge new skills with existing, avoiding duplicates
+        existing_skills = user.get("skills", [])
+        skill_labels = {s["label"] for s in existing_skills}
+        
+        for skill in skills:
+            if skill["label"] not in skill_labels:
+                existing_skills.append(skill)
+                skill_labels.add(skill["label"])
+        
+        user["skills"] = existing_skills
+        self._commit("users", "update", user)
+        return True
     
     def get_dashboard_stats(self) -> Dict:
         """Get aggregated stats for admin dashboard"""
         return {
             "total_users": len(self.data["users"]),
-            "total_needs": len([n for n in self.data["needs"] if n.get("status") == "active"]),
-            "total_learnings": len([l for l in self.data["learnings"] if l.get("status") == "active"]),
+            "total_needs": len(self._lookup("needs", "status", "active")),
+            "total_learnings": len(self._lookup("learnings", "status", "active")),
             "total_matches": len(self.data["match_suggestions"]),
-            "pending_matches": len([m for m in self.data["match_suggestions"] if m.get("status") == "pending"]),
+            "pending_matches": len(self._lookup("match_suggestions", "status", "pending")),
             "total_chats": len(self.data["coffee_chats"]),
-            "confirmed_chats": len([c for c in self.data["coffee_chats"] if c.get("status") == "confirmed"])
+            "confirmed_chats": len(self._lookup("coffee_chats", "status", "confirmed"))
         }
-
-
-
-
-
-
+    
+    # ============ GAMIFICATION OPERATIONS ============
+    
+    def increment_user(self, user_id: str, xp_amount: int = 0,
+                       stats: Optional[Dict[str, int]] = None) -> Optional[Dict]:
+        """Atomically add XP and activity counters to a user
+        
+        Local counterpart of the Supabase increment_user function: the whole
+        read-modify-write happens under one lock, so concurrent threads in
+        this process never lose increments.
+        """
+        stats = validate_stats(stats)
+        with self._increment_lock:
+            user = self.get_user(user_id)
+            if not user:
+                return None
+            updates, result = apply_increment(user, xp_amount, stats)
+            user.update(updates)
+            self._commit("users", "update", user)
+        return result
+    
+    def award_xp(self, user_id: str, xp_amount: int, reason: str = "",
+                 stats: Optional[Dict[str, int]] = None) -> Optional[Dict]:
+        """Award XP to a user (plus optional stat increments) and check for level ups"""
+        return self.increment_user(user_id, xp_amount, stats)
+    
+    def update_user_stats(self, user_id: str, stat_name: str, increment: int = 1):
+        """Update user activity stats"""
+        return self.increment_user(user_id, 0, {stat_name: increment}) is not None
@@ -0,0 +1,679 @@
+"""
+SQLite Database Manager for Founder Matching System
+Same interface as db_manager_supabase.py, backed by a local SQLite file
+
+WAL mode lets several gunicorn workers share one database file, and every
+write runs in a real transaction. Also handy as a fast stand-in for
+Postgres in tests.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from gamification import apply_increment, validate_stats
+from pagination import DEFAULT_PAGE_SIZE, Cursor, check_table
+
+# SQLite caps bound parameters per statement; stay well below the limit
+IN_FILTER_CHUNK = 500
+
+# Columns stored as JSON text and decoded on read
+JSON_COLUMNS = {"skills", "badges"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT,
+    company TEXT DEFAULT '',
+    role TEXT DEFAULT 'founder',
+    skills TEXT NOT NULL DEFAULT '[]',
+    xp INTEGER NOT NULL DEFAULT 0,
+    level INTEGER NOT NULL DEFAULT 1,
+    badges TEXT NOT NULL DEFAULT '[]',
+    bio TEXT NOT NULL DEFAULT '',
+    total_checkins INTEGER NOT NULL DEFAULT 0,
+    total_matches INTEGER NOT NULL DEFAULT 0,
+    total_chats INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_users_xp ON users (xp DESC);
+CREATE INDEX IF NOT EXISTS idx_users_created ON users (created_at, id);
+
+CREATE TABLE IF NOT EXISTS needs (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    label TEXT NOT NULL,
+    category TEXT,
+    status TEXT NOT NULL DEFAULT 'active',
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_needs_user_id ON needs (user_id);
+CREATE INDEX IF NOT EXISTS idx_needs_status ON needs (status);
+CREATE INDEX IF NOT EXISTS idx_needs_created ON needs (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_needs_status_created ON needs (status, created_at, id);
+
+CREATE TABLE IF NOT EXISTS learnings (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    label TEXT NOT NULL,
+    category TEXT,
+    status TEXT NOT NULL DEFAULT 'active',
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_learnings_user_id ON learnings (user_id);
+CREATE INDEX IF NOT EXISTS idx_learnings_status ON learnings (status);
+CREATE INDEX IF NOT EXISTS idx_learnings_created ON learnings (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_learnings_status_created ON learnings (status, created_at, id);
+
+CREATE TABLE IF NOT EXISTS match_suggestions (
+    id TEXT PRIMARY KEY,
+    need_id TEXT NOT NULL,
+    need_user_id TEXT NOT NULL,
+    expert_user_id TEXT NOT NULL,
+    score REAL,
+    reason TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_matches_need_expert ON match_suggestions (need_id, expert_user_id);
+CREATE INDEX IF NOT EXISTS idx_matches_need_user_id ON match_suggestions (need_user_id);
+CREATE INDEX IF NOT EXISTS idx_matches_expert_user_id ON match_suggestions (expert_user_id);
+CREATE INDEX IF NOT EXISTS idx_matches_status ON match_suggestions (status);
+CREATE INDEX IF NOT EXISTS idx_matches_created ON match_suggestions (created_at, id);
+
+CREATE TABLE IF NOT EXISTS coffee_chats (
+    id TEXT PRIMARY KEY,
+    match_id TEXT,
+    requester_id TEXT NOT NULL,
+    expert_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    scheduled_time TEXT,
+    duration_minutes INTEGER DEFAULT 30,
+    meeting_link TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_chats_requester_id ON coffee_chats (requester_id);
+CREATE INDEX IF NOT EXISTS idx_chats_expert_id ON coffee_chats (expert_id);
+CREATE INDEX IF NOT EXISTS idx_chats_status ON coffee_chats (status);
+CREATE INDEX IF NOT EXISTS idx_chats_created ON coffee_chats (created_at, id);
+
+CREATE TABLE IF NOT EXISTS proposed_slots (
+    id TEXT PRIMARY KEY,
+    coffee_chat_id TEXT NOT NULL,
+    proposed_by TEXT,
+    slot_time TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_slots_coffee_chat_id ON proposed_slots (coffee_chat_id);
+"""
+
+
+class DatabaseManager:
+    """Manages all database operations with SQLite"""
+
+    def __init__(self, db_path: str = "founder_matching.sqlite3", change_feed=None):
+        self.db_path = db_path
+        self._local = threading.local()
+
+        # Optional ChangeFeed that receives an event for every write
+        self.change_feed = change_feed
+
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use
+
+        Connections are never reused across fork: a gunicorn worker forked
+        from a preloaded master opens its own.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit mode; transactions are opened explicitly below
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed writes atomically
+
+        BEGIN IMMEDIATE takes the write lock up front, so read-modify-write
+        sequences inside the block can't interleave with other workers.
+        Nested blocks join the outermost transaction, and change feed events
+        are only sent once it commits.
+        """
+        conn = self._conn()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        self._local.pending = []
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+            pending, self._local.pending = self._local.pending, []
+            self._local.depth = 0
+            for event in pending:
+                self._publish(*event)
+        finally:
+            self._local.depth = 0
+            self._local.pending = []
+
+    def batch_writes(self):
+        """Group writes into one transaction, i.e. a single commit"""
+        return self.transaction()
+
+    def identity_map(self):
+        """Local reads are cheap here, so request scopes are a no-op"""
+        return nullcontext()
+
+    def _generate_id(self, prefix: str) -> str:
+        """Generate unique ID with prefix"""
+        return f"{prefix}{uuid.uuid4().hex[:8]}"
+
+    def _get_timestamp(self) -> str:
+        """Get current timestamp in ISO format"""
+        return datetime.utcnow().isoformat() + "Z"
+
+    def _publish(self, table: str, action: str, row: Optional[Dict]):
+        """Send a written row to the change feed, if one is attached"""
+        if not self.change_feed or not row:
+            return
+        if getattr(self._local, "depth", 0):
+            # Inside a transaction: hold the event until COMMIT
+            self._local.pending.append((table, action, row))
+        else:
+            self.change_feed.publish(table, action, row)
+
+    # ============ ROW HELPERS ============
+
+    def _to_dict(self, row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        if row is None:
+            return None
+        result = dict(row)
+        for column in JSON_COLUMNS & result.keys():
+            result[column] = json.loads(result[column]) if result[column] else []
+        return result
+
+    def _encode(self, values: Dict) -> Dict:
+        return {
+            column: json.dumps(value) if column in JSON_COLUMNS else value
+            for column, value in values.items()
+        }
+
+    def _select(self, sql: str, params: Iterable = ()) -> List[Dict]:
+        return [self._to_dict(row) for row in self._conn().execute(sql, tuple(params))]
+
+    def _select_one(self, sql: str, params: Iterable = ()) -> Optional[Dict]:
+        return self._to_dict(self._conn().execute(sql, tuple(params)).fetchone())
+
+    def _select_in(self, table: str, column: str, values: List[str]) -> List[Dict]:
+        """Fetch rows whose column is in values, one query per chunk"""
+        values = list(dict.fromkeys(v for v in values if v))
+        rows = []
+        for start in range(0, len(values), IN_FILTER_CHUNK):
+            chunk = values[start:start + IN_FILTER_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(self._select(f"SELECT * FROM {table} WHERE {column} IN ({placeholders})", chunk))
+        return rows
+
+    def _insert(self, table: str, row: Dict) -> Dict:
+        encoded = self._encode(row)
+        columns = ", ".join(encoded)
+        placeholders = ", ".join("?" * len(encoded))
+        with self.transaction() as conn:
+            conn.execute(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", tuple(encoded.values()))
+            created = self._to_dict(conn.execute(f"SELECT * FROM {table} WHERE id = ?", (row["id"],)).fetchone())
+        self._publish(table, "create", created)
+        return created
+
+    def _update(self, table: str, row_id: str, updates: Dict) -> Optional[Dict]:
+        encoded = self._encode(updates)
+        assignments = ", ".join(f"{column} = ?" for column in encoded)
+        with self.transaction() as conn:
+            conn.execute(f"UPDATE {table} SET {assignments} WHERE id = ?", (*encoded.values(), row_id))
+            updated = self._to_dict(conn.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,)).fetchone())
+        self._publish(table, "update", updated)
+        return updated
+
+    def import_data(self, data: Dict[str, List[Dict]]):
+        """Copy rows from a database.json-style dict (e.g. when migrating)"""
+        with self.transaction() as conn:
+            for table, rows in data.items():
+                for row in rows:
+                    encoded = self._encode(row)
+                    columns = ", ".join(encoded)
+                    placeholders = ", ".join("?" * len(encoded))
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})",
+                        tuple(encoded.values())
+                    )
+
+    # ============ PAGINATION ============
+
+    def get_page(self, table: str, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Cursor] = None,
+                 status: Optional[str] = None) -> List[Dict]:
+        """Next `limit` rows ordered by (created_at, id), strictly after the cursor
+
+        Served by the (created_at, id) indexes, so every page is a range scan.
+        """
+        check_table(table)
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if after is not None:
+            clauses.append("(created_at, id) > (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._select(f"SELECT * FROM {table} {where} ORDER BY created_at, id LIMIT ?", [*params, limit])
+
+    # ============ USER OPERATIONS ============
+
+    def get_user(self, user_id: str) -> Optional[Dict]:
+        """Get user by ID"""
+        return self._select_one("SELECT * FROM users WHERE id = ?", (user_id,))
+
+    def get_all_users(self) -> List[Dict]:
+        """Get all users"""
+        return self._select("SELECT * FROM users ORDER BY rowid")
+
+    def get_users_by_ids(self, user_ids: List[str]) -> List[Dict]:
+        """Get many users in as few queries as possible"""
+        return self._select_in("users", "id", user_ids)
+
+    def create_user(self, name: str, email: str, company: str = "", role: str = "founder") -> Dict:
+        """Create a new user"""
+        return self._insert("users", {
+            "id": self._generate_id("u"),
+            "name": name,
+            "email": email,
+            "company": company,
+            "role": role,
+            "skills": [],
+            "created_at": self._get_timestamp()
+        })
+
+    # ============ NEED OPERATIONS ============
+
+    def get_need(self, need_id: str) -> Optional[Dict]:
+        """Get need by ID"""
+        return self._select_one("SELECT * FROM needs WHERE id = ?", (need_id,))
+
+    def get_needs_by_ids(self, need_ids: List[str]) -> List[Dict]:
+        """Get many needs in as few queries as possible"""
+        return self._select_in("needs", "id", need_ids)
+
+    def get_needs_by_user(self, user_id: str) -> List[Dict]:
+        """Get all needs for a user"""
+        return self._select("SELECT * FROM needs WHERE user_id = ? ORDER BY rowid", (user_id,))
+
+    def get_all_active_needs(self) -> List[Dict]:
+        """Get all active needs"""
+        return self._select("SELECT * FROM needs WHERE status = 'active' ORDER BY rowid")
+
+    def create_need(self, user_id: str, label: str, category: str) -> Dict:
+        """Create a new need"""
+        return self._insert("needs", {
+            "id": self._generate_id("n"),
+            "user_id": user_id,
+            "label": label,
+            "category": category,
+            "status": "active",
+            "created_at": self._get_timestamp()
+        })
+
+    def update_need_status(self, need_id: str, status: str):
+        """Update need status"""
+        return self._update("needs", need_id, {"status": status}) is not None
+
+    # ============ LEARNING OPERATIONS ============
+
+    def get_learning(self, learning_id: str) -> Optional[Dict]:
+        """Get learning by ID"""
+        return self._select_one("SELECT * FROM learnings WHERE id = ?", (learning_id,))
+
+    def get_learnings_by_user(self, user_id: str) -> List[Dict]:
+        """Get all learnings for a user"""
+        return self._select("SELECT * FROM learnings WHERE user_id = ? ORDER BY rowid", (user_id,))
+
+    def get_all_active_learnings(self) -> List[Dict]:
+        """Get all active learnings"""
+        return self._select("SELECT * FROM learnings WHERE status = 'active' ORDER BY rowid")
+
+    def create_learning(self, user_id: str, label: str, category: str) -> Dict:
+        """Create a new learning"""
+        return self._insert("learnings", {
+            "id": self._generate_id("l"),
+            "user_id": user_id,
+            "label": label,
+            "category": category,
+            "status": "active",
+            "created_at": self._get_timestamp()
+        })
+
+    # ============ MATCH OPERATIONS ============
+
+    def get_match(self, match_id: str) -> Optional[Dict]:
+        """Get match by ID"""
+        return self._select_one("SELECT * FROM match_suggestions WHERE id = ?", (match_id,))
+
+    def get_matches_for_user(self, user_id: str) -> List[Dict]:
+        """Get all matches where user is the one needing help"""
+        return self._select("SELECT * FROM match_suggestions WHERE need_user_id = ? ORDER BY rowid", (user_id,))
+
+    def get_matches_for_expert(self, user_id: str) -> List[Dict]:
+        """Get all matches where user is the expert who can help"""
+        return self._select("SELECT * FROM match_suggestions WHERE expert_user_id = ? ORDER BY rowid", (user_id,))
+
+    def get_matches_for_needs(self, need_ids: List[str]) -> List[Dict]:
+        """Get all matches suggested for any of the given needs"""
+        return self._select_in("match_suggestions", "need_id", need_ids)
+
+    def get_all_matches(self) -> List[Dict]:
+        """Get all match suggestions"""
+        return self._select("SELECT * FROM match_suggestions ORDER BY rowid")
+
+    def create_match(self, need_id: str, need_user_id: str, expert_user_id: str,
+                     score: float, reason: str) -> Dict:
+        """Create a new match suggestion"""
+        return self._insert("match_suggestions", {
+            "id": self._generate_id("m"),
+            "need_id": need_id,
+            "need_user_id": need_user_id,
+            "expert_user_id": expert_user_id,
+            "score": score,
+            "reason": reason,
+            "status": "pending",
+            "created_at": self._get_timestamp()
+        })
+
+    def create_matches_bulk(self, matches: List[Dict], upsert: bool = False) -> List[Dict]:
+        """Store many match suggestions at once and return the written rows
+
+        Each item needs need_id, need_user_id, expert_user_id, score and
+        reason. With upsert=True a (need_id, expert_user_id) pair that is
+        already stored gets its score and reason refreshed instead of a
+        duplicate row (id, status and created_at are kept), and repeated
+        pairs within `matches` are written once.
+        """
+        written = []
+        with self.transaction() as conn:
+            stored = {}
+            if upsert:
+                for match in self.get_matches_for_needs([m["need_id"] for m in matches]):
+                    stored.setdefault((match["need_id"], match["expert_user_id"]), match)
+
+            inserts = []
+            updates = {}
+            for match in matches:
+                pair = (match["need_id"], match["expert_user_id"])
+                existing = stored.get(pair)
+                if existing is not None:
+                    if existing in inserts:
+                        existing.update(score=match["score"], reason=match["reason"])
+                    else:
+                        updates[existing["id"]] = {**existing, "score": match["score"], "reason": match["reason"]}
+                    continue
+                row = {
+                    "id": self._generate_id("m"),
+                    "need_id": match["need_id"],
+                    "need_user_id": match["need_user_id"],
+                    "expert_user_id": match["expert_user_id"],
+                    "score": match["score"],
+                    "reason": match["reason"],
+                    "status": "pending",
+                    "created_at": self._get_timestamp()
+                }
+                inserts.append(row)
+                if upsert:
+                    stored[pair] = row
+
+            conn.executemany(
+                "INSERT INTO match_suggestions"
+                " (id, need_id, need_user_id, expert_user_id, score, reason, status, created_at)"
+                " VALUES (:id, :need_id, :need_user_id, :expert_user_id, :score, :reason, :status, :created_at)",
+                inserts
+            )
+            conn.executemany(
+                "UPDATE match_suggestions SET score = :score, reason = :reason WHERE id = :id",
+                list(updates.values())
+            )
+
+            for row in inserts:
+                self._publish("match_suggestions", "create", row)
+                written.append(row)
+            for row in updates.values():
+                self._publish("match_suggestions", "update", row)
+                written.append(row)
+        return written
+
+    def delete_matches(self, match_ids: List[str]) -> List[Dict]:
+        """Delete match suggestions by id and return the removed rows"""
+        with self.transaction() as conn:
+            removed = self._select_in("match_suggestions", "id", match_ids)
+            conn.executemany("DELETE FROM match_suggestions WHERE id = ?", [(match["id"],) for match in removed])
+            for match in removed:
+                self._publish("match_suggestions", "delete", match)
+        return removed
+
+    def update_match_status(self, match_id: str, status: str):
+        """Update match status (pending, accepted, declined)"""
+        return self._update("match_suggestions", match_id, {"status": status}) is not None
+
+    # ============ COFFEE CHAT OPERATIONS ============
+
+    def get_coffee_chat(self, chat_id: str) -> Optional[Dict]:
+        """Get coffee chat by ID"""
+        return self._select_one("SELECT * FROM coffee_chats WHERE id = ?", (chat_id,))
+
+    def get_coffee_chats_by_user(self, user_id: str) -> List[Dict]:
+        """Get all coffee chats for a user (as requester or expert)"""
+        return self._select(
+            "SELECT * FROM coffee_chats WHERE requester_id = ? OR expert_id = ? ORDER BY rowid",
+            (user_id, user_id)
+        )
+
+    def get_all_coffee_chats(self) -> List[Dict]:
+        """Get all coffee chats"""
+        return self._select("SELECT * FROM coffee_chats ORDER BY rowid")
+
+    def create_coffee_chat(self, match_id: str, requester_id: str, expert_id: str) -> Dict:
+        """Create a new coffee chat"""
+        return self._insert("coffee_chats", {
+            "id": self._generate_id("c"),
+            "match_id": match_id,
+            "requester_id": requester_id,
+            "expert_id": expert_id,
+            "status": "pending_slots",
+            "scheduled_time": None,
+            "duration_minutes": 30,
+            "meeting_link": None,
+            "created_at": self._get_timestamp(),
+            "updated_at": self._get_timestamp()
+        })
+
+    def update_coffee_chat(self, chat_id: str, updates: Dict):
+        """Update coffee chat"""
+        updates["updated_at"] = self._get_timestamp()
+        return self._update("coffee_chats", chat_id, updates) is not None
+
+    # ============ TIME SLOT OPERATIONS ============
+
+    def get_slots_for_chats(self, chat_ids: List[str]) -> List[Dict]:
+        """Get proposed time slots for many coffee chats at once"""
+        return self._select_in("proposed_slots", "coffee_chat_id", chat_ids)
+
+    def get_slots_for_chat(self, chat_id: str) -> List[Dict]:
+        """Get all proposed time slots for a coffee chat"""
+        return self._select("SELECT * FROM proposed_slots WHERE coffee_chat_id = ? ORDER BY rowid", (chat_id,))
+
+    def create_slot(self, chat_id: str, proposed_by: str, slot_time: str) -> Dict:
+        """Create a proposed time slot"""
+        return self._insert("proposed_slots", {
+            "id": self._generate_id("ps"),
+            "coffee_chat_id": chat_id,
+            "proposed_by": proposed_by,
+            "slot_time": slot_time,
+            "status": "pending",
+            "created_at": self._get_timestamp()
+        })
+
+    def update_slot_status(self, slot_id: str, status: str):
+        """Update time slot status"""
+        return self._update("proposed_slots", slot_id, {"status": status}) is not None
+
+    # ============ BATCH OPERATIONS ============
+
+    def create_needs_and_learnings(self, user_id: str, needs: List[Dict], learnings: List[Dict]) -> Dict:
+        """Create multiple needs and learnings in one transaction"""
+        with self.batch_writes():
+            created_needs = [self.create_need(user_id, need["label"], need["category"]) for need in needs]
+            created_learnings = [
+                self.create_learning(user_id, learning["label"], learning["category"])
+                for learning in learnings
+            ]
+
+        return {
+            "needs": created_needs,
+            "learnings": created_learnings
+        }
+
+    def update_user_skills(self, user_id: str, skills: List[Dict]):
+        """Update user's inferred skills from their learnings"""
+        with self.transaction():
+            user = self.get_user(user_id)
+            if not user:
+                return False
+
+            # Merge new skills with existing, avoiding duplicates
+            existing_skills = user.get("skills", [])
+            skill_labels = {s["label"] for s in existing_skills}
+
+            for skill in skills:
+                if skill["label"] not in skill_labels:
+                    existing_skills.append(skill)
+                    skill_labels.add(skill["label"])
+
+            self._update("users", user_id, {"skills": existing_skills})
+        return True
+
+    def get_dashboard_stats(self) -> Dict:
+        """Get aggregated stats for admin dashboard"""
+        row = self._conn().execute("""
+            SELECT
+                (SELECT COUNT(*) FROM users) AS total_users,
+                (SELECT COUNT(*) FROM needs WHERE status = 'active') AS total_needs,
+                (SELECT COUNT(*) FROM learnings WHERE status = 'active') AS total_learnings,
+                (SELECT COUNT(*) FROM match_suggestions) AS total_matches,
+                (SELECT COUNT(*) FROM match_suggestions WHERE status = 'pending') AS pending_matches,
+                (SELECT COUNT(*) FROM coffee_chats) AS total_chats,
+                (SELECT COUNT(*) FROM coffee_chats WHERE status = 'confirmed') AS confirmed_chats
+        """).fetchone()
+        return dict(row)
+
+    # ============ GAMIFICATION OPERATIONS ============
+
+    def increment_user(self, user_id: str, xp_amount: int = 0,
+                       stats: Optional[Dict[str, int]] = None) -> Optional[Dict]:
+        """Atomically add XP and activity counters to a user
+
+        The read, level/badge computation and write share one IMMEDIATE
+        transaction, so concurrent workers never lose increments.
+        """
+        stats = validate_stats(stats)
+        with self.transaction():
+            user = self.get_user(user_id)
+            if not user:
+                return None
+            updates, result = apply_increment(user, xp_amount, stats)
+            self._update("users", user_id, updates)
+        return result
+
+    def award_xp(self, user_id: str, xp_amount: int, reason: str = "",
+                 stats: Optional[Dict[str, int]] = None) -> Optional[Dict]:
+        """Award XP to a user (plus optional stat increments) and check for level ups"""
+        return self.increment_user(user_id, xp_amount, stats)
+
+    def update_user_stats(self, user_id: str, stat_name: str, increment: int = 1):
+        """Update user activity stats"""
+        return self.increment_user(user_id, 0, {stat_name: increment}) is not None
+
+    def get_leaderboard(self, limit: int = 10) -> List[Dict]:
+        """Get top users by XP"""
+        return self._select("SELECT * FROM users ORDER BY xp DESC LIMIT ?", (limit,))
+
+    def update_user_bio(self, user_id: str, bio: str):
+        """Update user biography"""
+        return self._update("users", user_id, {"bio": bio}) is not None
+
+    def get_community_stats(self) -> Dict:
+        """Get weekly community statistics"""
+        conn = self._conn()
+        week_ago = (datetime.utcnow() - timedelta(days=7)).isoformat() + "Z"
+
+        counts = dict(conn.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM users) AS total_users,
+                (SELECT COUNT(*) FROM users WHERE created_at >= :week_ago) AS new_users_this_week,
+                (SELECT COUNT(*) FROM needs WHERE status = 'active' AND created_at >= :week_ago) AS needs_this_week,
+                (SELECT COUNT(*) FROM learnings WHERE status = 'active' AND created_at >= :week_ago) AS learnings_this_week,
+                (SELECT COUNT(*) FROM match_suggestions WHERE created_at >= :week_ago) AS matches_this_week,
+                (SELECT COUNT(*) FROM coffee_chats WHERE created_at >= :week_ago) AS chats_this_week,
+                (SELECT COALESCE(SUM(xp), 0) FROM users) AS total_xp_awarded
+        """, {"week_ago": week_ago}).fetchone())
+
+        # Skill category distribution across active learnings, top 5
+        top_skills = conn.execute("""
+            SELECT COALESCE(category, 'other') AS category, COUNT(*) AS count
+            FROM learnings WHERE status = 'active'
+            GROUP BY COALESCE(category, 'other')
+            ORDER BY count DESC
+            LIMIT 5
+        """).fetchall()
+
+        # Most active users
+        active_users = conn.execute("""
+            SELECT id, name, activity_score, level, xp FROM (
+                SELECT id, name, level, xp,
+                       total_checkins * 3 + total_matches * 2 + total_chats * 5 AS activity_score
+                FROM users
+            )
+            WHERE activity_score > 0
+            ORDER BY activity_score DESC
+            LIMIT 5
+        """).fetchall()
+
+        total_xp_awarded = counts.pop("total_xp_awarded")
+        return {
+            **counts,
+            "top_skills": [dict(row) for row in top_skills],
+            "most_active_users": [dict(row) for row in active_users],
+            "total_xp_awarded": total_xp_awarded
+        }
@@ -4,15 +4,28 @@ Handles all database operations with Supabase PostgreSQL
 """
 
 import os
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from typing import List, Dict, Optional
 import uuid
+import weakref
+from postgrest.exceptions import APIError
 from supabase import create_client, Client
 
+from gamification import apply_increment, validate_stats
+from pagination import DEFAULT_PAGE_SIZE, Cursor, check_table
+
+# Ids per `in_` filter; keeps PostgREST request URLs comfortably short
+IN_FILTER_CHUNK = 200
+
+# PostgREST / Postgres error codes for an RPC function that does not exist
+UNDEFINED_FUNCTION_CODES = ("PGRST202", "42883")
+
 class DatabaseManager:
     """Manages all database operations with Supabase"""
     
-    def __init__(self):
+    def __init__(self, change_feed=None):
         # Get Supabase credentials from environment
         supabase_url = os.getenv("SUPABASE_URL")
         supabase_key = os.getenv("SUPABASE_KEY")
@@ -21,6 +34,31 @@ class DatabaseManager:
             raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
         
         self.supabase: Client = create_client(supabase_url, supabase_key)
+        
+        # The client's HTTP connection pool must not be shared across fork
+        # (gunicorn workers forked from a preloaded master)
+        if hasattr(os, "register_at_fork"):
+            ref = weakref.ref(self)
+            os.register_at_fork(
+                after_in_child=lambda: ref() and setattr(ref(), "supabase", create_client(supabase_url, supabase_key))
+            )
+        
+        # Optional ChangeFeed that receives an event for every write
+        self.change_feed = change_feed
+        
+        # Cleared if the increment_user / upsert_match_suggestions RPCs are missing from the database
+        self._increment_rpc_available = True
+        self._upsert_matches_rpc_available = True
+        
+        # Inserts queued by batch_writes(): {table: [row, ...]}, None when not batching
+        self._pending_inserts: ContextVar[Optional[Dict[str, List[Dict]]]] = ContextVar(
+            f"pending_inserts_{id(self)}", default=None
+        )
+        
+        # Per-request identity map: {table: {id: row}}, None when not in a scope
+        self._identity_map: ContextVar[Optional[Dict[str, Dict[str, Dict]]]] = ContextVar(
+            f"identity_map_{id(self)}", default=None
+        )
     
     def _generate_id(self, prefix: str) -> str:
         """Generate unique ID with prefix"""
@@ -30,52 +68,201 @@ class DatabaseManager:
         """Get current timestamp in ISO format"""
         return datetime.utcnow().isoformat() + "Z"
     
+    # ============ WRITE BATCHING ============
+    
+    @contextmanager
+    def batch_writes(self):
+        """Group inserts made inside this block into one request per table
+        
+        create_* calls return their row (with its generated id) right away
+        but the insert is queued; queued rows are sent as one list insert per
+        table when the block exits, or earlier as soon as any other query
+        runs, so reads and updates always see them. If the block raises,
+        queued inserts are dropped. Scopes nest like identity_map().
+        """
+        if self._pending_inserts.get() is not None:
+            yield
+            return
+        token = self._pending_inserts.set({})
+        try:
+            yield
+            self.flush()
+        finally:
+            self._pending_inserts.reset(token)
+    
+    def flush(self):
+        """Send queued inserts now, one list insert per table"""
+        pending = self._pending_inserts.get()
+        if not pending:
+            return
+        batches = list(pending.items())
+        pending.clear()
+        for table, rows in batches:
+            response = self.supabase.table(table).insert(rows).execute()
+            self._publish(table, "create", response.data)
+    
+    def _table(self, table: str):
+        """Query builder for a table, after sending any queued inserts"""
+        self.flush()
+        return self.supabase.table(table)
+    
+    def _rpc(self, function: str, params: Dict):
+        self.flush()
+        return self.supabase.rpc(function, params)
+    
+    def _insert(self, table: str, row: Dict) -> Dict:
+        """Insert one row now, or queue it when inside batch_writes()"""
+        pending = self._pending_inserts.get()
+        if pending is not None:
+            pending.setdefault(table, []).append(row)
+            self._remember(table, self._prepare(table, [row]))
+            return row
+        response = self.supabase.table(table).insert(row).execute()
+        self._publish(table, "create", response.data)
+        return response.data[0]
+    
+    # ============ IDENTITY MAP ============
+    
+    @contextmanager
+    def identity_map(self):
+        """Fetch each row at most once inside this block
+        
+        While active, get_user/get_need/... return the cached row when it has
+        already been read or written in the same scope, and every write
+        replaces the cached copy with the row Supabase returns. Scopes are
+        per thread/context and nest (inner blocks reuse the outer map).
+        """
+        if self._identity_map.get() is not None:
+            yield
+            return
+        token = self._identity_map.set({})
+        try:
+            yield
+        finally:
+            self._identity_map.reset(token)
+    
+    def _remember(self, table: str, rows: Optional[List[Dict]]) -> Optional[List[Dict]]:
+        """Store rows in the active identity map (no-op outside a scope)"""
+        identity_map = self._identity_map.get()
+        if identity_map is not None and rows:
+            cached = identity_map.setdefault(table, {})
+            for row in rows:
+                cached[row["id"]] = row
+        return rows
+    
+    def _forget(self, table: str, row_ids: List[str]):
+        """Drop deleted rows from the active identity map"""
+        identity_map = self._identity_map.get()
+        if identity_map is not None:
+            cached = identity_map.get(table, {})
+            for row_id in row_ids:
+                cached.pop(row_id, None)
+    
+    def _cached(self, table: str, row_id: str) -> Optional[Dict]:
+        identity_map = self._identity_map.get()
+        if identity_map is None:
+            return None
+        return identity_map.get(table, {}).get(row_id)
+    
+    def _get_by_id(self, table: str, row_id: str) -> Optional[Dict]:
+        """Single-row lookup that goes through the identity map"""
+        row = self._cached(table, row_id)
+        if row is None:
+            response = self._table(table).select("*").eq("id", row_id).execute()
+            rows = self._prepare(table, response.data)
+            self._remember(table, rows)
+            row = rows[0] if rows else None
+        return row
+    
+    def _get_by_ids(self, table: str, row_ids: List[str]) -> List[Dict]:
+        """Bulk lookup that only queries ids missing from the identity map"""
+        found = {}
+        missing = []
+        for row_id in dict.fromkeys(row_ids):
+            row = self._cached(table, row_id)
+            if row is not None:
+                found[row_id] = row
+            elif row_id:
+                missing.append(row_id)
+        fetched = self._prepare(table, self._select_in(table, "id", missing))
+        self._remember(table, fetched)
+        found.update((row["id"], row) for row in fetched)
+        return list(found.values())
+    
+    def _prepare(self, table: str, rows: Optional[List[Dict]]) -> List[Dict]:
+        """Normalize rows read from or written to a table"""
+        rows = rows or []
+        if table == "users":
+            return [self._with_user_defaults(row) for row in rows]
+        return rows
+    
+    def _publish(self, table: str, action: str, rows: Optional[List[Dict]]):
+        """Refresh written rows in the identity map and send them to the change feed"""
+        self._remember(table, self._prepare(table, rows))
+        if self.change_feed and rows:
+            for row in rows:
+                self.change_feed.publish(table, action, row)
+    
+    def _select_in(self, table: str, column: str, values: List[str]) -> List[Dict]:
+        """Fetch rows whose column is in values, one `in_` query per chunk"""
+        values = list(dict.fromkeys(v for v in values if v))
+        rows = []
+        for start in range(0, len(values), IN_FILTER_CHUNK):
+            chunk = values[start:start + IN_FILTER_CHUNK]
+            response = self._table(table).select("*").in_(column, chunk).execute()
+            rows.extend(response.data)
+        return rows
+    
+    # ============ PAGINATION ============
+    
+    def get_page(self, table: str, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Cursor] = None,
+                 status: Optional[str] = None) -> List[Dict]:
+        """Next `limit` rows ordered by (created_at, id), strictly after the cursor"""
+        check_table(table)
+        query = self._table(table).select("*")
+        if status is not None:
+            query = query.eq("status", status)
+        if after is not None:
+            created_at, row_id = after
+            # Quoted: timestamps contain PostgREST's reserved ':' and '.'
+            query = query.or_(
+                f'created_at.gt."{created_at}",and(created_at.eq."{created_at}",id.gt."{row_id}")'
+            )
+        response = query.order("created_at").order("id").limit(limit).execute()
+        return self._prepare(table, response.data)
+    
     # ============ USER OPERATIONS ============
     
+    def _with_user_defaults(self, user: Dict) -> Dict:
+        """Add default values for gamification fields if they don't exist (for existing users)"""
+        if 'xp' not in user or user.get('xp') is None:
+            user['xp'] = 0
+        if 'level' not in user or user.get('level') is None:
+            user['level'] = 1
+        if 'badges' not in user or user.get('badges') is None:
+            user['badges'] = []
+        if 'bio' not in user or user.get('bio') is None:
+            user['bio'] = ''
+        if 'total_checkins' not in user or user.get('total_checkins') is None:
+            user['total_checkins'] = 0
+        if 'total_matches' not in user or user.get('total_matches') is None:
+            user['total_matches'] = 0
+        if 'total_chats' not in user or user.get('total_chats') is None:
+            user['total_chats'] = 0
+        return user
+    
     def get_user(self, user_id: str) -> Optional[Dict]:
         """Get user by ID"""
-        response = self.supabase.table("users").select("*").eq("id", user_id).execute()
-        if response.data:
-            user = response.data[0]
-            # Add default values for gamification fields if they don't exist (for existing users)
-            if 'xp' not in user or user.get('xp') is None:
-                user['xp'] = 0
-            if 'level' not in user or user.get('level') is None:
-                user['level'] = 1
-            if 'badges' not in user or user.get('badges') is None:
-                user['badges'] = []
-            if 'bio' not in user or user.get('bio') is None:
-                user['bio'] = ''
-            if 'total_checkins' not in user or user.get('total_checkins') is None:
-                user['total_checkins'] = 0
-            if 'total_matches' not in user or user.get('total_matches') is None:
-                user['total_matches'] = 0
-            if 'total_chats' not in user or user.get('total_chats') is None:
-                user['total_chats'] = 0
-            return user
-        return None
+        return self._get_by_id("users", user_id)
     
     def get_all_users(self) -> List[Dict]:
         """Get all users"""
-        response = self.supabase.table("users").select("*").execute()
-        users = response.data
-        # Add default values for gamification fields if they don't exist (for existing users)
-        for user in users:
-            if 'xp' not in user or user.get('xp') is None:
-                user['xp'] = 0
-            if 'level' not in user or user.get('level') is None:
-                user['level'] = 1
-            if 'badges' not in user or user.get('badges') is None:
-                user['badges'] = []
-            if 'bio' not in user or user.get('bio') is None:
-                user['bio'] = ''
-            if 'total_checkins' not in user or user.get('total_checkins') is None:
-                user['total_checkins'] = 0
-            if 'total_matches' not in user or user.get('total_matches') is None:
-                user['total_matches'] = 0
-            if 'total_chats' not in user or user.get('total_chats') is None:
-                user['total_chats'] = 0
-        return users
+        response = self._table("users").select("*").execute()
+        return self._prepare("users", response.data)
+    
+    def get_users_by_ids(self, user_ids: List[str]) -> List[Dict]:
+        """Get many users in as few queries as possible"""
+        return self._get_by_ids("users", user_ids)
     
     def create_user(self, name: str, email: str, company: str = "", role: str = "founder") -> Dict:
         """Create a new user"""
@@ -95,24 +282,26 @@ class DatabaseManager:
             "total_chats": 0,
             "created_at": self._get_timestamp()
         }
-        response = self.supabase.table("users").insert(user).execute()
-        return response.data[0]
+        return self._insert("users", user)
     
     # ============ NEED OPERATIONS ============
     
     def get_need(self, need_id: str) -> Optional[Dict]:
         """Get need by ID"""
-        response = self.supabase.table("needs").select("*").eq("id", need_id).execute()
-        return response.data[0] if response.data else None
+        return self._get_by_id("needs", need_id)
+    
+    def get_needs_by_ids(self, need_ids: List[str]) -> List[Dict]:
+        """Get many needs in as few queries as possible"""
+        return self._get_by_ids("needs", need_ids)
     
     def get_needs_by_user(self, user_id: str) -> List[Dict]:
         """Get all needs for a user"""
-        response = self.supabase.table("needs").select("*").eq("user_id", user_id).execute()
+        response = self._table("needs").select("*").eq("user_id", user_id).execute()
         return response.data
     
     def get_all_active_needs(self) -> List[Dict]:
         """Get all active needs"""
-        response = self.supabase.table("needs").select("*").eq("status", "active").execute()
+        response = self._table("needs").select("*").eq("status", "active").execute()
         return response.data
     
     def create_need(self, user_id: str, label: str, category: str) -> Dict:
@@ -125,29 +314,28 @@ class DatabaseManager:
             "status": "active",
             "created_at": self._get_timestamp()
         }
-        response = self.supabase.table("needs").insert(need).execute()
-        return response.data[0]
+        return self._insert("needs", need)
     
     def update_need_status(self, need_id: str, status: str):
         """Update need status"""
-        self.supabase.table("needs").update({"status": status}).eq("id", need_id).execute()
+        response = self._table("needs").update({"status": status}).eq("id", need_id).execute()
+        self._publish("needs", "update", response.data)
         return True
     
     # ============ LEARNING OPERATIONS ============
     
     def get_learning(self, learning_id: str) -> Optional[Dict]:
         """Get learning by ID"""
-        response = self.supabase.table("learnings").select("*").eq("id", learning_id).execute()
-        return response.data[0] if response.data else None
+        return self._get_by_id("learnings", learning_id)
     
     def get_learnings_by_user(self, user_id: str) -> List[Dict]:
         """Get all learnings for a user"""
-        response = self.supabase.table("learnings").select("*").eq("user_id", user_id).execute()
+        response = self._table("learnings").select("*").eq("user_id", user_id).execute()
         return response.data
     
     def get_all_active_learnings(self) -> List[Dict]:
         """Get all active learnings"""
-        response = self.supabase.table("learnings").select("*").eq("status", "active").execute()
+        response = self._table("learnings").select("*").eq("status", "active").execute()
         return response.data
     
     def create_learning(self, user_id: str, label: str, category: str) -> Dict:
@@ -160,35 +348,37 @@ class DatabaseManager:
             "status": "active",
             "created_at": self._get_timestamp()
         }
-        response = self.supabase.table("learnings").insert(learning).execute()
-        return response.data[0]
+        return self._insert("learnings", learning)
     
     # ============ MATCH OPERATIONS ============
     
     def get_match(self, match_id: str) -> Optional[Dict]:
         """Get match by ID"""
-        response = self.supabase.table("match_suggestions").select("*").eq("id", match_id).execute()
-        return response.data[0] if response.data else None
+        return self._get_by_id("match_suggestions", match_id)
     
     def get_matches_for_user(self, user_id: str) -> List[Dict]:
         """Get all matches where user is the one needing help"""
-        response = self.supabase.table("match_suggestions").select("*").eq("need_user_id", user_id).execute()
+        response = self._table("match_suggestions").select("*").eq("need_user_id", user_id).execute()
         return response.data
     
     def get_matches_for_expert(self, user_id: str) -> List[Dict]:
         """Get all matches where user is the expert who can help"""
-        response = self.supabase.table("match_suggestions").select("*").eq("expert_user_id", user_id).execute()
+        response = self._table("match_suggestions").select("*").eq("expert_user_id", user_id).execute()
         return response.data
     
+    def get_matches_for_needs(self, need_ids: List[str]) -> List[Dict]:
+        """Get all matches suggested for any of the given needs"""
+        return self._select_in("match_suggestions", "need_id", need_ids)
+    
     def get_all_matches(self) -> List[Dict]:
         """Get all match suggestions"""
-        response = self.supabase.table("match_suggestions").select("*").execute()
+        response = self._table("match_suggestions").select("*").execute()
         return response.data
     
-    def create_match(self, need_id: str, need_user_id: str, expert_user_id: str, 
-                     score: float, reason: str) -> Dict:
-        """Create a new match suggestion"""
-        match = {
+    def _match_row(self, need_id: str, need_user_id: str, expert_user_id: str,
+                   score: float, reason: str) -> Dict:
+        """Build a new pending match suggestion row"""
+        return {
             "id": self._generate_id("m"),
             "need_id": need_id,
             "need_user_id": need_user_id,
@@ -198,31 +388,118 @@ class DatabaseManager:
             "status": "pending",
             "created_at": self._get_timestamp()
         }
-        response = self.supabase.table("match_suggestions").insert(match).execute()
-        return response.data[0]
+    
+    def create_match(self, need_id: str, need_user_id: str, expert_user_id: str, 
+                     score: float, reason: str) -> Dict:
+        """Create a new match suggestion"""
+        match = self._match_row(need_id, need_user_id, expert_user_id, score, reason)
+        return self._insert("match_suggestions", match)
+    
+    def create_matches_bulk(self, matches: List[Dict], upsert: bool = False) -> List[Dict]:
+        """Store many match suggestions at once and return the written rows
+        
+        Each item needs need_id, need_user_id, expert_user_id, score and
+        reason. With upsert=True a (need_id, expert_user_id) pair that is
+        already stored gets its score and reason refreshed instead of a
+        duplicate row (id, status and created_at are kept), and repeated
+        pairs within `matches` are written once.
+        
+        Upserts run the upsert_match_suggestions Postgres function
+        (supabase_functions.sql) in one statement against the unique
+        (need_id, expert_user_id) constraint, so concurrent check-ins cannot
+        insert the same pair twice. If the function has not been installed
+        yet we fall back to looking up stored pairs, then writing.
+        """
+        if not matches:
+            return []
+        
+        rows = []
+        written_pairs = set()
+        for match in matches:
+            pair = (match["need_id"], match["expert_user_id"])
+            if upsert and pair in written_pairs:
+                continue
+            written_pairs.add(pair)
+            rows.append(self._match_row(match["need_id"], match["need_user_id"],
+                                        match["expert_user_id"], match["score"], match["reason"]))
+        
+        if not upsert:
+            created = self._table("match_suggestions").insert(rows).execute().data
+            self._publish("match_suggestions", "create", created)
+            return created
+        
+        if self._upsert_matches_rpc_available:
+            try:
+                response = self._rpc("upsert_match_suggestions", {"p_rows": rows}).execute()
+            except APIError as e:
+                if e.code not in UNDEFINED_FUNCTION_CODES:
+                    raise
+                print("upsert_match_suggestions() not found in Supabase; run supabase_functions.sql. "
+                      "Falling back to non-atomic upserts.")
+                self._upsert_matches_rpc_available = False
+            else:
+                created = [r["suggestion"] for r in response.data if r["inserted"]]
+                updated = [r["suggestion"] for r in response.data if not r["inserted"]]
+                self._publish("match_suggestions", "create", created)
+                self._publish("match_suggestions", "update", updated)
+                return created + updated
+        
+        existing = {}
+        for match in self.get_matches_for_needs([row["need_id"] for row in rows]):
+            existing.setdefault((match["need_id"], match["expert_user_id"]), match)
+        
+        new_rows = [row for row in rows if (row["need_id"], row["expert_user_id"]) not in existing]
+        created = []
+        if new_rows:
+            created = self._table("match_suggestions").insert(new_rows).execute().data
+            self._publish("match_suggestions", "create", created)
+        updated = []
+        for row in rows:
+            stored = existing.get((row["need_id"], row["expert_user_id"]))
+            if stored:
+                # Only the refreshed columns: the stored row may be stale
+                # (e.g. status changed by another writer) and must not be written back
+                updated.extend(self._table("match_suggestions")
+                               .update({"score": row["score"], "reason": row["reason"]})
+                               .eq("id", stored["id"]).execute().data)
+        self._publish("match_suggestions", "update", updated)
+        return created + updated
+    
+    def delete_matches(self, match_ids: List[str]) -> List[Dict]:
+        """Delete match suggestions by id and return the removed rows"""
+        match_ids = list(dict.fromkeys(m for m in match_ids if m))
+        removed = []
+        for start in range(0, len(match_ids), IN_FILTER_CHUNK):
+            chunk = match_ids[start:start + IN_FILTER_CHUNK]
+            removed.extend(self._table("match_suggestions").delete().in_("id", chunk).execute().data)
+        self._forget("match_suggestions", [match["id"] for match in removed])
+        if self.change_feed:
+            for match in removed:
+                self.change_feed.publish("match_suggestions", "delete", match)
+        return removed
     
     def update_match_status(self, match_id: str, status: str):
         """Update match status (pending, accepted, declined)"""
-        self.supabase.table("match_suggestions").update({"status": status}).eq("id", match_id).execute()
+        response = self._table("match_suggestions").update({"status": status}).eq("id", match_id).execute()
+        self._publish("match_suggestions", "update", response.data)
         return True
     
     # ============ COFFEE CHAT OPERATIONS ============
     
     def get_coffee_chat(self, chat_id: str) -> Optional[Dict]:
         """Get coffee chat by ID"""
-        response = self.supabase.table("coffee_chats").select("*").eq("id", chat_id).execute()
-        return response.data[0] if response.data else None
+        return self._get_by_id("coffee_chats", chat_id)
     
     def get_coffee_chats_by_user(self, user_id: str) -> List[Dict]:
         """Get all coffee chats for a user (as requester or expert)"""
-        response = self.supabase.table("coffee_chats").select("*").or_(
+        response = self._table("coffee_chats").select("*").or_(
             f"requester_id.eq.{user_id},expert_id.eq.{user_id}"
         ).execute()
         return response.data
     
     def get_all_coffee_chats(self) -> List[Dict]:
         """Get all coffee chats"""
-        response = self.supabase.table("coffee_chats").select("*").execute()
+        response = self._table("coffee_chats").select("*").execute()
         return response.data
     
     def create_coffee_chat(self, match_id: str, requester_id: str, expert_id: str) -> Dict:
@@ -239,20 +516,24 @@ class DatabaseManager:
             "created_at": self._get_timestamp(),
             "updated_at": self._get_timestamp()
         }
-        response = self.supabase.table("coffee_chats").insert(chat).execute()
-        return response.data[0]
+        return self._insert("coffee_chats", chat)
     
     def update_coffee_chat(self, chat_id: str, updates: Dict):
         """Update coffee chat"""
         updates["updated_at"] = self._get_timestamp()
-        self.supabase.table("coffee_chats").update(updates).eq("id", chat_id).execute()
+        response = self._table("coffee_chats").update(updates).eq("id", chat_id).execute()
+        self._publish("coffee_chats", "update", response.data)
         return True
     
     # ============ TIME SLOT OPERATIONS ============
     
+    def get_slots_for_chats(self, chat_ids: List[str]) -> List[Dict]:
+        """Get proposed time slots for many coffee chats at once"""
+        return self._select_in("proposed_slots", "coffee_chat_id", chat_ids)
+    
     def get_slots_for_chat(self, chat_id: str) -> List[Dict]:
         """Get all proposed time slots for a coffee chat"""
-        response = self.supabase.table("proposed_slots").select("*").eq("coffee_chat_id", chat_id).execute()
+        response = self._table("proposed_slots").select("*").eq("coffee_chat_id", chat_id).execute()
         return response.data
     
     def create_slot(self, chat_id: str, proposed_by: str, slot_time: str) -> Dict:
@@ -265,26 +546,27 @@ class DatabaseManager:
             "status": "pending",
             "created_at": self._get_timestamp()
         }
-        response = self.supabase.table("proposed_slots").insert(slot).execute()
-        return response.data[0]
+        return self._insert("proposed_slots", slot)
     
     def update_slot_status(self, slot_id: str, status: str):
         """Update time slot status"""
-        self.supabase.table("proposed_slots").update({"status": status}).eq("id", slot_id).execute()
+        response = self._table("proposed_slots").update({"status": status}).eq("id", slot_id).execute()
+        self._publish("proposed_slots", "update", response.data)
         return True
     
     # ============ BATCH OPERATIONS ============
     
     def create_needs_and_learnings(self, user_id: str, needs: List[Dict], learnings: List[Dict]) -> Dict:
-        """Create multiple needs and learnings at once"""
+        """Create multiple needs and learnings at once (one insert per table)"""
         created_needs = []
         created_learnings = []
         
-        for need in needs:
-            created_needs.append(self.create_need(user_id, need["label"], need["category"]))
-        
-        for learning in learnings:
-            created_learnings.append(self.create_learning(user_id, learning["label"], learning["category"]))
+        with self.batch_writes():
+            for need in needs:
+                created_needs.append(self.create_need(user_id, need["label"], need["category"]))
+            
+            for learning in learnings:
+                created_learnings.append(self.create_learning(user_id, learning["label"], learning["category"]))
         
         return {
             "needs": created_needs,
@@ -307,7 +589,8 @@ class DatabaseManager:
                 skill_labels.add(skill["label"])
         
         # Update in Supabase
-        self.supabase.table("users").update({"skills": existing_skills}).eq("id", user_id).execute()
+        response = self._table("users").update({"skills": existing_skills}).eq("id", user_id).execute()
+        self._publish("users", "update", response.data)
         return True
     
     def get_dashboard_stats(self) -> Dict:
@@ -333,74 +616,63 @@ class DatabaseManager:
     
     # ============ GAMIFICATION OPERATIONS ============
     
-    def award_xp(self, user_id: str, xp_amount: int, reason: str = "") -> Dict:
-        """Award XP to a user and check for level ups"""
+    def increment_user(self, user_id: str, xp_amount: int = 0,
+                       stats: Optional[Dict[str, int]] = None) -> Optional[Dict]:
+        """Atomically add XP and activity counters to a user
+        
+        Runs the increment_user Postgres function (supabase_functions.sql),
+        which locks the row, applies the increments, recomputes level and
+        badges and returns the result in one round-trip. If the function has
+        not been installed yet we fall back to read-modify-write.
+        """
+        stats = validate_stats(stats)
+        if self._increment_rpc_available:
+            try:
+                response = self._rpc("increment_user", {
+                    "p_user_id": user_id,
+                    "p_xp": xp_amount,
+                    "p_stats": stats
+                }).execute()
+            except APIError as e:
+                if e.code not in UNDEFINED_FUNCTION_CODES:
+                    raise
+                print("increment_user() not found in Supabase; run supabase_functions.sql. "
+                      "Falling back to non-atomic updates.")
+                self._increment_rpc_available = False
+            else:
+                result = response.data
+                if not result:
+                    return None
+                user = result.pop("user")
+                self._publish("users", "update", [user])
+                return result
+        
         user = self.get_user(user_id)
         if not user:
             return None
-        
-        current_xp = user.get("xp", 0)
-        current_level = user.get("level", 1)
-        new_xp = current_xp + xp_amount
-        
-        # Calculate new level using progressive XP requirement
-        # Level 1->2: 100 XP, Level 2->3: 150 XP, Level 3->4: 200 XP, etc.
-        # Formula: XP for level n = 25(n-1)(n+2)
-        # Solve for n: n = floor((-1 + sqrt(225 + 4*xp) / 5) / 2) + 1
-        import math
-        new_level = int((-1 + math.sqrt(225 + 4 * new_xp) / 5) / 2) + 1
-        new_level = max(1, new_level)  # Ensure level is at least 1
-        
-        # Check for new badges
-        badges = user.get("badges", [])
-        new_badges = []
-        
-        # Badge logic
-        if new_xp >= 100 and "First Steps" not in badges:
-            badges.append("First Steps")
-            new_badges.append("First Steps")
-        if new_xp >= 500 and "Rising Star" not in badges:
-            badges.append("Rising Star")
-            new_badges.append("Rising Star")
-        if new_xp >= 1000 and "Community Leader" not in badges:
-            badges.append("Community Leader")
-            new_badges.append("Community Leader")
-        
-        # Update user
-        updates = {
-            "xp": new_xp,
-            "level": new_level,
-            "badges": badges
-        }
-        self.supabase.table("users").update(updates).eq("id", user_id).execute()
-        
-        return {
-            "xp_gained": xp_amount,
-            "total_xp": new_xp,
-            "level": new_level,
-            "leveled_up": new_level > current_level,
-            "new_badges": new_badges
-        }
+        updates, result = apply_increment(user, xp_amount, stats)
+        response = self._table("users").update(updates).eq("id", user_id).execute()
+        self._publish("users", "update", response.data)
+        return result
+    
+    def award_xp(self, user_id: str, xp_amount: int, reason: str = "",
+                 stats: Optional[Dict[str, int]] = None) -> Dict:
+        """Award XP to a user (plus optional stat increments) and check for level ups"""
+        return self.increment_user(user_id, xp_amount, stats)
     
     def update_user_stats(self, user_id: str, stat_name: str, increment: int = 1):
         """Update user activity stats"""
-        user = self.get_user(user_id)
-        if not user:
-            return False
-        
-        current_value = user.get(stat_name, 0)
-        updates = {stat_name: current_value + increment}
-        self.supabase.table("users").update(updates).eq("id", user_id).execute()
-        return True
+        return self.increment_user(user_id, 0, {stat_name: increment}) is not None
     
     def get_leaderboard(self, limit: int = 10) -> List[Dict]:
         """Get top users by XP"""
-        response = self.supabase.table("users").select("*").order("xp", desc=True).limit(limit).execute()
+        response = self._table("users").select("*").order("xp", desc=True).limit(limit).execute()
         return response.data
     
     def update_user_bio(self, user_id: str, bio: str):
         """Update user biography"""
-        self.supabase.table("users").update({"bio": bio}).eq("id", user_id).execute()
+        response = self._table("users").update({"bio": bio}).eq("id", user_id).execute()
+        self._publish("users", "update", response.data)
         return True
     
     def get_community_stats(self) -> Dict:
@@ -0,0 +1,109 @@
+"""
+Embedding Matrix for Founder Matching System
+Persists a whole embedding matrix as a memory-mappable .npy file
+
+Every process (app.py workers, one mcp_server.py per MCP client) maps the
+same file read-only, so the vectors are shared through the page cache
+instead of being encoded and held privately by each process.
+"""
+
+import hashlib
+import json
+import os
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from vector_index import normalize
+
+# Ends every artifact: <json length: little-endian u64><magic>
+TRAILER_MAGIC = b"FMIDS\x00v1"
+TRAILER_FOOTER = struct.Struct("<Q8s")
+
+# .npy format versions np.lib.format.write_array produces for float32 matrices
+HEADER_READERS = {
+    (1, 0): np.lib.format.read_array_header_1_0,
+    (2, 0): np.lib.format.read_array_header_2_0,
+}
+
+
+class EmbeddingMatrix:
+    """Row-aligned ids and normalized float32 vectors in one file
+
+    `<path>.npy` is a regular .npy matrix followed by a JSON trailer with
+    the row ids, free-form metadata (model name, ...) and the sha256 of the
+    matrix bytes. Ids and vectors therefore change together with a single
+    atomic rename, and a file whose checksum or layout does not add up is
+    treated as missing. np.load() ignores the trailer.
+    """
+
+    def __init__(self, path: str = "founder_embeddings"):
+        self.path = path
+        self.matrix_path = f"{path}.npy"
+
+    def load(self) -> Optional[Tuple[List[str], np.ndarray, Dict]]:
+        """Return (ids, read-only memory-mapped matrix, metadata), or None"""
+        try:
+            # One open file for header, trailer and map, so a concurrent
+            # save() (which renames a new file into place) cannot mix versions
+            with open(self.matrix_path, "rb") as f:
+                version = np.lib.format.read_magic(f)
+                if version not in HEADER_READERS:
+                    return None
+                shape, fortran_order, dtype = HEADER_READERS[version](f)
+                offset = f.tell()
+
+                size = os.fstat(f.fileno()).st_size
+                f.seek(size - TRAILER_FOOTER.size)
+                length, magic = TRAILER_FOOTER.unpack(f.read(TRAILER_FOOTER.size))
+                if magic != TRAILER_MAGIC:
+                    return None
+                f.seek(size - TRAILER_FOOTER.size - length)
+                trailer = json.loads(f.read(length))
+
+                if (len(shape) != 2 or fortran_order or dtype != np.float32
+                        or offset + shape[0] * shape[1] * dtype.itemsize + length + TRAILER_FOOTER.size != size):
+                    return None
+                matrix = np.memmap(f, dtype=dtype, mode="r", shape=shape, offset=offset)
+        except (OSError, ValueError, struct.error):
+            return None
+
+        ids = trailer.get("ids", [])
+        if matrix.shape[0] != len(ids) or hashlib.sha256(matrix).hexdigest() != trailer.get("sha256"):
+            return None
+        return ids, matrix, trailer.get("meta", {})
+
+    def save(self, ids: Sequence[str], vectors: np.ndarray, meta: Optional[Dict] = None):
+        """Normalize and write the vectors with their ids"""
+        vectors = np.ascontiguousarray(normalize(vectors), dtype=np.float32)
+        if len(ids) != vectors.shape[0]:
+            raise ValueError("ids and vectors must have the same length")
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        trailer = json.dumps({
+            "ids": list(ids),
+            "meta": meta or {},
+            "sha256": hashlib.sha256(vectors).hexdigest()
+        }).encode("utf-8")
+
+        # Per-process temp name: several servers may rebuild at once
+        tmp_path = f"{self.matrix_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.lib.format.write_array(f, vectors, allow_pickle=False)
+                f.write(trailer)
+                f.write(TRAILER_FOOTER.pack(len(trailer), TRAILER_MAGIC))
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Processes that already mapped the old matrix keep their inode
+            os.replace(tmp_path, self.matrix_path)
+        except BaseException:
+            # Pid-named leftovers would never be overwritten; drop them
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,102 @@
+"""
+Embedding Store for Founder Matching System
+Persists label embeddings on disk so each label is encoded once per model
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+# SQLite caps bound parameters per statement; stay well below the limit
+_QUERY_CHUNK = 500
+
+
+class EmbeddingStore:
+    """Content-addressed float32 embedding cache backed by SQLite
+
+    Keys are sha256(model_name + label), so switching models never returns
+    stale vectors. SQLite in WAL mode lets several gunicorn workers (and
+    recycled workers) share the same file safely.
+    """
+
+    def __init__(self, path: str = "embeddings.sqlite3", model_name: str = "all-MiniLM-L6-v2"):
+        self.path = path
+        self.model_name = model_name
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " dim INTEGER NOT NULL,"
+            " vector BLOB NOT NULL)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use
+
+        Connections are never reused across fork: a gunicorn worker forked
+        from a preloaded master opens its own.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def key_for(self, label: str) -> str:
+        """Hash a label together with the model name"""
+        return hashlib.sha256(f"{self.model_name}\0{label}".encode("utf-8")).hexdigest()
+
+    def get_many(self, labels: List[str]) -> Dict[str, np.ndarray]:
+        """Return cached vectors for the labels that are present"""
+        keys = {self.key_for(label): label for label in labels}
+        found = {}
+        key_list = list(keys)
+        conn = self._conn()
+
+        for start in range(0, len(key_list), _QUERY_CHUNK):
+            chunk = key_list[start:start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                chunk
+            ).fetchall()
+            for key, blob in rows:
+                found[keys[key]] = np.frombuffer(blob, dtype=np.float32)
+
+        return found
+
+    def put_many(self, vectors: Dict[str, np.ndarray]):
+        """Store vectors for labels, ignoring labels that are already cached"""
+        if not vectors:
+            return
+
+        rows = []
+        for label, vector in vectors.items():
+            vector = np.asarray(vector, dtype=np.float32)
+            rows.append((self.key_for(label), self.model_name, int(vector.shape[0]), vector.tobytes()))
+
+        conn = self._conn()
+        conn.executemany(
+            "INSERT OR IGNORE INTO embeddings (key, model, dim, vector) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM embeddings WHERE model = ?", (self.model_name,)
+        ).fetchone()[0]
@@ -0,0 +1,39 @@
+"""
+Enrichment helpers for Founder Matching System
+Joins related users and needs onto rows with one bulk query per table
+"""
+
+from typing import Dict, List, Tuple
+
+# Table name -> DatabaseManager bulk accessor taking a list of ids
+BULK_FETCHERS = {
+    "users": "get_users_by_ids",
+    "needs": "get_needs_by_ids",
+}
+
+
+def enrich(db, rows: List[Dict], relations: Dict[str, Tuple[str, str]]) -> List[Dict]:
+    """Return copies of rows with their related records attached
+
+    `relations` maps the output field to (id field on the row, table), e.g.
+    {"expert": ("expert_user_id", "users"), "need": ("need_id", "needs")}.
+    Every referenced id is collected first and each table is fetched once;
+    missing records come back as None.
+    """
+    ids_by_table = {}
+    for key, table in relations.values():
+        ids = ids_by_table.setdefault(table, set())
+        ids.update(row[key] for row in rows if row.get(key))
+
+    lookup = {}
+    for table, ids in ids_by_table.items():
+        fetch = getattr(db, BULK_FETCHERS[table])
+        lookup[table] = {record["id"]: record for record in fetch(list(ids))} if ids else {}
+
+    return [
+        {
+            **row,
+            **{field: lookup[table].get(row.get(key)) for field, (key, table) in relations.items()}
+        }
+        for row in rows
+    ]
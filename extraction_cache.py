@@ -0,0 +1,143 @@
+"""
+Extraction Cache for Founder Matching System
+Remembers LLM needs/learnings extractions so repeated check-in text is free
+
+Entries are content-addressed by sha256(normalized text + prompt version +
+model name): editing the prompt (bump its version) or switching models never
+returns stale results. A bounded in-memory LRU with a TTL answers repeats in
+the same process; an optional SQLite file shares results across workers and
+restarts.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of check-in text: NFC, whitespace collapsed and trimmed"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def cache_key(text: str, model: str, prompt_version: str) -> str:
+    """Hash the normalized text together with the prompt version and model"""
+    payload = f"{prompt_version}\0{model}\0{normalize_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """TTL + LRU cache of extraction results with an optional disk tier
+
+    Results are stored as JSON, so every hit returns a fresh copy that
+    callers may modify.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: int = 7 * 24 * 3600,
+                 path: Optional[str] = None, max_disk_entries: int = 100000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        if path:
+            conn = self._conn()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                " key TEXT PRIMARY KEY,"
+                " result TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_extractions_expires ON extractions(expires_at)")
+            conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection (per process), opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, text: str, model: str, prompt_version: str) -> Optional[Dict]:
+        """Return the cached result, or None if absent or expired"""
+        key = cache_key(text, model, prompt_version)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(payload)
+                del self._memory[key]
+
+        if self.path:
+            row = self._conn().execute(
+                "SELECT result, expires_at FROM extractions WHERE key = ? AND expires_at > ?",
+                (key, now)
+            ).fetchone()
+            if row is not None:
+                payload, expires_at = row
+                self._remember(key, expires_at, payload)
+                with self._lock:
+                    self.hits += 1
+                return json.loads(payload)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, text: str, model: str, prompt_version: str, result: Dict):
+        """Store a result in memory and, when configured, on disk"""
+        key = cache_key(text, model, prompt_version)
+        payload = json.dumps(result)
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, expires_at, payload)
+
+        if self.path:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, result, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at)
+            )
+            # Expired rows first, then the soonest-expiring beyond the cap
+            conn.execute("DELETE FROM extractions WHERE expires_at <= ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM extractions WHERE key IN ("
+                " SELECT key FROM extractions ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            )
+            conn.commit()
+
+    def _remember(self, key: str, expires_at: float, payload: str):
+        with self._lock:
+            self._memory[key] = (expires_at, payload)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._memory), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Founder Embeddings for Founder Matching System
+Builds the founder embedding artifact, keyed on founders_db.json and the model
+
+The artifact (an EmbeddingMatrix) records the sha256 of founders_db.json,
+the model name and a hash of every founder's text. When the file and model
+are unchanged it is used as-is; otherwise only founders whose text changed
+are re-encoded. Run this module to build the artifact ahead of time:
+
+    python founder_embeddings.py [founders_db.json] [--output founder_embeddings]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from embedding_matrix import EmbeddingMatrix
+from vector_index import FlatIndex, create_index
+
+DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+def founder_text(founder: Dict) -> str:
+    """Rich text representation of a founder used for semantic search"""
+    return (f"{founder['name']} {founder['company']} {' '.join(founder['expertise'])} "
+            f"{' '.join(founder['helpfulIn'])} {founder['bio']}")
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_founders(path: str = "founders_db.json") -> Tuple[Dict, str]:
+    """Return the parsed founders database and the sha256 of its bytes"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return json.loads(raw), _sha256(raw)
+
+
+def load_or_build(founders: List[Dict], source_hash: str, matrix: EmbeddingMatrix,
+                  model_name: str, encode: Callable[[List[str]], np.ndarray]) -> Tuple[List[str], np.ndarray]:
+    """Return (ids, memory-mapped matrix) for the founders, encoding as little as possible
+
+    `encode` is only called for founders that are new or whose text changed
+    since the artifact was built (all of them if the model changed).
+    """
+    cached = matrix.load()
+    if cached is not None:
+        ids, vectors, meta = cached
+        if meta.get("source_hash") == source_hash and meta.get("model") == model_name:
+            return ids, vectors
+
+    founder_ids = [founder["id"] for founder in founders]
+    texts = [founder_text(founder) for founder in founders]
+    text_hashes = [_sha256(text.encode("utf-8")) for text in texts]
+
+    reusable = {}
+    if cached is not None and cached[2].get("model") == model_name:
+        ids, vectors, meta = cached
+        old_hashes = meta.get("text_hashes", [])
+        if len(old_hashes) == len(ids):
+            reusable = {(item_id, text_hash): row for row, (item_id, text_hash) in enumerate(zip(ids, old_hashes))}
+
+    rows = [reusable.get(key) for key in zip(founder_ids, text_hashes)]
+    stale = [i for i, row in enumerate(rows) if row is None]
+    print(f"Encoding {len(stale)} of {len(founders)} founders", file=sys.stderr, flush=True)
+
+    fresh = np.asarray(encode([texts[i] for i in stale]), dtype=np.float32) if stale else None
+    dim = fresh.shape[1] if fresh is not None else (cached[1].shape[1] if cached is not None else 0)
+    output = np.empty((len(founders), dim), dtype=np.float32)
+    for i, row in enumerate(rows):
+        if row is not None:
+            output[i] = cached[1][row]
+    if stale:
+        output[stale] = fresh
+
+    matrix.save(founder_ids, output, meta={
+        "model": model_name,
+        "source_hash": source_hash,
+        "text_hashes": text_hashes
+    })
+    ids, vectors, _ = matrix.load()
+    return ids, vectors
+
+
+def build_founder_index(founders: List[Dict], source_hash: str, matrix: EmbeddingMatrix, model_name: str,
+                        encode: Callable[[List[str]], np.ndarray], backend: str = "flat"):
+    """Founder vector index over the artifact; the flat backend searches the mapped file in place"""
+    ids, vectors = load_or_build(founders, source_hash, matrix, model_name, encode)
+    if backend.lower() == "flat":
+        return FlatIndex.from_matrix(ids, vectors)
+    index = create_index(backend)
+    index.add(ids, vectors)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the founder embedding artifact")
+    parser.add_argument("founders_path", nargs="?", default="founders_db.json")
+    parser.add_argument("--output", default="founder_embeddings",
+                        help="artifact path without extension (default: founder_embeddings)")
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    args = parser.parse_args()
+
+    from model_holder import ModelHolder
+
+    model = ModelHolder(args.model)
+    data, source_hash = load_founders(args.founders_path)
+    ids, _ = load_or_build(data["founders"], source_hash, EmbeddingMatrix(args.output), args.model, model.encode)
+    print(f"✅ {len(ids)} founder embeddings in {args.output}.npy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Gamification rules for Founder Matching System
+XP levels, badges and activity counters shared by every database backend
+
+supabase_functions.sql implements the same rules server-side; keep the two
+in sync when changing thresholds or the level formula.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+# Activity counters that can be incremented alongside XP
+USER_STATS = ("total_checkins", "total_matches", "total_chats")
+
+# (XP threshold, badge) pairs, unlocked in order
+BADGE_THRESHOLDS = [
+    (100, "First Steps"),
+    (500, "Rising Star"),
+    (1000, "Community Leader"),
+]
+
+
+def level_for_xp(xp: int) -> int:
+    """Level reached with the given total XP
+
+    Progressive XP requirement: XP for level n = 25(n-1)(n+2), solved for n.
+    """
+    return max(1, int((-1 + math.sqrt(225 + 4 * xp) / 5) / 2) + 1)
+
+
+def validate_stats(stats: Optional[Dict[str, int]]) -> Dict[str, int]:
+    """Reject unknown counters so callers can't write arbitrary columns"""
+    stats = dict(stats or {})
+    unknown = set(stats) - set(USER_STATS)
+    if unknown:
+        raise ValueError(f"Unknown user stats: {', '.join(sorted(unknown))}")
+    return stats
+
+
+def apply_increment(user: Dict, xp_amount: int = 0,
+                    stats: Optional[Dict[str, int]] = None) -> Tuple[Dict, Dict]:
+    """Compute the user update and XP result for one increment
+
+    Returns (updates, result) where updates holds the new column values and
+    result is the payload award_xp reports back to the API.
+    """
+    stats = validate_stats(stats)
+    current_level = user.get("level") or 1
+    new_xp = (user.get("xp") or 0) + xp_amount
+    new_level = level_for_xp(new_xp)
+
+    badges: List[str] = list(user.get("badges") or [])
+    new_badges = [badge for threshold, badge in BADGE_THRESHOLDS
+                  if new_xp >= threshold and badge not in badges]
+    badges.extend(new_badges)
+
+    updates = {"xp": new_xp, "level": new_level, "badges": badges}
+    for stat, increment in stats.items():
+        updates[stat] = (user.get(stat) or 0) + increment
+
+    result = {
+        "xp_gained": xp_amount,
+        "total_xp": new_xp,
+        "level": new_level,
+        "leveled_up": new_level > current_level,
+        "new_badges": new_badges
+    }
+    return updates, result
@@ -0,0 +1,54 @@
+"""
+Gunicorn configuration for Founder Matching System
+With several workers, loads the embedding model once, in the master, before
+any worker forks
+
+With WEB_CONCURRENCY > 1, preload_app imports the app module (model weights,
+learning index, founder profiles) before the workers fork, so N workers share
+one copy of that memory copy-on-write instead of loading N copies. A single
+worker has nothing to share: it imports the app itself and loads the model on
+a background thread, so cold starts serve requests right away.
+
+One worker runs by default because the admin change feed (SSE) lives in a
+single process: with WEB_CONCURRENCY > 1 a dashboard stream only sees the
+writes made by the worker serving it, and the dashboard falls back on its
+periodic full resync for the rest. Scale a single worker with
+GUNICORN_THREADS until the feed is shared between processes.
+
+Each open admin stream holds one of the worker's threads for as long as it
+is connected; SSE_MAX_SUBSCRIBERS (default 2) caps them so API requests
+always have threads left, and further dashboards poll instead.
+
+Usage: gunicorn --config gunicorn.conf.py app:app
+"""
+
+import gc
+import os
+
+bind = f":{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", 1))
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+timeout = 0
+preload_app = workers > 1
+
+if preload_app:
+    # Load the model at import (in the master) rather than on a thread that
+    # would not survive fork. app.py keeps check-in job status in a shared
+    # SQLite store whenever WEB_CONCURRENCY > 1
+    os.environ.setdefault("EMBEDDING_MODEL_LOADING", "eager")
+
+
+def when_ready(server):
+    """Runs in the master after the app is imported, before any worker forks"""
+    if not preload_app:
+        return
+
+    import app
+
+    app.preload_shared_state()
+
+    # Move everything allocated so far out of the GC's reach: collections in
+    # the workers would otherwise touch (and so copy) every shared page
+    gc.collect()
+    gc.freeze()
+    server.log.info("Shared state preloaded; %d objects frozen", gc.get_freeze_count())
@@ -0,0 +1,150 @@
+"""
+Hybrid Search for Founder Matching System
+One ranking pass over founders: BM25 and vector candidates, fused and reranked
+
+Candidates come from the inverted keyword index (exact terms) and the
+founder vector index (meaning); the two rankings are fused with reciprocal
+rank fusion (default) or a weighted sum of normalized scores, then passed to
+an optional reranker.
+"""
+
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from keyword_index import FounderKeywordSearch
+
+# Constant from the original RRF paper; dampens the weight of top ranks
+RRF_K = 60
+
+FUSION_METHODS = ("rrf", "weighted")
+
+# After a semantic failure, queries skip it for this long (doubling with each
+# consecutive failure, capped) before trying again
+SEMANTIC_RETRY_SECONDS = 5.0
+SEMANTIC_RETRY_MAX_SECONDS = 300.0
+
+# (query, ranked results) -> reordered results
+Reranker = Callable[[str, List[Dict]], List[Dict]]
+
+
+def reciprocal_rank_fusion(rankings: Dict[str, Sequence[str]], weights: Optional[Dict[str, float]] = None,
+                           k: int = RRF_K) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: score(id) = sum of weight / (k + rank)"""
+    weights = weights or {}
+    scores: Dict[str, float] = {}
+    for source, ranking in rankings.items():
+        weight = weights.get(source, 1.0)
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def weighted_fusion(scored: Dict[str, Sequence[Tuple[str, float]]],
+                    weights: Optional[Dict[str, float]] = None) -> List[Tuple[str, float]]:
+    """Fuse (id, score) lists by min-max normalizing each source and summing weights"""
+    weights = weights or {}
+    scores: Dict[str, float] = {}
+    for source, results in scored.items():
+        if not results:
+            continue
+        values = [score for _, score in results]
+        low, high = min(values), max(values)
+        weight = weights.get(source, 1.0)
+        for item_id, score in results:
+            normalized = (score - low) / (high - low) if high > low else 1.0
+            scores[item_id] = scores.get(item_id, 0.0) + weight * normalized
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridRanker:
+    """Keyword + semantic founder ranking in a single candidate-generation pass
+
+    `vector_index` is a zero-argument callable returning the founder vector
+    index (so it can be built lazily) and `encode` embeds query text. Either
+    may be None for keyword-only ranking. If the semantic side fails (for
+    example the model is still loading) queries use keywords alone until
+    `retry_seconds` have passed, then try it again; the wait doubles while
+    failures continue and resets on the first success.
+    """
+
+    def __init__(self, keywords: FounderKeywordSearch, vector_index: Optional[Callable] = None,
+                 encode: Optional[Callable] = None, candidates: int = 50, fusion: str = "rrf",
+                 weights: Optional[Dict[str, float]] = None, reranker: Optional[Reranker] = None,
+                 retry_seconds: float = SEMANTIC_RETRY_SECONDS):
+        if fusion not in FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method: {fusion}. Choose from {list(FUSION_METHODS)}")
+        self.keywords = keywords
+        self.vector_index = vector_index
+        self.encode = encode
+        self.candidates = candidates
+        self.fusion = fusion
+        self.weights = weights or {"keyword": 1.0, "semantic": 1.0}
+        self.reranker = reranker
+        self.retry_seconds = retry_seconds
+        self.semantic_error: Optional[str] = None
+        self._semantic_failures = 0
+        self._semantic_retry_at = 0.0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        """Whether the next query will use the semantic side"""
+        if self.vector_index is None or self.encode is None:
+            return False
+        return self.semantic_error is None or time.monotonic() >= self._semantic_retry_at
+
+    def _semantic_candidates(self, query: str) -> List[Tuple[str, float]]:
+        if not self.semantic_enabled or not query.strip():
+            return []
+        try:
+            hits = self.vector_index().search(self.encode([query])[0], self.candidates)
+        except Exception as e:
+            self._semantic_failures += 1
+            delay = min(self.retry_seconds * 2 ** (self._semantic_failures - 1), SEMANTIC_RETRY_MAX_SECONDS)
+            self._semantic_retry_at = time.monotonic() + delay
+            self.semantic_error = str(e)
+            print(f"Semantic search unavailable ({e}); ranking by keywords only, retrying in {delay:.0f}s",
+                  file=sys.stderr, flush=True)
+            return []
+        self.semantic_error = None
+        self._semantic_failures = 0
+        return hits
+
+    def search(self, query: str, k: int = 5, semantic_query: Optional[str] = None,
+               fusion: Optional[str] = None) -> List[Dict]:
+        """Return up to k ranked results: {"founder", "score", "keyword_score", "semantic_score"}
+
+        `semantic_query` lets callers embed a longer description than the
+        keyword query; it defaults to `query`.
+        """
+        fusion = fusion or self.fusion
+        if fusion not in FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method: {fusion}. Choose from {list(FUSION_METHODS)}")
+
+        keyword_hits = self.keywords.profiles.search(query, self.candidates)
+        semantic_hits = [(founder_id, score) for founder_id, score
+                         in self._semantic_candidates(semantic_query or query)
+                         if founder_id in self.keywords.founders]
+
+        if fusion == "rrf":
+            fused = reciprocal_rank_fusion({
+                "keyword": [founder_id for founder_id, _ in keyword_hits],
+                "semantic": [founder_id for founder_id, _ in semantic_hits]
+            }, self.weights)
+        else:
+            fused = weighted_fusion({"keyword": keyword_hits, "semantic": semantic_hits}, self.weights)
+
+        keyword_scores = dict(keyword_hits)
+        semantic_scores = dict(semantic_hits)
+        results = [
+            {
+                "founder": self.keywords.founders[founder_id],
+                "score": score,
+                "keyword_score": keyword_scores.get(founder_id),
+                "semantic_score": semantic_scores.get(founder_id)
+            }
+            for founder_id, score in fused
+        ]
+        if self.reranker is not None:
+            results = self.reranker(query, results)
+        return results[:k]
@@ -0,0 +1,221 @@
+"""
+Job Queue for Founder Matching System
+Runs multi-stage pipelines (like a check-in) off the request thread
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+
+# A stage is a (name, fn) pair; fn receives the shared context dict and
+# mutates it. Stage functions must be module-level to run on the process
+# backend, and the context must be picklable (plain JSON-like data).
+Stage = Tuple[str, Callable[[Dict], None]]
+
+# Optional factory for a context manager wrapped around a whole pipeline run
+# (e.g. a database identity map); module-level for the process backend too.
+Scope = Callable[[], ContextManager]
+
+
+def run_stages(stages: List[Stage], context: Dict, on_stage: Optional[Callable[[str], None]] = None,
+               scope: Optional[Scope] = None) -> Dict:
+    """Run stages in order against one context and return it"""
+    with scope() if scope else nullcontext():
+        for name, fn in stages:
+            if on_stage:
+                on_stage(name)
+            fn(context)
+    return context
+
+
+class MemoryJobStore:
+    """Job records in this process's memory (the default)"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def put(self, job: Dict):
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+
+    def update(self, job_id: str, fields: Dict):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def prune(self, finished_before: float):
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.get("_finished", finished_before + 1) < finished_before]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    """Job records in a SQLite file shared by every worker process
+
+    With several gunicorn workers a status poll can land on a different
+    worker than the one running the job; a shared file lets any of them
+    answer it.
+    """
+
+    COLUMNS = ("id", "owner", "status", "stage", "result", "error", "created_at", "updated_at", "_finished")
+
+    def __init__(self, path: str = "jobs.sqlite3"):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, owner TEXT, status TEXT, stage TEXT, result TEXT,"
+            " error TEXT, created_at TEXT, updated_at TEXT, _finished REAL)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection (per process), opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _encode(self, fields: Dict) -> Dict:
+        return {k: json.dumps(v) if k == "result" else v for k, v in fields.items()}
+
+    def put(self, job: Dict):
+        row = self._encode(job)
+        conn = self._conn()
+        conn.execute(
+            f"INSERT OR REPLACE INTO jobs ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+            tuple(row.values())
+        )
+        conn.commit()
+
+    def update(self, job_id: str, fields: Dict):
+        row = self._encode(fields)
+        conn = self._conn()
+        conn.execute(
+            f"UPDATE jobs SET {', '.join(f'{k} = ?' for k in row)} WHERE id = ?",
+            (*row.values(), job_id)
+        )
+        conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(self.COLUMNS, row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def prune(self, finished_before: float):
+        conn = self._conn()
+        conn.execute("DELETE FROM jobs WHERE _finished < ?", (finished_before,))
+        conn.commit()
+
+
+class JobQueue:
+    """In-process job queue with a thread (default) or local-process backend
+
+    Jobs run in the process that accepted them. Their status lives in
+    memory by default, so only that process can report it; pass
+    `store_path` to keep job records in a SQLite file that every gunicorn
+    worker on the machine can read. Finished jobs are forgotten after
+    `ttl_seconds`.
+
+    The process backend runs stages in child processes: their writes reach
+    the database, but not this process's in-memory state (change feed
+    events, the learning index, caches), and stage progress is not
+    reported. Use it only for stages that need nothing beyond the database.
+    """
+
+    def __init__(self, max_workers: int = 4, backend: str = "thread", ttl_seconds: int = 3600,
+                 store_path: Optional[str] = None):
+        if backend == "thread":
+            self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        elif backend == "process":
+            self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            raise ValueError(f"Unknown job queue backend: {backend}. Choose 'thread' or 'process'")
+
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.store = SQLiteJobStore(store_path) if store_path else MemoryJobStore()
+
+    def _timestamp(self) -> str:
+        return datetime.utcnow().isoformat() + "Z"
+
+    def _update(self, job_id: str, **fields):
+        fields["updated_at"] = self._timestamp()
+        if fields.get("status") in ("completed", "failed"):
+            fields["_finished"] = time.time()
+        self.store.update(job_id, fields)
+
+    def submit(self, stages: List[Stage], context: Dict, owner: Optional[str] = None,
+               scope: Optional[Scope] = None) -> str:
+        """Queue a pipeline and return its job id immediately
+
+        The job result is whatever the stages leave in context["response"].
+        """
+        job_id = f"j{uuid.uuid4().hex[:12]}"
+        now = self._timestamp()
+        self.store.prune(time.time() - self.ttl_seconds)
+        self.store.put({
+            "id": job_id,
+            "owner": owner,
+            "status": "queued",
+            "stage": None,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now
+        })
+
+        if self.backend == "thread":
+            def on_stage(name):
+                self._update(job_id, status="running", stage=name)
+            future = self.executor.submit(run_stages, stages, context, on_stage, scope)
+        else:
+            # Stage progress cannot cross the process boundary
+            self._update(job_id, status="running")
+            future = self.executor.submit(run_stages, stages, context, None, scope)
+
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return job_id
+
+    def _finish(self, job_id: str, future):
+        error = future.exception()
+        if error is not None:
+            print(f"Job {job_id} failed: {error}")
+            self._update(job_id, status="failed", error=str(error))
+        else:
+            self._update(job_id, status="completed", stage=None, result=future.result().get("response"))
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a snapshot of a job's public fields"""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        return {k: v for k, v in job.items() if not k.startswith("_")}
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,171 @@
+"""
+Keyword Index for Founder Matching System
+Tokenized inverted index with BM25 ranking for keyword founder search
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens"""
+    return _TOKEN.findall((text or "").lower())
+
+
+class KeywordIndex:
+    """Inverted index: term -> {doc id: term frequency}, scored with BM25
+
+    Documents can be added, replaced and removed at any time; a query only
+    touches the postings of its own terms.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_length: Dict[str, int] = {}
+        self._doc_order: Dict[str, int] = {}
+        self._total_length = 0
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    def add(self, doc_id: str, text: str):
+        """Index a document, replacing any previous version of it"""
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+        self._doc_terms[doc_id] = terms
+        self._doc_length[doc_id] = sum(terms.values())
+        self._total_length += self._doc_length[doc_id]
+        # Replacing a document keeps its original tie-break position
+        if doc_id not in self._doc_order:
+            self._doc_order[doc_id] = self._next_order
+            self._next_order += 1
+
+    def remove(self, doc_id: str):
+        """Drop a document (unknown ids are ignored)"""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+        self._total_length -= self._doc_length.pop(doc_id)
+
+    def search(self, query: str, k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Return (doc id, BM25 score) pairs for documents sharing a query term, best first"""
+        n_docs = len(self._doc_terms)
+        if not n_docs:
+            return []
+        avg_length = self._total_length / n_docs or 1.0
+
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_length[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        rank = lambda item: (-item[1], self._doc_order[item[0]])
+        if k is None:
+            return sorted(scores.items(), key=rank)
+        return heapq.nsmallest(k, scores.items(), key=rank)
+
+    def match_substring(self, fragment: str) -> List[str]:
+        """Ids of documents with a term containing `fragment` (e.g. "fin" in "fintech")
+
+        Scans the vocabulary rather than the documents.
+        """
+        matches = set()
+        for term, postings in self.postings.items():
+            if fragment in term:
+                matches.update(postings)
+        return sorted(matches, key=self._doc_order.__getitem__)
+
+
+def founder_profile_text(founder: Dict) -> str:
+    """Expertise, helpfulIn, bio and industry: the fields keyword search covers"""
+    return " ".join([
+        " ".join(founder.get("expertise", [])),
+        " ".join(founder.get("helpfulIn", [])),
+        founder.get("bio", ""),
+        founder.get("industry", "")
+    ])
+
+
+# Fields filter_by_expertise matches against, each indexed on its own
+EXPERTISE_FIELDS = ("expertise", "helpfulIn")
+
+
+class FounderKeywordSearch:
+    """Keyword search over founder profiles, built once and kept up to date
+
+    `search` ranks whole profiles with BM25 over whole-word tokens, so a
+    partial word ("fin") does not match a longer one ("fintech").
+    `filter_by_expertise` keeps substring semantics: a founder matches when
+    the query phrase occurs in their joined expertise or joined helpfulIn.
+    """
+
+    def __init__(self, founders: Iterable[Dict] = ()):
+        self.founders: Dict[str, Dict] = {}
+        self.profiles = KeywordIndex()
+        self.fields = {field: KeywordIndex() for field in EXPERTISE_FIELDS}
+        self._field_text: Dict[str, Dict[str, str]] = {field: {} for field in EXPERTISE_FIELDS}
+        for founder in founders:
+            self.upsert(founder)
+
+    def upsert(self, founder: Dict):
+        """Add a founder or re-index one whose profile changed"""
+        self.founders[founder["id"]] = founder
+        self.profiles.add(founder["id"], founder_profile_text(founder))
+        for field, index in self.fields.items():
+            text = " ".join(founder.get(field, [])).lower()
+            self._field_text[field][founder["id"]] = text
+            index.add(founder["id"], text)
+
+    def remove(self, founder_id: str):
+        self.founders.pop(founder_id, None)
+        self.profiles.remove(founder_id)
+        for field, index in self.fields.items():
+            index.remove(founder_id)
+            self._field_text[field].pop(founder_id, None)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[Dict, float]]:
+        """Return (founder, score) pairs, best first"""
+        return [(self.founders[founder_id], score)
+                for founder_id, score in self.profiles.search(query, limit)]
+
+    def filter_by_expertise(self, expertise: str) -> List[Dict]:
+        """Founders whose joined expertise or joined helpfulIn contain the query phrase
+
+        Candidates come from the per-field vocabularies (any occurrence of the
+        phrase puts its longest word inside some indexed term); only those
+        are checked against the field text. Results keep insertion order.
+        """
+        phrase = (expertise or "").lower()
+        words = sorted(tokenize(phrase), key=len, reverse=True)
+
+        matches = set()
+        for field, index in self.fields.items():
+            texts = self._field_text[field]
+            candidates = index.match_substring(words[0]) if words else texts
+            matches.update(founder_id for founder_id in candidates if phrase in texts[founder_id])
+        return [self.founders[founder_id] for founder_id in sorted(matches, key=self.profiles._doc_order.__getitem__)]
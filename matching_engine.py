@@ -0,0 +1,291 @@
+"""
+Matching Engine for Founder Matching System
+Scores needs against learnings using batched sentence embeddings
+"""
+
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Bonus added to the cosine similarity when need and learning share a category
+CATEGORY_BONUS = 0.2
+
+# Index candidates fetched per requested match on the first try; the search is
+# widened when the category bonus or the submitter's own learnings could
+# change the top `limit`
+INDEX_CANDIDATES_PER_MATCH = 5
+
+
+def default_reason(need_label: str, need_category: str,
+                   learning_label: str, learning_category: str) -> str:
+    """Build the human-readable reason shown to the founder"""
+    if need_category == learning_category:
+        return f"Both focus on {need_category}. The expert's experience with '{learning_label}' directly addresses your need for '{need_label}'"
+    return f"The expert's experience with '{learning_label}' can help with your need for '{need_label}'"
+
+
+class MatchingEngine:
+    """Computes need/learning matches with one batched encode per call"""
+
+    def __init__(self, embedding_model, reason_builder: Optional[Callable] = None,
+                 embedding_store=None, learning_index=None):
+        self.embedding_model = embedding_model
+        self.reason_builder = reason_builder or default_reason
+        self.embedding_store = embedding_store
+        self.learning_index = learning_index
+        self._indexed_learnings: Dict[str, Dict] = {}
+        self._index_lock = threading.Lock()
+
+    def encode_labels(self, labels: List[str]) -> np.ndarray:
+        """Encode labels into an L2-normalized float32 matrix (one row per label)
+
+        Labels already in the embedding store are read from it; every other
+        distinct label is sent to the model exactly once, in a single batched
+        encode() call, and written back to the store.
+        """
+        if not labels:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        unique_labels = list(dict.fromkeys(labels))
+        vectors = self._lookup(unique_labels)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+
+        row_of = {label: i for i, label in enumerate(unique_labels)}
+        return vectors[[row_of[label] for label in labels]]
+
+    def warm(self, labels: List[str]):
+        """Make sure the given labels are embedded and stored"""
+        if labels and self.embedding_store is not None:
+            self._lookup(list(dict.fromkeys(labels)))
+
+    def preload_learning_index(self, learnings: List[Dict]):
+        """Fill the learning index ahead of the first check-in"""
+        if self.learning_index is not None:
+            with self._index_lock:
+                self.sync_learning_index(learnings)
+
+    def _lookup(self, unique_labels: List[str]) -> np.ndarray:
+        """Fetch raw vectors for distinct labels, encoding only cache misses"""
+        cached = self.embedding_store.get_many(unique_labels) if self.embedding_store is not None else {}
+        missing = [label for label in unique_labels if label not in cached]
+
+        if missing:
+            encoded = np.asarray(self.embedding_model.encode(missing), dtype=np.float32)
+            fresh = dict(zip(missing, encoded))
+            if self.embedding_store is not None:
+                self.embedding_store.put_many(fresh)
+            cached.update(fresh)
+
+        return np.stack([cached[label] for label in unique_labels]).astype(np.float32, copy=False)
+
+    def score_matrix(self, needs: List[Dict], learnings: List[Dict]) -> np.ndarray:
+        """Return the N x M score matrix (cosine + category bonus)
+
+        Pairs where the need and learning belong to the same user are set
+        to -inf so they can never be selected.
+        """
+        need_labels = [n.get("label", "") for n in needs]
+        learning_labels = [l.get("label", "") for l in learnings]
+        vectors = self.encode_labels(need_labels + learning_labels)
+        need_vecs = vectors[:len(needs)]
+        learning_vecs = vectors[len(needs):]
+
+        scores = need_vecs @ learning_vecs.T
+
+        need_categories = np.array([n.get("category", "") for n in needs], dtype=object)
+        learning_categories = np.array([l.get("category", "") for l in learnings], dtype=object)
+        same_category = need_categories[:, None] == learning_categories[None, :]
+        scores = scores + CATEGORY_BONUS * same_category
+
+        need_users = np.array([n.get("user_id", "") for n in needs], dtype=object)
+        learning_users = np.array([l.get("user_id", "") for l in learnings], dtype=object)
+        scores[need_users[:, None] == learning_users[None, :]] = -np.inf
+
+        return scores
+
+    def compute_matches(self, needs: List[Dict], learnings: List[Dict], limit: int = 3) -> Dict:
+        """Compute the top `limit` learnings for every need"""
+        matches = []
+        limit = int(limit)
+        if not needs or not learnings or limit <= 0:
+            return {"total_matches": 0, "matches": matches}
+
+        scores = self.score_matrix(needs, learnings)
+        k = min(limit, len(learnings))
+
+        if k < len(learnings):
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(len(learnings)), (len(needs), 1))
+
+        for i, need in enumerate(needs):
+            row = scores[i]
+            candidates = top[i][np.argsort(-row[top[i]], kind="stable")]
+
+            for j in candidates:
+                if not np.isfinite(row[j]):
+                    continue
+                matches.append(self._build_match(need, learnings[j], float(row[j])))
+
+        return {
+            "total_matches": len(matches),
+            "matches": matches
+        }
+
+    def compute_incremental_matches(self, new_needs: List[Dict], new_learnings: List[Dict],
+                                    all_needs: List[Dict], all_learnings: List[Dict],
+                                    limit: int = 3) -> Dict:
+        """Score only what a check-in changed
+
+        New needs are scored against every learning, and every other need is
+        scored against the new learnings only, so the cost is proportional to
+        the size of the submission times the community. Returned matches are
+        candidates; use select_new_candidates() to merge them into the lists
+        already stored for existing needs.
+        """
+        limit = int(limit)
+        matches = []
+
+        if new_needs and self.learning_index is not None:
+            with self._index_lock:
+                self.sync_learning_index(all_learnings)
+                matches.extend(self._matches_from_index(new_needs, limit))
+        elif new_needs:
+            matches.extend(self.compute_matches(new_needs, all_learnings, limit=limit)["matches"])
+
+        new_need_ids = {n.get("id") for n in new_needs}
+        other_needs = [n for n in all_needs if n.get("id") not in new_need_ids]
+        if other_needs and new_learnings:
+            matches.extend(self.compute_matches(other_needs, new_learnings, limit=limit)["matches"])
+
+        return {
+            "total_matches": len(matches),
+            "matches": matches
+        }
+
+    def sync_learning_index(self, learnings: List[Dict]):
+        """Bring the learning index in line with the currently active learnings
+
+        New learnings are embedded (through the store) and added; learnings
+        that are no longer active are removed.
+        """
+        active = {l["id"]: l for l in learnings if l.get("id")}
+        stale = [i for i in self._indexed_learnings if i not in active]
+        if stale:
+            self.learning_index.remove(stale)
+            for learning_id in stale:
+                del self._indexed_learnings[learning_id]
+
+        missing = [l for i, l in active.items() if i not in self._indexed_learnings]
+        if missing:
+            vectors = self.encode_labels([l.get("label", "") for l in missing])
+            self.learning_index.add([l["id"] for l in missing], vectors)
+        self._indexed_learnings.update(active)
+
+    def _matches_from_index(self, needs: List[Dict], limit: int) -> List[Dict]:
+        """Top `limit` learnings per need using the learning index for retrieval
+
+        Candidates come back ranked by raw cosine, before the category bonus
+        and the own-learning filter. The search is widened until `limit`
+        candidates survive the filter and no unfetched learning (cosine at most
+        the last one fetched, plus the bonus) could outrank them. With the
+        exact flat index this returns what compute_matches() would.
+        """
+        matches = []
+        if limit <= 0:
+            return matches
+        need_vecs = self.encode_labels([n.get("label", "") for n in needs])
+        total = len(self.learning_index)
+
+        for need, vector in zip(needs, need_vecs):
+            k = limit * INDEX_CANDIDATES_PER_MATCH
+            while True:
+                hits = self.learning_index.search(vector, k)
+                scored = []
+                for learning_id, similarity in hits:
+                    learning = self._indexed_learnings[learning_id]
+                    if learning.get("user_id", "") == need.get("user_id", ""):
+                        continue
+                    bonus = CATEGORY_BONUS if learning.get("category", "") == need.get("category", "") else 0
+                    scored.append((similarity + bonus, learning))
+                scored.sort(key=lambda item: item[0], reverse=True)
+
+                if len(hits) < k or k >= total:
+                    break
+                if len(scored) >= limit and scored[limit - 1][0] > hits[-1][1] + CATEGORY_BONUS:
+                    break
+                k = min(k * 2, total)
+
+            matches.extend(self._build_match(need, learning, score) for score, learning in scored[:limit])
+
+        return matches
+
+    @staticmethod
+    def select_new_candidates(candidates: List[Dict], existing_matches: List[Dict],
+                              limit: int = 3) -> List[Dict]:
+        """Keep the candidates that belong in each need's stored top-`limit`
+
+        A candidate is dropped when the same (need, expert) pair is already
+        stored or when `limit` stored suggestions for that need all score at
+        least as high.
+        """
+        limit = int(limit)
+        stored_scores = {}
+        stored_pairs = set()
+        for match in existing_matches:
+            stored_scores.setdefault(match["need_id"], []).append(match.get("score", 0))
+            stored_pairs.add((match["need_id"], match["expert_user_id"]))
+
+        by_need = {}
+        for candidate in candidates:
+            pair = (candidate["need_id"], candidate["expert_user_id"])
+            if pair in stored_pairs:
+                continue
+            stored_pairs.add(pair)
+            by_need.setdefault(candidate["need_id"], []).append(candidate)
+
+        selected = []
+        for need_id, need_candidates in by_need.items():
+            ranked = [(score, False, None) for score in stored_scores.get(need_id, [])]
+            ranked += [(c["score"], True, c) for c in need_candidates]
+            # Stored suggestions win ties so re-running never churns the list
+            ranked.sort(key=lambda item: (item[0], not item[1]), reverse=True)
+            selected.extend(c for _, is_new, c in ranked[:limit] if is_new)
+
+        return selected
+
+    @staticmethod
+    def surplus_matches(stored_matches: List[Dict], limit: int = 3) -> List[Dict]:
+        """Pending suggestions that fall outside their need's top `limit`
+
+        Suggestions a founder has already acted on (accepted, declined) are
+        never returned, but they still take up places in the top `limit`.
+        """
+        limit = int(limit)
+        by_need = {}
+        for match in stored_matches:
+            by_need.setdefault(match["need_id"], []).append(match)
+
+        surplus = []
+        for matches in by_need.values():
+            ranked = sorted(matches, key=lambda m: m.get("score", 0), reverse=True)
+            surplus.extend(m for m in ranked[limit:] if m.get("status", "pending") == "pending")
+        return surplus
+
+    def _build_match(self, need: Dict, learning: Dict, score: float) -> Dict:
+        """Shape a scored need/learning pair like the MCP tool output"""
+        need_label = need.get("label", "")
+        learning_label = learning.get("label", "")
+        return {
+            "need_id": need.get("id", ""),
+            "expert_user_id": learning.get("user_id", ""),
+            "score": round(score, 3),
+            "reason": self.reason_builder(
+                need_label, need.get("category", ""),
+                learning_label, learning.get("category", "")
+            ),
+            "matched_learning": learning_label
+        }
@@ -6,43 +6,95 @@ Provides tools for extracting needs/learnings and matching startup founders
 
 import json
 import asyncio
+import sys
+import bisect
+import threading
 from typing import Any, Sequence
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 from mcp.server.stdio import stdio_server
-import numpy as np
-from sentence_transformers import SentenceTransformer
+from embedding_matrix import EmbeddingMatrix
+from embedding_store import EmbeddingStore
+from extraction_cache import ExtractionCache
+from founder_embeddings import build_founder_index, load_founders
+from hybrid_search import FUSION_METHODS, HybridRanker
+from keyword_index import FounderKeywordSearch
+from matching_engine import MatchingEngine
+from model_holder import ModelHolder
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor, sort_key
+from serialization import dumps
 import os
 from anthropic import Anthropic
 
-# Load founder database
-with open("founders_db.json", "r") as f:
-    db = json.load(f)
-    FOUNDERS = db["founders"]
-    NEEDS = db.get("needs", [])
-    LEARNINGS = db.get("learnings", [])
+# Tool results are compact JSON; MCP_PRETTY_JSON=1 indents them for humans
+PRETTY_JSON = os.getenv("MCP_PRETTY_JSON") == "1"
+
+# Load founder database (hashed to key the founder embedding artifact)
+db, FOUNDERS_DB_HASH = load_founders("founders_db.json")
+FOUNDERS = db["founders"]
+NEEDS = db.get("needs", [])
+LEARNINGS = db.get("learnings", [])
 
 # Initialize embedding model for semantic search
-print("Loading embedding model...", flush=True)
-embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+# Loads in the background so the server answers list_tools immediately
+print("Loading embedding model...", file=sys.stderr, flush=True)
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+embedding_model = ModelHolder(EMBEDDING_MODEL_NAME).start()
+embedding_store = EmbeddingStore(os.getenv('EMBEDDING_STORE_PATH', 'embeddings.sqlite3'), EMBEDDING_MODEL_NAME)
+
+
+def mcp_match_reason(need_label: str, need_category: str,
+                     learning_label: str, learning_category: str) -> str:
+    """Reason wording used by the MCP compute_matches tool"""
+    if need_category == learning_category:
+        return f"Both focus on {need_category}. Semantic match on: {learning_label}"
+    return f"Semantic similarity: learning about {learning_label} can help with {need_label}"
+
+
+matching_engine = MatchingEngine(embedding_model, reason_builder=mcp_match_reason,
+                                 embedding_store=embedding_store)
 
-# Pre-compute embeddings for all founders
-founder_texts = []
-for founder in FOUNDERS:
-    # Create a rich text representation for each founder
-    text = f"{founder['name']} {founder['company']} {' '.join(founder['expertise'])} {' '.join(founder['helpfulIn'])} {founder['bio']}"
-    founder_texts.append(text)
+FOUNDERS_BY_ID = {founder["id"]: founder for founder in FOUNDERS}
+# Keyset order for list_all_founders pages
+FOUNDERS_SORTED = sorted(FOUNDERS, key=sort_key)
+FOUNDER_KEYS = [sort_key(founder) for founder in FOUNDERS_SORTED]
+# Inverted keyword index for search_founders / filter_by_expertise (BM25)
+founder_keywords = FounderKeywordSearch(FOUNDERS)
+# Founder vectors are written once and memory-mapped by every server process;
+# rebuilt (changed founders only) when founders_db.json or the model changes
+founder_matrix = EmbeddingMatrix(os.getenv("FOUNDER_EMBEDDINGS_PATH", "founder_embeddings"))
+_founder_index = None
+_founder_index_lock = threading.Lock()
 
-print("Computing founder embeddings...", flush=True)
-founder_embeddings = embedding_model.encode(founder_texts)
+
+def get_founder_index():
+    """Normalized founder vectors behind a pluggable index (flat or ivf)
+    
+    Built on first vector search from the memory-mapped founder matrix; the
+    flat backend searches the mapped file directly. Build the artifact ahead
+    of time with `python founder_embeddings.py`.
+    """
+    global _founder_index
+    with _founder_index_lock:
+        if _founder_index is None:
+            _founder_index = build_founder_index(FOUNDERS, FOUNDERS_DB_HASH, founder_matrix, EMBEDDING_MODEL_NAME,
+                                                 embedding_model.encode, os.getenv("VECTOR_INDEX_BACKEND", "flat"))
+        return _founder_index
+
+# Single ranking engine over both indexes, used by the hybrid_search tool
+founder_ranker = HybridRanker(founder_keywords, vector_index=get_founder_index, encode=embedding_model.encode)
 
 # Initialize Anthropic client for AI extraction
+# Extractions are cached per (text, prompt version, model); see extraction_cache.py
+ANTHROPIC_MODEL_NAME = "claude-3-5-sonnet-20241022"
+EXTRACTION_PROMPT_VERSION = "1"
+extraction_cache = ExtractionCache(path=os.getenv("EXTRACTION_CACHE_PATH") or None)
 anthropic_client = None
 if os.getenv("ANTHROPIC_API_KEY"):
     anthropic_client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-    print("Anthropic client initialized", flush=True)
+    print("Anthropic client initialized", file=sys.stderr, flush=True)
 else:
-    print("Warning: No ANTHROPIC_API_KEY found - extract_needs_learnings will use simple extraction", flush=True)
+    print("Warning: No ANTHROPIC_API_KEY found - extract_needs_learnings will use simple extraction", file=sys.stderr, flush=True)
 
 # Create MCP server
 app = Server("founder-matching-server")
@@ -137,6 +189,31 @@ async def list_tools() -> list[Tool]:
                 "required": ["description"]
             }
         ),
+        Tool(
+            name="hybrid_search",
+            description="Rank founders by combining keyword (BM25) and semantic (embedding) search in one pass. Best default for free-text queries that mix exact skills with intent.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "What the founder needs help with (keywords or a description)"
+                    },
+                    "top_k": {
+                        "type": "number",
+                        "description": "Number of top matches to return (default: 5)",
+                        "default": 5
+                    },
+                    "fusion": {
+                        "type": "string",
+                        "enum": list(FUSION_METHODS),
+                        "description": "How to combine the two rankings: reciprocal rank fusion (default) or weighted normalized scores",
+                        "default": "rrf"
+                    }
+                },
+                "required": ["query"]
+            }
+        ),
         Tool(
             name="get_founder_by_id",
             description="Get detailed information about a specific founder by their ID",
@@ -153,10 +230,24 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="list_all_founders",
-            description="List all founders in the database with basic information",
+            description="List all founders in the database with basic information. Pass limit (and the returned next_cursor) to page through them, or format=ndjson for one compact JSON object per line.",
             inputSchema={
                 "type": "object",
-                "properties": {}
+                "properties": {
+                    "limit": {
+                        "type": "number",
+                        "description": "Page size; omit to list every founder"
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "next_cursor from the previous page"
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": ["json", "ndjson"],
+                        "default": "json"
+                    }
+                }
             }
         ),
         Tool(
@@ -184,6 +275,13 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
         user_id = arguments.get("user_id", "unknown")
         
         # Use AI extraction if available, otherwise fall back to keyword-based
+        cached = extraction_cache.get(text, ANTHROPIC_MODEL_NAME, EXTRACTION_PROMPT_VERSION) if anthropic_client else None
+        if cached is not None:
+            return [TextContent(
+                type="text",
+                text=dumps(cached, pretty=PRETTY_JSON)
+            )]
+        
         if anthropic_client:
             try:
                 # Use Claude to extract structured needs and learnings
@@ -209,20 +307,21 @@ Respond with ONLY valid JSON in this exact format:
 }}"""
 
                 response = anthropic_client.messages.create(
-                    model="claude-3-5-sonnet-20241022",
+                    model=ANTHROPIC_MODEL_NAME,
                     max_tokens=1024,
                     messages=[{"role": "user", "content": prompt}]
                 )
                 
                 result = json.loads(response.content[0].text)
+                extraction_cache.put(text, ANTHROPIC_MODEL_NAME, EXTRACTION_PROMPT_VERSION, result)
                 
                 return [TextContent(
                     type="text",
-                    text=json.dumps(result, indent=2)
+                    text=dumps(result, pretty=PRETTY_JSON)
                 )]
             except Exception as e:
                 # Fall back to simple extraction if AI fails
-                print(f"AI extraction failed: {e}, using fallback", flush=True)
+                print(f"AI extraction failed: {e}, using fallback", file=sys.stderr, flush=True)
         
         # Fallback: Simple keyword-based extraction
         text_lower = text.lower()
@@ -258,7 +357,7 @@ Respond with ONLY valid JSON in this exact format:
         
         return [TextContent(
             type="text",
-            text=json.dumps(result, indent=2)
+            text=dumps(result, pretty=PRETTY_JSON)
         )]
     
     elif name == "compute_matches":
@@ -266,133 +365,48 @@ Respond with ONLY valid JSON in this exact format:
         learnings = arguments["learnings"]
         limit = arguments.get("limit", 3)
         
-        matches = []
-        
-        # For each need, find learnings that could help
-        for need in needs:
-            need_id = need.get("id", "")
-            need_user_id = need.get("user_id", "")
-            need_label = need.get("label", "")
-            need_category = need.get("category", "")
-            
-            # Compute embedding for this need
-            need_embedding = embedding_model.encode([need_label])[0]
-            
-            scored_learnings = []
-            
-            for learning in learnings:
-                learning_user_id = learning.get("user_id", "")
-                
-                # Don't match a founder with themselves
-                if learning_user_id == need_user_id:
-                    continue
-                
-                learning_label = learning.get("label", "")
-                learning_category = learning.get("category", "")
-                
-                # Compute semantic similarity
-                learning_embedding = embedding_model.encode([learning_label])[0]
-                similarity = np.dot(need_embedding, learning_embedding) / (
-                    np.linalg.norm(need_embedding) * np.linalg.norm(learning_embedding)
-                )
-                
-                # Category bonus
-                category_bonus = 0.2 if need_category == learning_category else 0
-                
-                # Final score
-                score = float(similarity) + category_bonus
-                
-                # Generate reason
-                if need_category == learning_category:
-                    reason = f"Both focus on {need_category}. Semantic match on: {learning_label}"
-                else:
-                    reason = f"Semantic similarity: learning about {learning_label} can help with {need_label}"
-                
-                scored_learnings.append({
-                    "need_id": need_id,
-                    "expert_user_id": learning_user_id,
-                    "score": round(score, 3),
-                    "reason": reason,
-                    "matched_learning": learning_label
-                })
-            
-            # Sort by score and take top N
-            scored_learnings.sort(key=lambda x: x["score"], reverse=True)
-            matches.extend(scored_learnings[:limit])
+        # Encoding and index building are CPU-bound: keep them off the event loop
+        result = await asyncio.to_thread(matching_engine.compute_matches, needs, learnings, limit=limit)
         
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "total_matches": len(matches),
-                "matches": matches
-            }, indent=2)
+            text=dumps(result, pretty=PRETTY_JSON)
         )]
     
     elif name == "search_founders":
         query = arguments["query"].lower()
         limit = arguments.get("limit", 5)
         
-        # Search in expertise, helpfulIn, bio, and industry
-        results = []
-        for founder in FOUNDERS:
-            score = 0
-            searchable_text = (
-                " ".join(founder["expertise"]) + " " +
-                " ".join(founder["helpfulIn"]) + " " +
-                founder["bio"] + " " +
-                founder["industry"]
-            ).lower()
-            
-            # Simple keyword matching with scoring
-            query_words = query.split()
-            for word in query_words:
-                if word in searchable_text:
-                    score += searchable_text.count(word)
-            
-            if score > 0:
-                results.append({
-                    "founder": founder,
-                    "score": score
-                })
-        
-        # Sort by score and limit
-        results.sort(key=lambda x: x["score"], reverse=True)
-        results = results[:limit]
+        # BM25 over expertise, helpfulIn, bio, and industry
+        results = founder_keywords.search(query, int(limit))
         
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "query": query,
                 "found": len(results),
-                "results": [r["founder"] for r in results]
-            }, indent=2)
+                "results": [founder for founder, _ in results]
+            }, pretty=PRETTY_JSON)
         )]
     
     elif name == "vector_search":
         description = arguments["description"]
         top_k = arguments.get("top_k", 3)
         
-        # Compute embedding for the query
-        query_embedding = embedding_model.encode([description])[0]
+        # Embed the query and take the top-k cosine similarity from the
+        # founder index, off the event loop
+        def nearest_founders():
+            query_embedding = embedding_model.encode([description])[0]
+            return get_founder_index().search(query_embedding, int(top_k))
         
-        # Calculate cosine similarity with all founders
-        similarities = []
-        for idx, founder_emb in enumerate(founder_embeddings):
-            similarity = np.dot(query_embedding, founder_emb) / (
-                np.linalg.norm(query_embedding) * np.linalg.norm(founder_emb)
-            )
-            similarities.append({
-                "founder": FOUNDERS[idx],
-                "similarity": float(similarity)
-            })
-        
-        # Sort by similarity and get top k
-        similarities.sort(key=lambda x: x["similarity"], reverse=True)
-        top_matches = similarities[:top_k]
+        top_matches = [
+            {"founder": FOUNDERS_BY_ID[founder_id], "similarity": similarity}
+            for founder_id, similarity in await asyncio.to_thread(nearest_founders)
+        ]
         
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "query": description,
                 "found": len(top_matches),
                 "matches": [
@@ -402,7 +416,32 @@ Respond with ONLY valid JSON in this exact format:
                     }
                     for match in top_matches
                 ]
-            }, indent=2)
+            }, pretty=PRETTY_JSON)
+        )]
+    
+    elif name == "hybrid_search":
+        query = arguments["query"]
+        top_k = arguments.get("top_k", 5)
+        
+        results = await asyncio.to_thread(founder_ranker.search, query, int(top_k),
+                                          fusion=arguments.get("fusion"))
+        
+        return [TextContent(
+            type="text",
+            text=dumps({
+                "query": query,
+                "found": len(results),
+                "semantic": founder_ranker.semantic_enabled,
+                "matches": [
+                    {
+                        **result["founder"],
+                        "score": round(result["score"], 4),
+                        "keyword_score": None if result["keyword_score"] is None else round(result["keyword_score"], 3),
+                        "similarity_score": None if result["semantic_score"] is None else round(result["semantic_score"], 3)
+                    }
+                    for result in results
+                ]
+            }, pretty=PRETTY_JSON)
         )]
     
     elif name == "get_founder_by_id":
@@ -412,16 +451,32 @@ Respond with ONLY valid JSON in this exact format:
         if founder:
             return [TextContent(
                 type="text",
-                text=json.dumps(founder, indent=2)
+                text=dumps(founder, pretty=PRETTY_JSON)
             )]
         else:
             return [TextContent(
                 type="text",
-                text=json.dumps({"error": f"Founder with ID {founder_id} not found"})
+                text=dumps({"error": f"Founder with ID {founder_id} not found"})
             )]
     
     elif name == "list_all_founders":
-        summary = [
+        try:
+            after = decode_cursor(arguments["cursor"]) if arguments.get("cursor") else None
+        except ValueError as e:
+            return [TextContent(type="text", text=dumps({"error": str(e)}))]
+        limit = arguments.get("limit")
+        
+        if limit is None and after is None:
+            founders = FOUNDERS
+            next_cursor = None
+        else:
+            # Keyset page over the founders sorted by (created_at, id)
+            start = bisect.bisect_right(FOUNDER_KEYS, after) if after else 0
+            limit = max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+            founders = FOUNDERS_SORTED[start:start + limit]
+            next_cursor = encode_cursor(founders[-1]) if start + limit < len(FOUNDERS_SORTED) else None
+        
+        summary = (
             {
                 "id": f["id"],
                 "name": f["name"],
@@ -429,41 +484,41 @@ Respond with ONLY valid JSON in this exact format:
                 "expertise": f["expertise"][:3],  # First 3 areas
                 "industry": f["industry"]
             }
-            for f in FOUNDERS
-        ]
+            for f in founders
+        )
+        
+        if arguments.get("format") == "ndjson":
+            content = [TextContent(type="text", text="".join(dumps(f) + "\n" for f in summary))]
+            if next_cursor:
+                content.append(TextContent(type="text", text=dumps({"next_cursor": next_cursor})))
+            return content
         
+        result = {"total": len(FOUNDERS), "founders": list(summary)}
+        if limit is not None or after is not None:
+            result["next_cursor"] = next_cursor
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "total": len(FOUNDERS),
-                "founders": summary
-            }, indent=2)
+            text=dumps(result, pretty=PRETTY_JSON)
         )]
     
     elif name == "filter_by_expertise":
         expertise_query = arguments["expertise"].lower()
         
-        matches = []
-        for founder in FOUNDERS:
-            expertise_text = " ".join(founder["expertise"]).lower()
-            helpful_text = " ".join(founder["helpfulIn"]).lower()
-            
-            if expertise_query in expertise_text or expertise_query in helpful_text:
-                matches.append(founder)
+        matches = founder_keywords.filter_by_expertise(expertise_query)
         
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=dumps({
                 "expertise": expertise_query,
                 "found": len(matches),
                 "founders": matches
-            }, indent=2)
+            }, pretty=PRETTY_JSON)
         )]
     
     else:
         return [TextContent(
             type="text",
-            text=json.dumps({"error": f"Unknown tool: {name}"})
+            text=dumps({"error": f"Unknown tool: {name}"})
         )]
 
 async def main():
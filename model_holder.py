@@ -0,0 +1,116 @@
+"""
+Model Holder for Founder Matching System
+Loads the SentenceTransformer off the import path so the app can serve
+requests that don't need embeddings while the model is still loading
+"""
+
+import os
+import sys
+import threading
+import time
+import weakref
+from typing import Callable, Dict, Optional
+
+
+def load_sentence_transformer(model_name: str):
+    """Default loader; importing sentence_transformers (torch) is itself slow"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+class ModelNotReady(RuntimeError):
+    """Raised when the model is not loaded within the requested timeout"""
+
+
+class ModelHolder:
+    """Lazily or background-loaded embedding model
+
+    Acts as a drop-in for the model object where only `encode` is used
+    (MatchingEngine, vector search): calls block until the model is loaded.
+    `start()` begins loading on a daemon thread; without it the first
+    `get()`/`encode()` loads in the calling thread. A failed load is
+    reported by `status()` and re-raised to callers.
+    """
+
+    def __init__(self, model_name: str, loader: Optional[Callable[[str], object]] = None):
+        self.model_name = model_name
+        self.loader = loader or load_sentence_transformer
+        self._model = None
+        self._error: Optional[BaseException] = None
+        self._state = "idle"
+        self._load_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+
+        # A load thread does not survive fork; see _after_fork
+        if hasattr(os, "register_at_fork"):
+            ref = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: ref() and ref()._after_fork())
+
+    def _after_fork(self):
+        """Reset a load that was in flight in the parent when this process forked
+
+        A model that finished loading before the fork is kept and shared
+        copy-on-write with the parent; gunicorn.conf.py relies on this.
+        """
+        self._lock = threading.Lock()
+        if self._state == "loading":
+            self._state = "idle"
+            self._loaded = threading.Event()
+
+    def start(self) -> "ModelHolder":
+        """Begin loading on a background thread (no-op if already started)"""
+        with self._lock:
+            if self._state != "idle":
+                return self
+            self._state = "loading"
+        threading.Thread(target=self._load, name=f"load-{self.model_name}", daemon=True).start()
+        return self
+
+    def _load(self):
+        started = time.monotonic()
+        try:
+            model = self.loader(self.model_name)
+        except BaseException as e:  # surfaced through status() and get()
+            print(f"Failed to load embedding model {self.model_name}: {e}", file=sys.stderr)
+            self._error = e
+            self._state = "failed"
+        else:
+            self._model = model
+            self._state = "ready"
+            print(f"Embedding model {self.model_name} loaded in {time.monotonic() - started:.1f}s", file=sys.stderr)
+        finally:
+            self._load_seconds = time.monotonic() - started
+            self._loaded.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._state == "ready"
+
+    def get(self, timeout: Optional[float] = None):
+        """Return the model, loading it here if nobody has started yet"""
+        load_here = False
+        with self._lock:
+            if self._state == "idle":
+                self._state = "loading"
+                load_here = True
+        if load_here:
+            self._load()
+
+        if not self._loaded.wait(timeout):
+            raise ModelNotReady(f"Embedding model {self.model_name} is still loading")
+        if self._error is not None:
+            raise ModelNotReady(f"Embedding model {self.model_name} failed to load: {self._error}")
+        return self._model
+
+    def encode(self, *args, **kwargs):
+        return self.get().encode(*args, **kwargs)
+
+    def status(self) -> Dict:
+        """Readiness details for /health"""
+        status = {"name": self.model_name, "state": self._state}
+        if self._load_seconds is not None:
+            status["load_seconds"] = round(self._load_seconds, 2)
+        if self._error is not None:
+            status["error"] = str(self._error)
+        return status
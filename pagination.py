@@ -0,0 +1,77 @@
+"""
+Pagination helpers for Founder Matching System
+Keyset cursors over (created_at, id) shared by every database backend
+
+A page is the next `limit` rows ordered by (created_at, id) after the
+cursor, so a page costs the same wherever it starts and rows inserted while
+a client is paging never shift or duplicate later pages.
+"""
+
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Tables that support get_page()
+PAGINATED_TABLES = ("users", "needs", "learnings", "match_suggestions", "coffee_chats")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# (created_at, id) of the last row on the previous page
+Cursor = Tuple[str, str]
+
+# Row ids are a table prefix plus hex (see _generate_id); cursor fields end up
+# inside PostgREST filter strings, so nothing outside this set is accepted
+ROW_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def sort_key(row: Dict) -> Cursor:
+    """Keyset position of a row"""
+    return (row.get("created_at") or "", row["id"])
+
+
+def encode_cursor(row: Dict) -> str:
+    """Opaque cursor pointing just after the given row"""
+    raw = json.dumps(list(sort_key(row)), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors
+    
+    Cursors come from clients, so created_at must be an ISO timestamp (or
+    empty, for rows without one) and the id must match ROW_ID_PATTERN.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        if created_at:
+            datetime.fromisoformat(created_at)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if not isinstance(created_at, str) or not isinstance(row_id, str) or not ROW_ID_PATTERN.fullmatch(row_id):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return created_at, row_id
+
+
+def check_table(table: str):
+    if table not in PAGINATED_TABLES:
+        raise ValueError(f"Table {table} does not support pagination. Choose from {list(PAGINATED_TABLES)}")
+
+
+def iter_pages(fetch_page: Callable[[Optional[Cursor], int], List[Dict]],
+               page_size: int = DEFAULT_PAGE_SIZE, after: Optional[Cursor] = None) -> Iterator[List[Dict]]:
+    """Yield successive non-empty pages until the table is exhausted
+
+    `fetch_page(after, limit)` is typically a bound DatabaseManager.get_page
+    with the table and filters filled in; only one page is held at a time.
+    """
+    while True:
+        page = fetch_page(after, page_size)
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        after = sort_key(page[-1])
@@ -0,0 +1,51 @@
+"""
+Serialization for Founder Matching System
+Compact JSON for machine-to-machine payloads, with an optional fast encoder
+
+Responses, MCP tool results and the JSON database snapshot are written
+without indentation (about a third smaller). orjson is used when installed
+and anything it can't encode (e.g. integers beyond 64 bits) falls back to
+the standard library. Pretty-printing is opt-in per call.
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+COMPACT_SEPARATORS = (",", ":")
+
+# Datetimes go through `default` so both encoders format them the same way
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+
+
+def dumps_bytes(obj: Any, pretty: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Encode obj as UTF-8 JSON bytes (compact unless pretty)
+
+    `default` converts objects neither encoder supports natively, as in
+    json.dumps.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default,
+                                option=_ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if pretty else 0))
+        except TypeError:
+            pass  # fall through to the stdlib encoder
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=default).encode("utf-8")
+    return json.dumps(obj, separators=COMPACT_SEPARATORS, ensure_ascii=False, default=default).encode("utf-8")
+
+
+def dumps(obj: Any, pretty: bool = False, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Encode obj as a JSON string (compact unless pretty)"""
+    return dumps_bytes(obj, pretty, default).decode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON text or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -2,30 +2,80 @@
 
 const API_BASE = '';
 
+// Client-side copy of the dashboard data, kept current by the change stream
+const state = {
+    stats: {},
+    users: new Map(),
+    needs: new Map(),
+    learnings: new Map(),
+    matches: new Map(),
+    chats: new Map()
+};
+
+function rememberUsers(...users) {
+    users.forEach(user => {
+        if (user && user.id) state.users.set(user.id, user);
+    });
+}
+
 // =============== LOAD STATISTICS ===============
 
 async function loadStats() {
     try {
         const response = await fetch(`${API_BASE}/api/admin/stats`);
-        const data = await response.json();
-        
-        // Update stat cards
-        document.getElementById('statUsers').textContent = data.total_users || 0;
-        document.getElementById('statNeeds').textContent = data.total_needs || 0;
-        document.getElementById('statLearnings').textContent = data.total_learnings || 0;
-        document.getElementById('statMatches').textContent = data.total_matches || 0;
-        document.getElementById('statPendingMatches').textContent = data.pending_matches || 0;
-        document.getElementById('statConfirmedChats').textContent = data.confirmed_chats || 0;
-        
-        // Render category charts
-        renderCategoryChart('needsChart', data.need_categories || {});
-        renderCategoryChart('learningsChart', data.learning_categories || {});
+        state.stats = await response.json();
+        renderStats();
         
     } catch (error) {
         console.error('Error loading stats:', error);
     }
 }
 
+function renderStats() {
+    const data = state.stats;
+    
+    // Update stat cards
+    document.getElementById('statUsers').textContent = data.total_users || 0;
+    document.getElementById('statNeeds').textContent = data.total_needs || 0;
+    document.getElementById('statLearnings').textContent = data.total_learnings || 0;
+    document.getElementById('statMatches').textContent = data.total_matches || 0;
+    document.getElementById('statPendingMatches').textContent = data.pending_matches || 0;
+    document.getElementById('statConfirmedChats').textContent = data.confirmed_chats || 0;
+    
+    // Render category charts
+    renderCategoryChart('needsChart', data.need_categories || {});
+    renderCategoryChart('learningsChart', data.learning_categories || {});
+}
+
+function countBy(rows, key) {
+    const counts = {};
+    rows.forEach(row => {
+        const value = row[key] || 'other';
+        counts[value] = (counts[value] || 0) + 1;
+    });
+    return counts;
+}
+
+// Recompute the stat cards from local state after a change event
+function refreshStatsFromState() {
+    const needs = [...state.needs.values()];
+    const learnings = [...state.learnings.values()];
+    const matches = [...state.matches.values()];
+    const chats = [...state.chats.values()];
+    
+    Object.assign(state.stats, {
+        total_needs: needs.length,
+        total_learnings: learnings.length,
+        total_matches: matches.length,
+        pending_matches: matches.filter(m => m.status === 'pending').length,
+        total_chats: chats.length,
+        confirmed_chats: chats.filter(c => c.status === 'confirmed').length,
+        need_categories: countBy(needs, 'category'),
+        learning_categories: countBy(learnings, 'category')
+    });
+    renderStats();
+}
+
 function renderCategoryChart(containerId, categories) {
     const container = document.getElementById(containerId);
     
@@ -64,28 +114,12 @@ async function loadNeeds() {
         const response = await fetch(`${API_BASE}/api/admin/needs`);
         const data = await response.json();
         
-        const tbody = document.querySelector('#needsTable tbody');
-        
-        if (data.needs && data.needs.length > 0) {
-            tbody.innerHTML = data.needs.map(need => {
-                const user = need.user || { name: 'Unknown', company: '' };
-                return `
-                    <tr>
-                        <td>
-                            <strong>${user.name}</strong><br>
-                            <small style="color: #6b7280;">${user.company}</small>
-                        </td>
-                        <td>${need.label}</td>
-                        <td>
-                            <span class="badge badge-${need.category}">${need.category}</span>
-                        </td>
-                        <td>${formatDate(need.created_at)}</td>
-                    </tr>
-                `;
-            }).join('');
-        } else {
-            tbody.innerHTML = '<tr><td colspan="4" style="text-align: center; color: #6b7280;">No needs yet</td></tr>';
-        }
+        state.needs.clear();
+        (data.needs || []).forEach(({ user, ...need }) => {
+            rememberUsers(user);
+            state.needs.set(need.id, need);
+        });
+        renderNeeds();
     } catch (error) {
         console.error('Error loading needs:', error);
         const tbody = document.querySelector('#needsTable tbody');
@@ -93,6 +127,32 @@ async function loadNeeds() {
     }
 }
 
+function renderNeeds() {
+    const tbody = document.querySelector('#needsTable tbody');
+    const needs = [...state.needs.values()];
+    
+    if (needs.length > 0) {
+        tbody.innerHTML = needs.map(need => {
+            const user = state.users.get(need.user_id) || { name: 'Unknown', company: '' };
+            return `
+                <tr>
+                    <td>
+                        <strong>${user.name}</strong><br>
+                        <small style="color: #6b7280;">${user.company}</small>
+                    </td>
+                    <td>${need.label}</td>
+                    <td>
+                        <span class="badge badge-${need.category}">${need.category}</span>
+                    </td>
+                    <td>${formatDate(need.created_at)}</td>
+                </tr>
+            `;
+        }).join('');
+    } else {
+        tbody.innerHTML = '<tr><td colspan="4" style="text-align: center; color: #6b7280;">No needs yet</td></tr>';
+    }
+}
+
 // =============== LOAD LEARNINGS ===============
 
 async function loadLearnings() {
@@ -100,28 +160,12 @@ async function loadLearnings() {
         const response = await fetch(`${API_BASE}/api/admin/learnings`);
         const data = await response.json();
         
-        const tbody = document.querySelector('#learningsTable tbody');
-        
-        if (data.learnings && data.learnings.length > 0) {
-            tbody.innerHTML = data.learnings.map(learning => {
-                const user = learning.user || { name: 'Unknown', company: '' };
-                return `
-                    <tr>
-                        <td>
-                            <strong>${user.name}</strong><br>
-                            <small style="color: #6b7280;">${user.company}</small>
-                        </td>
-                        <td>${learning.label}</td>
-                        <td>
-                            <span class="badge badge-${learning.category}">${learning.category}</span>
-                        </td>
-                        <td>${formatDate(learning.created_at)}</td>
-                    </tr>
-                `;
-            }).join('');
-        } else {
-            tbody.innerHTML = '<tr><td colspan="4" style="text-align: center; color: #6b7280;">No learnings yet</td></tr>';
-        }
+        state.learnings.clear();
+        (data.learnings || []).forEach(({ user, ...learning }) => {
+            rememberUsers(user);
+            state.learnings.set(learning.id, learning);
+        });
+        renderLearnings();
     } catch (error) {
         console.error('Error loading learnings:', error);
         const tbody = document.querySelector('#learningsTable tbody');
@@ -129,6 +173,32 @@ async function loadLearnings() {
     }
 }
 
+function renderLearnings() {
+    const tbody = document.querySelector('#learningsTable tbody');
+    const learnings = [...state.learnings.values()];
+    
+    if (learnings.length > 0) {
+        tbody.innerHTML = learnings.map(learning => {
+            const user = state.users.get(learning.user_id) || { name: 'Unknown', company: '' };
+            return `
+                <tr>
+                    <td>
+                        <strong>${user.name}</strong><br>
+                        <small style="color: #6b7280;">${user.company}</small>
+                    </td>
+                    <td>${learning.label}</td>
+                    <td>
+                        <span class="badge badge-${learning.category}">${learning.category}</span>
+                    </td>
+                    <td>${formatDate(learning.created_at)}</td>
+                </tr>
+            `;
+        }).join('');
+    } else {
+        tbody.innerHTML = '<tr><td colspan="4" style="text-align: center; color: #6b7280;">No learnings yet</td></tr>';
+    }
+}
+
 // =============== LOAD MATCHES ===============
 
 async function loadMatches() {
@@ -136,35 +206,12 @@ async function loadMatches() {
         const response = await fetch(`${API_BASE}/api/admin/matches`);
         const data = await response.json();
         
-        const tbody = document.querySelector('#matchesTable tbody');
-        
-        if (data.matches && data.matches.length > 0) {
-            tbody.innerHTML = data.matches.map(match => {
-                const requester = match.requester || { name: 'Unknown', company: '' };
-                const expert = match.expert || { name: 'Unknown', company: '' };
-                return `
-                    <tr>
-                        <td>
-                            <strong>${requester.name}</strong><br>
-                            <small style="color: #6b7280;">${requester.company}</small>
-                        </td>
-                        <td>
-                            <strong>${expert.name}</strong><br>
-                            <small style="color: #6b7280;">${expert.company}</small>
-                        </td>
-                        <td>
-                            <strong style="color: #6366f1;">${Math.round(match.score * 100)}%</strong>
-                        </td>
-                        <td>
-                            <span class="badge ${getStatusBadgeClass(match.status)}">${match.status}</span>
-                        </td>
-                        <td>${formatDate(match.created_at)}</td>
-                    </tr>
-                `;
-            }).join('');
-        } else {
-            tbody.innerHTML = '<tr><td colspan="5" style="text-align: center; color: #6b7280;">No matches yet</td></tr>';
-        }
+        state.matches.clear();
+        (data.matches || []).forEach(({ requester, expert, need, ...match }) => {
+            rememberUsers(requester, expert);
+            state.matches.set(match.id, match);
+        });
+        renderMatches();
     } catch (error) {
         console.error('Error loading matches:', error);
         const tbody = document.querySelector('#matchesTable tbody');
@@ -172,6 +219,39 @@ async function loadMatches() {
     }
 }
 
+function renderMatches() {
+    const tbody = document.querySelector('#matchesTable tbody');
+    const matches = [...state.matches.values()];
+    
+    if (matches.length > 0) {
+        tbody.innerHTML = matches.map(match => {
+            const requester = state.users.get(match.need_user_id) || { name: 'Unknown', company: '' };
+            const expert = state.users.get(match.expert_user_id) || { name: 'Unknown', company: '' };
+            return `
+                <tr>
+                    <td>
+                        <strong>${requester.name}</strong><br>
+                        <small style="color: #6b7280;">${requester.company}</small>
+                    </td>
+                    <td>
+                        <strong>${expert.name}</strong><br>
+                        <small style="color: #6b7280;">${expert.company}</small>
+                    </td>
+                    <td>
+                        <strong style="color: #6366f1;">${Math.round(match.score * 100)}%</strong>
+                    </td>
+                    <td>
+                        <span class="badge ${getStatusBadgeClass(match.status)}">${match.status}</span>
+                    </td>
+                    <td>${formatDate(match.created_at)}</td>
+                </tr>
+            `;
+        }).join('');
+    } else {
+        tbody.innerHTML = '<tr><td colspan="5" style="text-align: center; color: #6b7280;">No matches yet</td></tr>';
+    }
+}
+
 // =============== LOAD COFFEE CHATS ===============
 
 async function loadCoffeeChats() {
@@ -179,35 +259,12 @@ async function loadCoffeeChats() {
         const response = await fetch(`${API_BASE}/api/admin/coffee-chats`);
         const data = await response.json();
         
-        const tbody = document.querySelector('#chatsTable tbody');
-        
-        if (data.coffee_chats && data.coffee_chats.length > 0) {
-            tbody.innerHTML = data.coffee_chats.map(chat => {
-                const requester = chat.requester || { name: 'Unknown', company: '' };
-                const expert = chat.expert || { name: 'Unknown', company: '' };
-                return `
-                    <tr>
-                        <td>
-                            <strong>${requester.name}</strong><br>
-                            <small style="color: #6b7280;">${requester.company}</small>
-                        </td>
-                        <td>
-                            <strong>${expert.name}</strong><br>
-                            <small style="color: #6b7280;">${expert.company}</small>
-                        </td>
-                        <td>
-                            <span class="badge ${getStatusBadgeClass(chat.status)}">${chat.status.replace('_', ' ')}</span>
-                        </td>
-                        <td>
-                            ${chat.scheduled_time ? formatDateTime(chat.scheduled_time) : '-'}
-                        </td>
-                        <td>${formatDate(chat.created_at)}</td>
-                    </tr>
-                `;
-            }).join('');
-        } else {
-            tbody.innerHTML = '<tr><td colspan="5" style="text-align: center; color: #6b7280;">No coffee chats yet</td></tr>';
-        }
+        state.chats.clear();
+        (data.coffee_chats || []).forEach(({ requester, expert, ...chat }) => {
+            rememberUsers(requester, expert);
+            state.chats.set(chat.id, chat);
+        });
+        renderCoffeeChats();
     } catch (error) {
         console.error('Error loading coffee chats:', error);
         const tbody = document.querySelector('#chatsTable tbody');
@@ -215,6 +272,39 @@ async function loadCoffeeChats() {
     }
 }
 
+function renderCoffeeChats() {
+    const tbody = document.querySelector('#chatsTable tbody');
+    const chats = [...state.chats.values()];
+    
+    if (chats.length > 0) {
+        tbody.innerHTML = chats.map(chat => {
+            const requester = state.users.get(chat.requester_id) || { name: 'Unknown', company: '' };
+            const expert = state.users.get(chat.expert_id) || { name: 'Unknown', company: '' };
+            return `
+                <tr>
+                    <td>
+                        <strong>${requester.name}</strong><br>
+                        <small style="color: #6b7280;">${requester.company}</small>
+                    </td>
+                    <td>
+                        <strong>${expert.name}</strong><br>
+                        <small style="color: #6b7280;">${expert.company}</small>
+                    </td>
+                    <td>
+                        <span class="badge ${getStatusBadgeClass(chat.status)}">${chat.status.replace('_', ' ')}</span>
+                    </td>
+                    <td>
+                        ${chat.scheduled_time ? formatDateTime(chat.scheduled_time) : '-'}
+                    </td>
+                    <td>${formatDate(chat.created_at)}</td>
+                </tr>
+            `;
+        }).join('');
+    } else {
+        tbody.innerHTML = '<tr><td colspan="5" style="text-align: center; color: #6b7280;">No coffee chats yet</td></tr>';
+    }
+}
+
 // =============== UTILITY FUNCTIONS ===============
 
 function formatDate(isoString) {
@@ -268,11 +358,117 @@ async function initDashboard() {
     console.log('✅ Admin dashboard loaded');
 }
 
-// Load dashboard on page load
-document.addEventListener('DOMContentLoaded', initDashboard);
+// =============== LIVE UPDATES ===============
+
+// Apply one change event from the server to local state and re-render
+function applyChange(change) {
+    const row = change.row;
+    
+    switch (change.table) {
+        case 'users':
+            if (change.action === 'create' && !state.users.has(row.id)) {
+                state.stats.total_users = (state.stats.total_users || 0) + 1;
+            }
+            state.users.set(row.id, { ...state.users.get(row.id), ...row });
+            renderNeeds();
+            renderLearnings();
+            renderMatches();
+            renderCoffeeChats();
+            break;
+        case 'needs':
+            // The dashboard only lists active needs
+            if (row.status === 'active') state.needs.set(row.id, row);
+            else state.needs.delete(row.id);
+            renderNeeds();
+            break;
+        case 'learnings':
+            if (row.status === 'active') state.learnings.set(row.id, row);
+            else state.learnings.delete(row.id);
+            renderLearnings();
+            break;
+        case 'match_suggestions':
+            if (change.action === 'delete') state.matches.delete(row.id);
+            else state.matches.set(row.id, { ...state.matches.get(row.id), ...row });
+            renderMatches();
+            break;
+        case 'coffee_chats':
+            state.chats.set(row.id, { ...state.chats.get(row.id), ...row });
+            renderCoffeeChats();
+            break;
+        default:
+            return;
+    }
+    
+    refreshStatsFromState();
+}
+
+// The change feed is per server process: with several workers some writes
+// never reach this stream, so resync everything now and then regardless
+const FULL_RESYNC_MS = 5 * 60 * 1000;
+
+// One refresh timer at a time, whichever path (re)starts it
+let refreshTimer = null;
+
+function scheduleRefresh(ms) {
+    clearInterval(refreshTimer);
+    refreshTimer = setInterval(initDashboard, ms);
+}
+
+function subscribeToChanges() {
+    if (!window.EventSource) {
+        // No SSE support: fall back to periodic full refresh
+        initDashboard();
+        scheduleRefresh(30000);
+        return;
+    }
+    
+    const events = new EventSource(`${API_BASE}/api/admin/events`);
+    
+    // Changes that arrive during a full load are applied after it, so the
+    // (possibly older) loaded rows cannot overwrite them
+    let buffered = null;
+    async function reload() {
+        buffered = [];
+        try {
+            await initDashboard();
+        } finally {
+            const pending = buffered;
+            buffered = null;
+            pending.forEach(applyChange);
+        }
+    }
+    
+    events.addEventListener('change', (e) => {
+        const change = JSON.parse(e.data);
+        if (buffered) buffered.push(change);
+        else applyChange(change);
+    });
+    
+    // Load once the stream is connected (and again after a reconnect), so
+    // nothing written before it was listening is missed
+    events.onopen = reload;
+    
+    // Refused (e.g. 503 when too many streams are open): poll instead
+    events.onerror = () => {
+        if (events.readyState === EventSource.CLOSED) {
+            reload();
+            scheduleRefresh(30000);
+        }
+    };
+    
+    // The server could not replay what we missed: start a fresh stream
+    // (without the stale Last-Event-ID); it reloads everything on open
+    events.addEventListener('reset', () => {
+        events.close();
+        subscribeToChanges();
+    });
+}
 
-// Auto-refresh every 30 seconds
-setInterval(initDashboard, 30000);
+// Load dashboard on page load, then follow changes as they happen
+document.addEventListener('DOMContentLoaded', () => {
+    subscribeToChanges();
+    if (window.EventSource) scheduleRefresh(FULL_RESYNC_MS);
+});
 
 
 
@@ -321,7 +321,9 @@ async function submitCheckin(text) {
             throw new Error('Failed to submit check-in');
         }
         
-        const data = await response.json();
+        // The check-in is processed in the background; poll until it's done
+        const job = await response.json();
+        const data = await waitForJob(job.status_url);
         
         // Show XP notification
         showXPNotification(
@@ -352,6 +354,35 @@ async function submitCheckin(text) {
     }
 }
 
+// Job status is kept per server instance, so behind a load balancer a poll
+// can land on an instance that doesn't know the job: keep polling a while
+const MAX_JOB_NOT_FOUND = 30;
+
+async function waitForJob(statusUrl, intervalMs = 1000) {
+    let notFound = 0;
+    while (true) {
+        const response = await fetch(`${API_BASE}${statusUrl}`);
+        if (response.status === 404 && ++notFound < MAX_JOB_NOT_FOUND) {
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+            continue;
+        }
+        if (!response.ok) {
+            throw new Error('Failed to check check-in status');
+        }
+        notFound = 0;
+        
+        const job = await response.json();
+        if (job.status === 'completed') {
+            return job.result;
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Check-in processing failed');
+        }
+        
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+}
+
 function displaySubmissionResults(data) {
     const resultsDiv = document.getElementById('submissionResults');
     const infoDiv = document.getElementById('extractedInfo');
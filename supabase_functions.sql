@@ -0,0 +1,106 @@
+-- Server-side functions for the Supabase backend
+-- Run once in the Supabase SQL Editor (safe to re-run).
+--
+-- increment_user applies XP and activity counters in a single atomic
+-- statement, so concurrent check-ins and chats never lose increments.
+-- Level and badge rules mirror gamification.py; keep them in sync.
+--
+-- upsert_match_suggestions stores a batch of suggestions keyed on
+-- (need_id, expert_user_id): new pairs are inserted, stored pairs only get
+-- their score and reason refreshed (id, status and created_at are kept).
+
+CREATE OR REPLACE FUNCTION increment_user(
+  p_user_id TEXT,
+  p_xp INTEGER DEFAULT 0,
+  p_stats JSONB DEFAULT '{}'::jsonb
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  old_level INTEGER;
+  old_badges JSONB;
+  updated users%ROWTYPE;
+  new_badges JSONB := '[]'::jsonb;
+  badge RECORD;
+BEGIN
+  -- Row lock: concurrent calls for the same user queue up here
+  SELECT COALESCE(level, 1), COALESCE(badges, '[]'::jsonb)
+    INTO old_level, old_badges
+    FROM users WHERE id = p_user_id
+    FOR UPDATE;
+
+  IF NOT FOUND THEN
+    RETURN NULL;
+  END IF;
+
+  UPDATE users SET
+    xp = COALESCE(xp, 0) + p_xp,
+    total_checkins = COALESCE(total_checkins, 0) + COALESCE((p_stats->>'total_checkins')::INTEGER, 0),
+    total_matches = COALESCE(total_matches, 0) + COALESCE((p_stats->>'total_matches')::INTEGER, 0),
+    total_chats = COALESCE(total_chats, 0) + COALESCE((p_stats->>'total_chats')::INTEGER, 0)
+  WHERE id = p_user_id
+  RETURNING * INTO updated;
+
+  -- XP for level n = 25(n-1)(n+2), solved for n
+  updated.level := GREATEST(1, TRUNC((-1 + SQRT(225 + 4 * updated.xp) / 5) / 2)::INTEGER + 1);
+
+  FOR badge IN
+    SELECT * FROM (VALUES (100, 'First Steps'), (500, 'Rising Star'), (1000, 'Community Leader'))
+      AS thresholds(min_xp, name)
+    ORDER BY min_xp
+  LOOP
+    IF updated.xp >= badge.min_xp AND NOT old_badges ? badge.name THEN
+      new_badges := new_badges || to_jsonb(badge.name);
+    END IF;
+  END LOOP;
+
+  updated.badges := old_badges || new_badges;
+
+  UPDATE users SET level = updated.level, badges = updated.badges WHERE id = p_user_id;
+
+  RETURN jsonb_build_object(
+    'user', to_jsonb(updated),
+    'xp_gained', p_xp,
+    'total_xp', updated.xp,
+    'level', updated.level,
+    'leveled_up', updated.level > old_level,
+    'new_badges', new_badges
+  );
+END;
+$$;
+
+
+-- One suggestion per (need, expert): concurrent check-ins upsert the same
+-- row instead of inserting duplicates. Duplicates left by older versions are
+-- folded into the earliest row first so the constraint can be added.
+DELETE FROM match_suggestions later
+  USING match_suggestions earlier
+  WHERE later.need_id = earlier.need_id
+    AND later.expert_user_id = earlier.expert_user_id
+    AND (later.created_at, later.id) > (earlier.created_at, earlier.id);
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint WHERE conname = 'match_suggestions_need_expert_key'
+  ) THEN
+    ALTER TABLE match_suggestions
+      ADD CONSTRAINT match_suggestions_need_expert_key UNIQUE (need_id, expert_user_id);
+  END IF;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION upsert_match_suggestions(p_rows JSONB)
+RETURNS TABLE (suggestion JSONB, inserted BOOLEAN)
+LANGUAGE sql
+AS $$
+  INSERT INTO match_suggestions AS m
+    (id, need_id, need_user_id, expert_user_id, score, reason, status, created_at)
+  SELECT r.id, r.need_id, r.need_user_id, r.expert_user_id, r.score, r.reason, r.status, r.created_at
+    FROM jsonb_populate_recordset(NULL::match_suggestions, p_rows) AS r
+  ON CONFLICT (need_id, expert_user_id) DO UPDATE
+    SET score = EXCLUDED.score, reason = EXCLUDED.reason
+  -- xmax is 0 only for rows this statement inserted
+  RETURNING to_jsonb(m), (m.xmax = 0);
+$$;
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the async FounderMatchingAgent (fake Anthropic client, no API calls)
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from agent import FounderMatchingAgent
+
+EXTRACTION = {
+    "worked_on": "deploying our recommendation model",
+    "stuck_on": "scaling model serving",
+    "needs_help_with": ["MLOps"],
+    "topics": ["machine learning"],
+    "skills_needed": ["Kubernetes"]
+}
+
+
+class FakeMessages:
+    """Answers extraction and reason prompts after a fixed delay"""
+
+    def __init__(self, delay=0.05, batch_ok=True):
+        self.delay = delay
+        self.batch_ok = batch_ok
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, model, max_tokens, messages):
+        prompt = messages[0]["content"]
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+
+        if "Extract the following information" in prompt:
+            text = json.dumps(EXTRACTION)
+        elif "Experts:" in prompt:
+            ids = [line.split(": ", 1)[1] for line in prompt.splitlines() if line.startswith("Expert id: ")]
+            text = json.dumps({i: f"batched reason for {i}" for i in ids}) if self.batch_ok else "not json"
+        else:
+            text = "single reason"
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+def _agent(**kwargs):
+    messages = FakeMessages(**kwargs)
+    return FounderMatchingAgent(client=SimpleNamespace(messages=messages), max_concurrency=2,
+                                semantic_search=False), messages
+
+
+def test_reasons_come_from_one_batched_call():
+    """A check-in costs one extraction call plus one reason call"""
+    agent, messages = _agent()
+    result = asyncio.run(agent.analyze_checkin("I'm stuck scaling our ML model"))
+
+    assert len(messages.prompts) == 2
+    assert result["matchedFounders"]
+    for founder in result["matchedFounders"]:
+        assert founder["reason"] == f"batched reason for {founder['id']}"
+    print("✓ Reasons for all matches come from one batched call")
+
+
+def test_fallback_runs_in_parallel_under_limit():
+    """If the batch fails, per-match calls run concurrently but within the limit"""
+    agent, messages = _agent(delay=0.1, batch_ok=False)
+    founders = [{"id": f"f{i}", "name": f"F{i}", "company": "Co", "expertise": ["ml"],
+                 "helpfulIn": ["scaling"], "bio": "bio"} for i in range(4)]
+    context = {"stuck_on": "scaling", "needs": ["MLOps"], "skills": ["Kubernetes"]}
+
+    started = time.monotonic()
+    reasons = asyncio.run(agent.generate_reasons(founders, context))
+    elapsed = time.monotonic() - started
+
+    assert reasons == {f"f{i}": "single reason" for i in range(4)}
+    assert messages.max_in_flight == 2
+    assert elapsed < 0.45  # batch + two waves of two, not 1 + 4 serial calls
+    print("✓ Fallback reasons run in parallel under the concurrency limit")
+
+
+def test_timeout_falls_back_to_template():
+    """A call that exceeds the timeout yields a template reason"""
+    agent, _ = _agent(delay=1.0)
+    agent.timeout = 0.05
+    founder = {"id": "f1", "name": "Ada", "company": "Co", "expertise": ["MLOps"],
+               "helpfulIn": [], "bio": ""}
+    reasons = asyncio.run(agent.generate_reasons([founder], {"stuck_on": "", "needs": [], "skills": []}))
+    assert reasons == {"f1": "Ada has expertise in MLOps."}
+    print("✓ Timed-out calls fall back to a template reason")
+
+
+if __name__ == "__main__":
+    test_reasons_come_from_one_batched_call()
+    test_fallback_runs_in_parallel_under_limit()
+    test_timeout_falls_back_to_template()
+    print("✅ Agent tests passed!")
@@ -3,8 +3,11 @@
 Simple test script to verify the application works
 """
 
+import os
 import sys
 import json
+import shutil
+import tempfile
 
 def test_imports():
     """Test that all required modules can be imported"""
@@ -31,23 +34,26 @@ def test_database():
     print("Testing database...")
     try:
         from db_manager import DatabaseManager
-        db = DatabaseManager("database.json")
-        
-        # Test read operations
-        users = db.get_all_users()
-        print(f"  ✓ Found {len(users)} users")
-        
-        needs = db.get_all_active_needs()
-        print(f"  ✓ Found {len(needs)} active needs")
-        
-        learnings = db.get_all_active_learnings()
-        print(f"  ✓ Found {len(learnings)} active learnings")
-        
-        matches = db.get_all_matches()
-        print(f"  ✓ Found {len(matches)} matches")
-        
-        stats = db.get_dashboard_stats()
-        print(f"  ✓ Dashboard stats: {stats['total_users']} users, {stats['total_matches']} matches")
+        # Work on a copy so nothing is ever logged next to the fixture
+        with tempfile.TemporaryDirectory() as tmp:
+            shutil.copy("database.json", os.path.join(tmp, "database.json"))
+            db = DatabaseManager(os.path.join(tmp, "database.json"))
+            
+            # Test read operations
+            users = db.get_all_users()
+            print(f"  ✓ Found {len(users)} users")
+            
+            needs = db.get_all_active_needs()
+            print(f"  ✓ Found {len(needs)} active needs")
+            
+            learnings = db.get_all_active_learnings()
+            print(f"  ✓ Found {len(learnings)} active learnings")
+            
+            matches = db.get_all_matches()
+            print(f"  ✓ Found {len(matches)} matches")
+            
+            stats = db.get_dashboard_stats()
+            print(f"  ✓ Dashboard stats: {stats['total_users']} users, {stats['total_matches']} matches")
         
         print("✅ Database tests passed!\n")
         return True
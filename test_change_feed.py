@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the database change feed
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from change_feed import ChangeFeed, FeedFull
+from db_manager import DatabaseManager
+
+
+def _parse(message):
+    fields = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_database_writes_are_published():
+    """create_* and update_* methods publish events with the written row"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "database.json")
+        shutil.copy("database.json", path)
+        feed = ChangeFeed()
+        db = DatabaseManager(path, change_feed=feed)
+        subscription = feed.subscribe()
+
+        need = db.create_need("u001", "Pricing strategy", "sales")
+        db.update_need_status(need["id"], "resolved")
+
+        created = subscription.events.get_nowait()
+        updated = subscription.events.get_nowait()
+        assert (created["table"], created["action"], created["row"]["id"]) == ("needs", "create", need["id"])
+        assert (updated["action"], updated["row"]["status"]) == ("update", "resolved")
+        assert created["row"]["status"] == "active"
+        assert updated["id"] > created["id"]
+    print("✓ Database writes publish change events")
+
+
+def test_stream_replays_and_resets():
+    """Reconnecting clients get missed events, or a reset when too far behind"""
+    feed = ChangeFeed(history=2)
+    for i in range(3):
+        feed.publish("needs", "create", {"id": f"n{i}"})
+
+    stream = feed.stream(last_event_id=1)
+    assert next(stream).startswith("retry:")
+    event, data = _parse(next(stream))
+    assert event == "change" and data["row"]["id"] == "n1"
+    stream.close()
+
+    stream = feed.stream(last_event_id=0)
+    next(stream)
+    event, _ = _parse(next(stream))
+    assert event == "reset"
+    print("✓ Stream replays missed events and resets stale clients")
+
+
+def test_subscriber_cap():
+    """Streams past max_subscribers are refused; closing one frees its slot"""
+    feed = ChangeFeed(max_subscribers=2)
+    first = feed.stream()
+    second = feed.stream()
+    try:
+        feed.stream()
+        assert False, "third stream should be refused"
+    except FeedFull:
+        pass
+
+    # Closed before it was ever iterated, as when the client disconnects early
+    first.close()
+    assert feed.subscriber_count == 1
+    third = feed.stream()
+    assert next(third).startswith("retry:")
+    second.close()
+    third.close()
+    assert feed.subscriber_count == 0
+    print("✓ Subscriber cap refuses extra streams and frees closed ones")
+
+
+if __name__ == "__main__":
+    test_database_writes_are_published()
+    test_stream_replays_and_resets()
+    test_subscriber_cap()
+    print("✅ Change feed tests passed!")
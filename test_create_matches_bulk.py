@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk match persistence on the local backends
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from db_manager import DatabaseManager as JSONDatabaseManager
+from db_manager_sqlite import DatabaseManager as SQLiteDatabaseManager
+
+
+def _candidates(score):
+    return [
+        {"need_id": "n_new", "need_user_id": "u001", "expert_user_id": "u002", "score": score, "reason": "A"},
+        {"need_id": "n_new", "need_user_id": "u001", "expert_user_id": "u003", "score": score, "reason": "B"},
+    ]
+
+
+def _check_backend(db):
+    before = len(db.get_all_matches())
+    created = db.create_matches_bulk(_candidates(0.5), upsert=True)
+    assert len(created) == 2 and all(m["status"] == "pending" for m in created)
+    ids = {m["id"] for m in created}
+
+    db.update_match_status(created[0]["id"], "accepted")
+    again = db.create_matches_bulk(_candidates(0.9) + _candidates(0.9), upsert=True)
+    assert {m["id"] for m in again} == ids
+
+    stored = db.get_matches_for_needs(["n_new"])
+    assert len(stored) == 2 and len(db.get_all_matches()) == before + 2
+    assert {m["score"] for m in stored} == {0.9}
+    assert db.get_match(created[0]["id"])["status"] == "accepted"
+
+    # Plain mode always inserts
+    assert len(db.create_matches_bulk(_candidates(0.1))) == 2
+    assert len(db.get_matches_for_needs(["n_new"])) == 4
+    assert db.create_matches_bulk([], upsert=True) == []
+
+    # Trimming deletes rows everywhere they are visible
+    extra = [m for m in db.get_matches_for_needs(["n_new"]) if m["id"] not in ids]
+    removed = db.delete_matches([m["id"] for m in extra] + ["missing"])
+    assert {m["id"] for m in removed} == {m["id"] for m in extra}
+    assert {m["id"] for m in db.get_matches_for_needs(["n_new"])} == ids
+    assert db.get_match(extra[0]["id"]) is None
+    assert len(db.get_all_matches()) == before + 2
+    assert db.delete_matches([]) == []
+
+
+def test_json_backend():
+    """JSON backend upserts on (need_id, expert_user_id)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "database.json")
+        shutil.copy("database.json", path)
+        _check_backend(JSONDatabaseManager(path))
+        # Deletions are logged and survive a reload
+        assert len(JSONDatabaseManager(path).get_matches_for_needs(["n_new"])) == 2
+    print("✓ JSON backend bulk-creates and upserts matches")
+
+
+def test_sqlite_backend():
+    """SQLite backend upserts on (need_id, expert_user_id) in one transaction"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = SQLiteDatabaseManager(os.path.join(tmp, "test.sqlite3"))
+        with open("database.json") as f:
+            db.import_data(json.load(f))
+        _check_backend(db)
+    print("✓ SQLite backend bulk-creates and upserts matches")
+
+
+if __name__ == "__main__":
+    test_json_backend()
+    test_sqlite_backend()
+    print("✅ Bulk match tests passed!")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for the JSON DatabaseManager hash indexes
+"""
+
+import os
+import shutil
+import tempfile
+
+from db_manager import DatabaseManager
+
+
+def _scan(db, table, field, value):
+    return sorted(r["id"] for r in db.data[table] if r.get(field) == value)
+
+
+def _ids(rows):
+    return sorted(r["id"] for r in rows)
+
+
+def test_indexes_match_linear_scans():
+    """Indexed queries return exactly what a full scan would"""
+    db = DatabaseManager("database.json")
+    for user in db.get_all_users():
+        uid = user["id"]
+        assert db.get_user(uid) is user
+        assert _ids(db.get_needs_by_user(uid)) == _scan(db, "needs", "user_id", uid)
+        assert _ids(db.get_learnings_by_user(uid)) == _scan(db, "learnings", "user_id", uid)
+        assert _ids(db.get_matches_for_user(uid)) == _scan(db, "match_suggestions", "need_user_id", uid)
+        assert _ids(db.get_matches_for_expert(uid)) == _scan(db, "match_suggestions", "expert_user_id", uid)
+        chats = _scan(db, "coffee_chats", "requester_id", uid) + _scan(db, "coffee_chats", "expert_id", uid)
+        assert _ids(db.get_coffee_chats_by_user(uid)) == sorted(set(chats))
+    for chat in db.get_all_coffee_chats():
+        assert _ids(db.get_slots_for_chat(chat["id"])) == _scan(db, "proposed_slots", "coffee_chat_id", chat["id"])
+    assert _ids(db.get_all_active_needs()) == _scan(db, "needs", "status", "active")
+    assert db.get_need("missing") is None
+    print("✓ Indexed lookups agree with linear scans")
+
+
+def test_indexes_follow_writes():
+    """Inserts and in-place updates move rows between index buckets"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "database.json")
+        shutil.copy("database.json", path)
+        db = DatabaseManager(path)
+        need = db.create_need("u001", "Pricing strategy", "sales")
+        assert need in db.get_needs_by_user("u001")
+        assert need in db.get_all_active_needs()
+
+        db.update_need_status(need["id"], "resolved")
+        assert need not in db.get_all_active_needs()
+
+        chat = db.create_coffee_chat("m1", "u001", "u002")
+        slot = db.create_slot(chat["id"], "u001", "2026-01-01T10:00:00Z")
+        assert db.get_slots_for_chat(chat["id"]) == [slot]
+        db.update_coffee_chat(chat["id"], {"status": "confirmed"})
+        assert db.get_dashboard_stats()["confirmed_chats"] == len(_scan(db, "coffee_chats", "status", "confirmed"))
+
+        reloaded = DatabaseManager(path)
+        assert reloaded.get_need(need["id"])["status"] == "resolved"
+        assert need["id"] not in _ids(reloaded.get_all_active_needs())
+    print("✓ Indexes stay consistent across inserts and updates")
+
+
+if __name__ == "__main__":
+    test_indexes_match_linear_scans()
+    test_indexes_follow_writes()
+    print("✅ Index tests passed!")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite DatabaseManager
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+from change_feed import ChangeFeed
+from db_manager import DatabaseManager as JSONDatabaseManager
+from db_manager_sqlite import DatabaseManager
+
+
+def _make_db(tmp, change_feed=None):
+    db = DatabaseManager(os.path.join(tmp, "test.sqlite3"), change_feed=change_feed)
+    with open("database.json") as f:
+        db.import_data(json.load(f))
+    return db
+
+
+def _ids(rows):
+    return sorted(r["id"] for r in rows)
+
+
+def test_reads_match_json_backend():
+    """Imported data answers every query like the JSON backend does"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _make_db(tmp)
+        reference = JSONDatabaseManager("database.json")
+        for user in reference.get_all_users():
+            uid = user["id"]
+            assert db.get_user(uid)["skills"] == user["skills"]
+            assert _ids(db.get_needs_by_user(uid)) == _ids(reference.get_needs_by_user(uid))
+            assert _ids(db.get_matches_for_user(uid)) == _ids(reference.get_matches_for_user(uid))
+            assert _ids(db.get_matches_for_expert(uid)) == _ids(reference.get_matches_for_expert(uid))
+            assert _ids(db.get_coffee_chats_by_user(uid)) == _ids(reference.get_coffee_chats_by_user(uid))
+        chat_ids = [c["id"] for c in reference.get_all_coffee_chats()]
+        assert _ids(db.get_slots_for_chats(chat_ids)) == _ids(reference.get_slots_for_chats(chat_ids))
+        assert db.get_dashboard_stats() == reference.get_dashboard_stats()
+        assert db.get_user("missing") is None
+    print("✓ SQLite reads match the JSON backend")
+
+
+def test_writes_and_gamification():
+    """Writes round-trip JSON columns and increments are atomic across threads"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _make_db(tmp)
+        user = db.create_user("Grace", "grace@example.com")
+        assert (user["xp"], user["level"], user["badges"]) == (0, 1, [])
+
+        db.update_user_skills(user["id"], [{"label": "Pricing", "category": "sales"}])
+        db.update_user_skills(user["id"], [{"label": "Pricing", "category": "sales"}])
+        assert db.get_user(user["id"])["skills"] == [{"label": "Pricing", "category": "sales"}]
+
+        def worker():
+            for _ in range(10):
+                db.award_xp(user["id"], 5, stats={"total_checkins": 1})
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stored = db.get_user(user["id"])
+        assert (stored["xp"], stored["total_checkins"]) == (200, 40)
+        assert stored["badges"] == ["First Steps"]
+        assert db.get_leaderboard(1)[0]["id"] == user["id"]
+        assert db.get_community_stats()["most_active_users"][0]["id"] == user["id"]
+    print("✓ SQLite writes and XP increments are consistent")
+
+
+def test_transaction_rollback_and_events():
+    """A failed transaction leaves no rows and publishes nothing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        feed = ChangeFeed()
+        db = _make_db(tmp, change_feed=feed)
+        subscription = feed.subscribe()
+        before = len(db.get_all_active_needs())
+        try:
+            with db.transaction():
+                db.create_need("u001", "Pricing strategy", "sales")
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert len(db.get_all_active_needs()) == before
+        assert subscription.events.empty()
+
+        created = db.create_needs_and_learnings("u001", [{"label": "Hiring", "category": "hiring"}],
+                                                [{"label": "SEO", "category": "marketing"}])
+        assert [subscription.events.get_nowait()["table"] for _ in range(2)] == ["needs", "learnings"]
+        assert db.get_need(created["needs"][0]["id"])["label"] == "Hiring"
+    print("✓ Rolled back writes never reach the database or the change feed")
+
+
+if __name__ == "__main__":
+    test_reads_match_json_backend()
+    test_writes_and_gamification()
+    test_transaction_rollback_and_events()
+    print("✅ SQLite backend tests passed!")
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Test script for the Supabase DatabaseManager against an in-memory fake client
+"""
+
+import os
+import re
+from types import SimpleNamespace
+
+import db_manager_supabase
+from gamification import apply_increment
+from postgrest.exceptions import APIError
+
+# NOT NULL columns of match_suggestions: partial rows are rejected like Postgres would
+MATCH_COLUMNS = {"id", "need_id", "need_user_id", "expert_user_id", "score", "reason", "status", "created_at"}
+
+
+def check_match_row(client, row):
+    """Enforce the NOT NULL columns and the unique (need_id, expert_user_id) pair"""
+    missing = MATCH_COLUMNS - {column for column, value in row.items() if value is not None}
+    if missing:
+        raise APIError({"code": "23502", "message": f"null value in columns {sorted(missing)}"})
+    if any((m["need_id"], m["expert_user_id"]) == (row["need_id"], row["expert_user_id"])
+           for m in client.tables.setdefault("match_suggestions", [])):
+        raise APIError({"code": "23505", "message": "duplicate key match_suggestions_need_expert_key"})
+
+
+class FakeQuery:
+    """Just enough of the PostgREST query builder, backed by dicts"""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = []
+        self.payload = None
+        self.inserted = None
+        self.deleting = False
+        self.ordering = []
+        self.row_limit = None
+
+    def select(self, *_):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def or_(self, expression):
+        # Only the keyset filter get_page builds is understood
+        created_at, _, row_id = re.fullmatch(
+            r'created_at\.gt\."(.*)",and\(created_at\.eq\."(.*)",id\.gt\."(.*)"\)', expression
+        ).groups()
+        self.filters.append(lambda row: (row["created_at"], row["id"]) > (created_at, row_id))
+        return self
+
+    def order(self, column):
+        self.ordering.append(column)
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def update(self, payload):
+        self.payload = payload
+        return self
+
+    def insert(self, rows):
+        self.inserted = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def delete(self):
+        self.deleting = True
+        return self
+
+    def execute(self):
+        if self.inserted is not None:
+            if self.table == "match_suggestions":
+                for row in self.inserted:
+                    check_match_row(self.client, row)
+            self.client.inserts.append((self.table, len(self.inserted)))
+            self.client.tables.setdefault(self.table, []).extend(dict(row) for row in self.inserted)
+            return SimpleNamespace(data=[dict(row) for row in self.inserted])
+        rows = [row for row in self.client.tables[self.table] if all(f(row) for f in self.filters)]
+        if self.ordering:
+            rows.sort(key=lambda row: tuple(row[column] for column in self.ordering))
+        if self.row_limit is not None:
+            rows = rows[:self.row_limit]
+        if self.deleting:
+            self.client.tables[self.table] = [row for row in self.client.tables[self.table] if row not in rows]
+        elif self.payload is not None:
+            self.client.updates.append((self.table, self.payload))
+            for row in rows:
+                row.update(self.payload)
+        else:
+            self.client.reads += 1
+        return SimpleNamespace(data=[dict(row) for row in rows])
+
+
+class FakeClient:
+    def __init__(self, tables, has_rpc=True):
+        self.tables = tables
+        self.has_rpc = has_rpc
+        self.reads = 0
+        self.rpc_calls = 0
+        self.inserts = []
+        self.updates = []
+        self.rpc_rows = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        """Emulates the functions in supabase_functions.sql"""
+        if not self.has_rpc:
+            raise APIError({"code": "PGRST202", "message": f"Could not find the function public.{name}"})
+        self.rpc_calls += 1
+        if name == "upsert_match_suggestions":
+            return SimpleNamespace(execute=lambda: SimpleNamespace(data=self._upsert_matches(params["p_rows"])))
+        user = next(u for u in self.tables["users"] if u["id"] == params["p_user_id"])
+        updates, result = apply_increment(user, params["p_xp"], params["p_stats"])
+        user.update(updates)
+        data = {**result, "user": dict(user)}
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=data))
+
+    def _upsert_matches(self, rows):
+        """INSERT ... ON CONFLICT (need_id, expert_user_id) DO UPDATE SET score, reason"""
+        self.rpc_rows.append(rows)
+        stored = self.tables.setdefault("match_suggestions", [])
+        result = []
+        for row in rows:
+            existing = next((m for m in stored if (m["need_id"], m["expert_user_id"])
+                             == (row["need_id"], row["expert_user_id"])), None)
+            if existing:
+                existing.update(score=row["score"], reason=row["reason"])
+                result.append({"suggestion": dict(existing), "inserted": False})
+            else:
+                check_match_row(self, row)
+                stored.append(dict(row))
+                result.append({"suggestion": dict(row), "inserted": True})
+        return result
+
+
+def make_db(has_rpc=True):
+    client = FakeClient({
+        "users": [{"id": "u1", "name": "Ada", "xp": 90}, {"id": "u2", "name": "Linus"}],
+        "needs": [{"id": "n1", "user_id": "u1", "label": "Hiring", "category": "hiring"}]
+    }, has_rpc=has_rpc)
+    os.environ.setdefault("SUPABASE_URL", "http://localhost")
+    os.environ.setdefault("SUPABASE_KEY", "test")
+    original = db_manager_supabase.create_client
+    db_manager_supabase.create_client = lambda url, key: client
+    try:
+        return db_manager_supabase.DatabaseManager(), client
+    finally:
+        db_manager_supabase.create_client = original
+
+
+def test_rows_fetched_once_per_scope():
+    """Repeated reads hit the cache and writes refresh it"""
+    db, client = make_db()
+    with db.identity_map():
+        assert db.get_user("u1") is db.get_user("u1")
+        assert client.reads == 1
+
+        result = db.award_xp("u1", 10)
+        db.update_user_stats("u1", "total_checkins")
+        user = db.get_user("u1")
+        assert client.reads == 1
+        assert client.rpc_calls == 2
+        assert result["total_xp"] == 100
+        assert (user["xp"], user["total_checkins"], user["badges"]) == (100, 1, ["First Steps"])
+
+        users = db.get_users_by_ids(["u1", "u2"])
+        assert {u["id"] for u in users} == {"u1", "u2"}
+        assert client.reads == 2
+        db.get_user("u2")
+        assert client.reads == 2
+
+    db.get_user("u1")
+    db.get_user("u1")
+    assert client.reads == 4
+    print("✓ Identity map fetches each row once per scope")
+
+
+def test_scopes_nest():
+    """Inner scopes share the outer map instead of starting fresh"""
+    db, client = make_db()
+    with db.identity_map():
+        db.get_need("n1")
+        with db.identity_map():
+            db.get_need("n1")
+        db.get_need("n1")
+    assert client.reads == 1
+    print("✓ Nested identity map scopes share one cache")
+
+
+def test_increment_falls_back_without_rpc():
+    """Databases without increment_user still get correct increments"""
+    db, client = make_db(has_rpc=False)
+    result = db.award_xp("u1", 20, stats={"total_checkins": 1})
+    assert result["new_badges"] == ["First Steps"]
+    assert db._increment_rpc_available is False
+    db.update_user_stats("u1", "total_checkins")
+    assert client.tables["users"][0]["total_checkins"] == 2
+    print("✓ Increments fall back to read-modify-write without the RPC")
+
+
+def test_batched_inserts():
+    """A check-in with 3 needs and 3 learnings makes 2 inserts, not 6"""
+    db, client = make_db()
+    items = [{"label": f"Item {i}", "category": "other"} for i in range(3)]
+    created = db.create_needs_and_learnings("u1", items, items)
+    assert client.inserts == [("needs", 3), ("learnings", 3)]
+    assert len(created["needs"]) == 3 and created["needs"][0]["id"].startswith("n")
+
+    # Queued rows are flushed before any other query, so reads see them
+    with db.batch_writes():
+        need = db.create_need("u1", "Pricing", "sales")
+        assert client.inserts[-1] == ("learnings", 3)
+        assert db.get_need(need["id"])["label"] == "Pricing"
+        assert client.inserts[-1] == ("needs", 1)
+
+    # A failing block drops its queued inserts
+    try:
+        with db.batch_writes():
+            db.create_need("u1", "Never sent", "other")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert all(n["label"] != "Never sent" for n in client.tables["needs"])
+    print("✓ batch_writes groups inserts per table")
+
+
+def test_create_matches_bulk_upsert():
+    """Re-runs never duplicate pairs or overwrite status, with or without the RPC"""
+    for has_rpc in (True, False):
+        db, client = make_db(has_rpc=has_rpc)
+        client.tables["match_suggestions"] = []
+        candidates = [
+            {"need_id": "n1", "need_user_id": "u1", "expert_user_id": "u2", "score": 0.5, "reason": "first"}
+        ]
+        created = db.create_matches_bulk(candidates, upsert=True)
+        assert created[0]["status"] == "pending"
+
+        # Another writer accepts the match; a re-run must not overwrite that
+        client.tables["match_suggestions"][0]["status"] = "accepted"
+        candidates[0].update(score=0.8, reason="second")
+        again = db.create_matches_bulk(candidates + candidates, upsert=True)
+        assert [m["id"] for m in again] == [created[0]["id"]]
+        assert len(client.tables["match_suggestions"]) == 1
+        assert client.tables["match_suggestions"][0]["reason"] == "second"
+        assert client.tables["match_suggestions"][0]["status"] == "accepted"
+        if has_rpc:
+            # One statement per batch, full rows keyed on the pair
+            assert client.inserts == [] and len(client.rpc_rows) == 2
+            assert len(client.rpc_rows[1]) == 1
+        else:
+            assert client.inserts == [("match_suggestions", 1)]
+            assert client.updates == [("match_suggestions", {"score": 0.8, "reason": "second"})]
+            assert db._upsert_matches_rpc_available is False
+
+        mixed = [dict(candidates[0], score=0.9), dict(candidates[0], expert_user_id="u3")]
+        assert len(db.create_matches_bulk(mixed, upsert=True)) == 2
+        assert len(client.tables["match_suggestions"]) == 2
+
+        with db.identity_map():
+            assert db.get_match(created[0]["id"])
+            removed = db.delete_matches([created[0]["id"]])
+            assert [m["id"] for m in removed] == [created[0]["id"]]
+            assert db.get_match(created[0]["id"]) is None
+        assert [m["expert_user_id"] for m in client.tables["match_suggestions"]] == ["u3"]
+    print("✓ create_matches_bulk upserts on (need_id, expert_user_id); delete_matches removes")
+
+
+def test_match_rows_are_complete():
+    """The fake rejects duplicate pairs and partial rows like the real constraints"""
+    db, client = make_db()
+    match = {"need_id": "n1", "need_user_id": "u1", "expert_user_id": "u2", "score": 0.5, "reason": "r"}
+    db.create_matches_bulk([match])
+    writes = [
+        lambda: db.create_matches_bulk([match]),
+        lambda: client.table("match_suggestions").insert({"id": "m1", "score": 0.5, "reason": "r"}).execute(),
+    ]
+    for write, code in zip(writes, ("23505", "23502")):
+        try:
+            write()
+            assert False, "constraint violation should raise"
+        except APIError as e:
+            assert e.code == code
+    assert len(client.tables["match_suggestions"]) == 1
+    print("✓ Fake client enforces NOT NULL columns and the unique pair")
+
+
+def test_get_page_keyset():
+    """Pages follow (created_at, id) and resume strictly after the cursor"""
+    db, client = make_db()
+    client.tables["needs"] = [
+        {"id": f"n{i}", "user_id": "u1", "status": "active" if i != 2 else "resolved",
+         "created_at": "2025-01-01T00:00:00Z" if i < 3 else f"2025-01-0{i}T00:00:00Z"}
+        for i in range(5)
+    ]
+    first = db.get_page("needs", 2, status="active")
+    assert [n["id"] for n in first] == ["n0", "n1"]
+    rest = db.get_page("needs", 10, after=(first[-1]["created_at"], first[-1]["id"]), status="active")
+    assert [n["id"] for n in rest] == ["n3", "n4"]
+    print("✓ get_page pages by (created_at, id)")
+
+
+if __name__ == "__main__":
+    test_rows_fetched_once_per_scope()
+    test_scopes_nest()
+    test_increment_falls_back_without_rpc()
+    test_batched_inserts()
+    test_create_matches_bulk_upsert()
+    test_match_rows_are_complete()
+    test_get_page_keyset()
+    print("✅ Supabase DatabaseManager tests passed!")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the memory-mapped embedding matrix
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from embedding_matrix import EmbeddingMatrix
+from vector_index import FlatIndex
+
+
+def test_round_trip_is_memory_mapped():
+    """Saved vectors come back normalized, row-aligned and memory-mapped"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingMatrix(os.path.join(tmp, "founders"))
+        assert store.load() is None
+
+        vectors = np.array([[3, 4], [0, 2]], dtype=np.float32)
+        store.save(["f1", "f2"], vectors, meta={"model": "fake"})
+        ids, matrix, meta = store.load()
+
+        assert ids == ["f1", "f2"]
+        assert meta == {"model": "fake"}
+        assert isinstance(matrix, np.memmap)
+        assert not matrix.flags.writeable
+        assert np.allclose(matrix, [[0.6, 0.8], [0, 1]])
+        assert os.listdir(tmp) == ["founders.npy"]
+    print("✓ Embedding matrix round-trips through a read-only memory map")
+
+
+def test_damaged_artifact_is_ignored():
+    """Plain .npy files, corrupted rows and torn writes count as missing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingMatrix(os.path.join(tmp, "founders"))
+        store.save(["f1", "f2"], np.eye(2, dtype=np.float32))
+        with open(store.matrix_path, "rb") as f:
+            good = f.read()
+        # The 2x2 float32 rows sit right before the JSON trailer
+        rows_start = good.index(b'{"ids"') - 16
+
+        corrupted = bytearray(good)
+        corrupted[rows_start] ^= 0xFF
+        for damaged in (bytes(corrupted), good[:-5], good[:rows_start + 4]):
+            with open(store.matrix_path, "wb") as f:
+                f.write(damaged)
+            assert store.load() is None
+
+        np.save(store.matrix_path, np.eye(2, dtype=np.float32))
+        assert store.load() is None
+    print("✓ Damaged or foreign matrix files are treated as missing")
+
+
+def test_failed_save_leaves_no_temp_files():
+    """A save that fails midway keeps the old artifact and removes its temp files"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingMatrix(os.path.join(tmp, "founders"))
+        store.save(["f1", "f2"], np.eye(2, dtype=np.float32))
+        before = sorted(os.listdir(tmp))
+        try:
+            store.save(["f1"], np.ones((1, 2), dtype=np.float32), meta={"bad": object()})
+            assert False, "unserializable meta should raise"
+        except TypeError:
+            pass
+        assert sorted(os.listdir(tmp)) == before
+        assert store.load()[0] == ["f1", "f2"]
+    print("✓ Failed save cleans up its temp files")
+
+
+def test_flat_index_over_mapped_matrix():
+    """FlatIndex searches a mapped matrix in place and copies it only on write"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingMatrix(os.path.join(tmp, "founders"))
+        store.save(["f1", "f2", "f3"], np.eye(3, dtype=np.float32))
+        ids, matrix, _ = store.load()
+
+        index = FlatIndex.from_matrix(ids, matrix)
+        assert index.search(np.array([0, 1, 0], dtype=np.float32), 1)[0][0] == "f2"
+        assert np.shares_memory(index.vectors, matrix)
+
+        index.add(["f4"], np.array([[1, 1, 0]], dtype=np.float32))
+        index.remove(["f1"])
+        assert len(index) == 3 and "f4" in index
+        assert np.allclose(matrix, np.eye(3))
+    print("✓ Flat index wraps the mapped matrix without copying")
+
+
+if __name__ == "__main__":
+    test_round_trip_is_memory_mapped()
+    test_damaged_artifact_is_ignored()
+    test_failed_save_leaves_no_temp_files()
+    test_flat_index_over_mapped_matrix()
+    print("✅ Embedding matrix tests passed!")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk enrichment of related rows
+"""
+
+from db_manager import DatabaseManager
+from enrichment import enrich
+
+
+class CountingDB:
+    """Wraps a DatabaseManager and counts bulk fetches"""
+
+    def __init__(self, db):
+        self.db = db
+        self.calls = []
+
+    def get_users_by_ids(self, ids):
+        self.calls.append(("users", sorted(ids)))
+        return self.db.get_users_by_ids(ids)
+
+    def get_needs_by_ids(self, ids):
+        self.calls.append(("needs", sorted(ids)))
+        return self.db.get_needs_by_ids(ids)
+
+
+def test_enrich_fetches_each_table_once():
+    """Every relation is resolved with a single query per table"""
+    db = DatabaseManager("database.json")
+    counting = CountingDB(db)
+    matches = db.get_all_matches()
+
+    enriched = enrich(counting, matches, {
+        "requester": ("need_user_id", "users"),
+        "expert": ("expert_user_id", "users"),
+        "need": ("need_id", "needs")
+    })
+
+    assert [table for table, _ in counting.calls] == ["users", "needs"]
+    assert len(enriched) == len(matches)
+    for match, row in zip(matches, enriched):
+        assert row["id"] == match["id"]
+        assert row["expert"] == db.get_user(match["expert_user_id"])
+        assert row["need"] == db.get_need(match["need_id"])
+        assert "expert" not in match
+    print("✓ Enrichment uses one bulk query per table")
+
+
+def test_enrich_missing_and_empty():
+    """Unknown ids enrich to None and empty inputs skip the database"""
+    counting = CountingDB(DatabaseManager("database.json"))
+    assert enrich(counting, [], {"user": ("user_id", "users")}) == []
+    assert counting.calls == []
+
+    rows = enrich(counting, [{"id": "x", "user_id": "missing"}], {"user": ("user_id", "users")})
+    assert rows[0]["user"] is None
+    print("✓ Missing records enrich to None")
+
+
+if __name__ == "__main__":
+    test_enrich_fetches_each_table_once()
+    test_enrich_missing_and_empty()
+    print("✅ Enrichment tests passed!")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM extraction cache
+"""
+
+import os
+import tempfile
+import time
+
+from extraction_cache import ExtractionCache, cache_key
+
+RESULT = {"needs": [{"label": "Hiring", "category": "hiring"}], "learnings": []}
+
+
+def test_key_normalizes_text_and_includes_version():
+    """Whitespace differences share a key; model and prompt version do not"""
+    assert cache_key("  Need help\n with  hiring ", "m", "1") == cache_key("Need help with hiring", "m", "1")
+    assert cache_key("text", "m", "1") != cache_key("text", "m", "2")
+    assert cache_key("text", "m", "1") != cache_key("text", "other", "1")
+    print("✓ Cache keys normalize text and include model and prompt version")
+
+
+def test_memory_lru_and_ttl():
+    """Hits return copies; the least recently used entry and expired entries go"""
+    cache = ExtractionCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", "m", "1", RESULT)
+    hit = cache.get("a", "m", "1")
+    assert hit == RESULT
+    hit["needs"].clear()
+    assert cache.get("a", "m", "1") == RESULT
+
+    cache.put("b", "m", "1", RESULT)
+    cache.get("a", "m", "1")
+    cache.put("c", "m", "1", RESULT)
+    assert cache.get("b", "m", "1") is None
+    assert cache.get("a", "m", "1") == RESULT
+
+    expiring = ExtractionCache(ttl_seconds=0)
+    expiring.put("a", "m", "1", RESULT)
+    time.sleep(0.01)
+    assert expiring.get("a", "m", "1") is None
+    print("✓ Memory tier evicts by LRU and TTL")
+
+
+def test_disk_tier_shared_between_caches():
+    """A second cache (another worker or a restart) reads the disk tier"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "extractions.sqlite3")
+        ExtractionCache(path=path).put("retry me", "m", "1", RESULT)
+
+        other = ExtractionCache(path=path)
+        assert other.get("retry   me", "m", "1") == RESULT
+        assert other.stats()["entries"] == 1
+
+        capped = ExtractionCache(path=path, max_disk_entries=1)
+        capped.put("newer", "m", "1", RESULT)
+        assert ExtractionCache(path=path).get("retry me", "m", "1") is None
+    print("✓ Disk tier is shared and capped")
+
+
+if __name__ == "__main__":
+    test_key_normalizes_text_and_includes_version()
+    test_memory_lru_and_ttl()
+    test_disk_tier_shared_between_caches()
+    print("✅ Extraction cache tests passed!")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for the founder embedding artifact
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from embedding_matrix import EmbeddingMatrix
+from founder_embeddings import founder_text, load_founders, load_or_build
+
+
+def _founder(founder_id, bio):
+    return {"id": founder_id, "name": founder_id.upper(), "company": "Co",
+            "expertise": ["ml"], "helpfulIn": ["hiring"], "bio": bio}
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+def test_artifact_reused_and_updated_incrementally():
+    """Unchanged input encodes nothing; edits re-encode only changed founders"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "founders_db.json")
+        matrix = EmbeddingMatrix(os.path.join(tmp, "founder_embeddings"))
+        encode = CountingEncoder()
+
+        founders = [_founder("f1", "short"), _founder("f2", "a much longer bio")]
+        with open(path, "w") as f:
+            json.dump({"founders": founders}, f)
+        data, source_hash = load_founders(path)
+
+        ids, first = load_or_build(data["founders"], source_hash, matrix, "model-a", encode)
+        assert ids == ["f1", "f2"] and len(encode.batches) == 1
+        first = np.array(first)
+
+        load_or_build(data["founders"], source_hash, matrix, "model-a", encode)
+        assert len(encode.batches) == 1
+
+        founders[1] = _founder("f2", "edited")
+        founders.append(_founder("f3", "new founder"))
+        with open(path, "w") as f:
+            json.dump({"founders": founders}, f)
+        data, new_hash = load_founders(path)
+        assert new_hash != source_hash
+
+        ids, vectors = load_or_build(data["founders"], new_hash, matrix, "model-a", encode)
+        assert ids == ["f1", "f2", "f3"]
+        assert encode.batches[-1] == [founder_text(founders[1]), founder_text(founders[2])]
+        assert np.allclose(vectors[0], first[0])
+
+        load_or_build(data["founders"], new_hash, matrix, "model-b", encode)
+        assert len(encode.batches[-1]) == 3
+    print("✓ Founder artifact is reused and re-encoded only where needed")
+
+
+if __name__ == "__main__":
+    test_artifact_reused_and_updated_incrementally()
+    print("✅ Founder embedding tests passed!")
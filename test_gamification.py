@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script for XP levels, badges and atomic user increments
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+
+from db_manager import DatabaseManager
+from gamification import apply_increment, level_for_xp
+
+
+def test_apply_increment():
+    """XP, level, badges and counters are computed in one step"""
+    user = {"id": "u1", "xp": 480, "level": 4, "badges": ["First Steps"], "total_chats": 2}
+    updates, result = apply_increment(user, 30, {"total_chats": 1})
+    assert updates["xp"] == 510
+    assert updates["level"] == level_for_xp(510)
+    assert updates["badges"] == ["First Steps", "Rising Star"]
+    assert updates["total_chats"] == 3
+    assert result["new_badges"] == ["Rising Star"]
+    assert user["badges"] == ["First Steps"]
+
+    try:
+        apply_increment(user, 0, {"is_admin": 1})
+        assert False, "unknown stats must be rejected"
+    except ValueError:
+        pass
+    print("✓ Increments compute level, badges and counters")
+
+
+def test_json_backend_increments_are_atomic():
+    """Concurrent awards on the JSON backend never lose updates"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "database.json")
+        shutil.copy("database.json", path)
+        db = DatabaseManager(path)
+        user = db.get_all_users()[0]
+        start_xp = user.get("xp", 0)
+        start_checkins = user.get("total_checkins", 0)
+
+        def worker():
+            for _ in range(10):
+                db.award_xp(user["id"], 5, stats={"total_checkins": 1})
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        reloaded = DatabaseManager(path).get_user(user["id"])
+        assert reloaded["xp"] == start_xp + 400
+        assert reloaded["total_checkins"] == start_checkins + 80
+        assert reloaded["level"] == level_for_xp(reloaded["xp"])
+    print("✓ JSON backend increments survive concurrent writers")
+
+
+if __name__ == "__main__":
+    test_apply_increment()
+    test_json_backend_increments_are_atomic()
+    print("✅ Gamification tests passed!")
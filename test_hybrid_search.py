@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for hybrid (keyword + semantic) founder ranking
+"""
+
+import numpy as np
+
+from hybrid_search import HybridRanker, reciprocal_rank_fusion, weighted_fusion
+from keyword_index import FounderKeywordSearch
+from vector_index import FlatIndex
+
+FOUNDERS = [
+    {"id": "f1", "name": "A", "expertise": ["fundraising"], "helpfulIn": ["pitch decks"], "bio": "", "industry": "fintech"},
+    {"id": "f2", "name": "B", "expertise": ["kubernetes"], "helpfulIn": ["mlops"], "bio": "", "industry": "ai"},
+    {"id": "f3", "name": "C", "expertise": ["design"], "helpfulIn": ["branding"], "bio": "", "industry": "consumer"},
+]
+
+# Semantic side: f3 is "closest" to every query, f2 second
+VECTORS = np.array([[0.0, 0.0, 1.0], [0.0, 1.0, 0.2], [1.0, 0.2, 0.0]], dtype=np.float32)
+
+
+def _ranker(**kwargs):
+    index = FlatIndex.from_matrix(["f1", "f2", "f3"], VECTORS / np.linalg.norm(VECTORS, axis=1, keepdims=True))
+    return HybridRanker(FounderKeywordSearch(FOUNDERS), vector_index=lambda: index,
+                        encode=lambda texts: np.array([[1.0, 0.5, 0.0]]), **kwargs)
+
+
+def test_fusion_functions():
+    """RRF rewards ids ranked well by several sources; weighted fusion normalizes scores"""
+    fused = reciprocal_rank_fusion({"keyword": ["a", "b"], "semantic": ["b", "c"]})
+    assert fused[0][0] == "b"
+    assert weighted_fusion({"keyword": [("a", 10.0), ("b", 5.0)], "semantic": [("b", 0.9), ("a", 0.1)]},
+                           {"keyword": 1.0, "semantic": 2.0})[0][0] == "b"
+    print("✓ RRF and weighted fusion combine rankings")
+
+
+def test_hybrid_combines_both_sources():
+    """A keyword hit that is also semantically close beats either alone"""
+    results = _ranker().search("kubernetes", 3)
+    assert [r["founder"]["id"] for r in results][:1] == ["f2"]
+    assert results[0]["keyword_score"] is not None and results[0]["semantic_score"] is not None
+    assert {r["founder"]["id"] for r in results} == {"f1", "f2", "f3"}
+
+    weighted = _ranker(fusion="weighted", weights={"keyword": 0.0, "semantic": 1.0}).search("kubernetes", 1)
+    assert weighted[0]["founder"]["id"] == "f3"
+    print("✓ Hybrid ranking fuses keyword and semantic candidates")
+
+
+def test_reranker_and_keyword_fallback():
+    """A reranker reorders results; a failing model degrades to keywords only"""
+    reversed_ranker = _ranker(reranker=lambda query, results: list(reversed(results)))
+    assert reversed_ranker.search("kubernetes", 3)[-1]["founder"]["id"] == "f2"
+
+    def broken(texts):
+        raise RuntimeError("model missing")
+
+    ranker = HybridRanker(FounderKeywordSearch(FOUNDERS), vector_index=lambda: None, encode=broken)
+    results = ranker.search("fundraising", 5)
+    assert [r["founder"]["id"] for r in results] == ["f1"]
+    assert not ranker.semantic_enabled
+    print("✓ Reranker applies and semantic failures fall back to keywords")
+
+
+def test_semantic_recovers_after_failure():
+    """A transient failure only affects queries until the retry delay passes"""
+    calls = []
+
+    def flaky(texts):
+        calls.append(texts)
+        if len(calls) == 1:
+            raise RuntimeError("Embedding model is still loading")
+        return np.array([[1.0, 0.5, 0.0]])
+
+    waiting = _ranker()
+    waiting.encode = flaky
+    assert waiting.search("kubernetes", 3)[0]["semantic_score"] is None
+    assert waiting.search("kubernetes", 3)[0]["semantic_score"] is None
+    assert len(calls) == 1 and not waiting.semantic_enabled
+
+    calls.clear()
+    retrying = _ranker(retry_seconds=0)
+    retrying.encode = flaky
+    assert retrying.search("kubernetes", 3)[0]["semantic_score"] is None
+    assert retrying.search("kubernetes", 3)[0]["semantic_score"] is not None
+    assert retrying.semantic_enabled and retrying.semantic_error is None
+    print("✓ Semantic search is retried after a backoff")
+
+
+if __name__ == "__main__":
+    test_fusion_functions()
+    test_hybrid_combines_both_sources()
+    test_reranker_and_keyword_fallback()
+    test_semantic_recovers_after_failure()
+    print("✅ Hybrid search tests passed!")
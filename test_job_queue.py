@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the background job queue
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from job_queue import JobQueue, run_stages
+
+
+def stage_double(ctx):
+    ctx["value"] = ctx["value"] * 2
+
+
+def stage_respond(ctx):
+    ctx["response"] = {"value": ctx["value"]}
+
+
+def stage_fail(ctx):
+    raise RuntimeError("extraction exploded")
+
+
+@contextmanager
+def record_scope():
+    SCOPE_EVENTS.append("enter")
+    yield
+    SCOPE_EVENTS.append("exit")
+
+
+SCOPE_EVENTS = []
+
+
+def _wait(queue, job_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_thread_backend():
+    """Jobs run in the background and expose their result and errors"""
+    queue = JobQueue(max_workers=2)
+    try:
+        job_id = queue.submit([("double", stage_double), ("respond", stage_respond)], {"value": 21}, owner="u1")
+        job = _wait(queue, job_id)
+        assert job["status"] == "completed"
+        assert job["result"] == {"value": 42}
+        assert job["owner"] == "u1"
+
+        failed = _wait(queue, queue.submit([("fail", stage_fail)], {}))
+        assert failed["status"] == "failed"
+        assert "exploded" in failed["error"]
+        assert queue.get("missing") is None
+    finally:
+        queue.shutdown()
+    print("✓ Thread backend runs stages and reports failures")
+
+
+def test_process_backend():
+    """The local-process backend runs the same module-level stages"""
+    queue = JobQueue(max_workers=1, backend="process")
+    try:
+        job = _wait(queue, queue.submit([("double", stage_double), ("respond", stage_respond)], {"value": 5}), timeout=30)
+        assert job["result"] == {"value": 10}
+    finally:
+        queue.shutdown()
+    print("✓ Process backend runs stages")
+
+
+def test_scope_wraps_pipeline():
+    """A scope is entered once around all stages"""
+    del SCOPE_EVENTS[:]
+    ctx = run_stages([("double", stage_double), ("double", stage_double)], {"value": 1}, scope=record_scope)
+    assert ctx["value"] == 4
+    assert SCOPE_EVENTS == ["enter", "exit"]
+    print("✓ Pipeline scope wraps every stage")
+
+
+def test_shared_job_store():
+    """With store_path, another queue (another worker) can report the job"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.sqlite3")
+        queue = JobQueue(max_workers=1, store_path=path)
+        other_worker = JobQueue(max_workers=1, store_path=path)
+        try:
+            job_id = queue.submit([("double", stage_double), ("respond", stage_respond)], {"value": 4}, owner="u1")
+            _wait(queue, job_id)
+            job = other_worker.get(job_id)
+            assert job["status"] == "completed"
+            assert job["owner"] == "u1"
+            assert job["result"] == {"value": 8}
+            assert "_finished" not in job
+            assert other_worker.get("missing") is None
+        finally:
+            queue.shutdown()
+            other_worker.shutdown()
+    print("✓ SQLite job store is shared between queues")
+
+
+if __name__ == "__main__":
+    test_thread_backend()
+    test_process_backend()
+    test_scope_wraps_pipeline()
+    test_shared_job_store()
+    print("✅ Job queue tests passed!")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the BM25 keyword index
+"""
+
+import json
+
+from keyword_index import FounderKeywordSearch, KeywordIndex, founder_profile_text, tokenize
+
+
+def test_bm25_ranking():
+    """Rarer terms and shorter documents rank higher; non-matches are absent"""
+    index = KeywordIndex()
+    index.add("a", "fundraising fundraising seed")
+    index.add("b", "fundraising hiring sales marketing product design")
+    index.add("c", "hiring")
+
+    results = index.search("fundraising")
+    assert [doc_id for doc_id, _ in results] == ["a", "b"]
+    assert index.search("seed hiring", 1)[0][0] in ("a", "c")
+    assert index.search("nothing here") == []
+    assert tokenize("Machine-Learning, B2B!") == ["machine", "learning", "b2b"]
+    print("✓ BM25 ranks documents sharing query terms")
+
+
+def test_updates_and_removal():
+    """Re-adding a document replaces its postings; removal drops them"""
+    index = KeywordIndex()
+    index.add("a", "mobile apps")
+    index.add("a", "fintech payments")
+    assert index.search("mobile") == []
+    assert index.search("fintech")[0][0] == "a"
+
+    index.remove("a")
+    assert len(index) == 0 and index.postings == {}
+    print("✓ Index stays consistent through updates and removals")
+
+
+def _substring_filter(founders, query):
+    """The pre-index filter_by_expertise: phrase substring of either joined field"""
+    query = query.lower()
+    return [f["id"] for f in founders
+            if query in " ".join(f["expertise"]).lower() or query in " ".join(f["helpfulIn"]).lower()]
+
+
+def test_founder_search_on_database():
+    """search ranks with BM25 and filter_by_expertise keeps substring semantics on founders_db.json"""
+    with open("founders_db.json", "r") as f:
+        founders = json.load(f)["founders"]
+    search = FounderKeywordSearch(founders)
+
+    queries = ["ai", "fin", "learning machine", "product", "machine learning", "B2B", ""]
+    queries += [phrase for founder in founders for phrase in founder["expertise"] + founder["helpfulIn"]]
+    for query in queries:
+        assert [f["id"] for f in search.filter_by_expertise(query)] == _substring_filter(founders, query), query
+    assert search.filter_by_expertise("fin")
+    assert founders[0] in search.filter_by_expertise(founders[0]["expertise"][0].upper())
+
+    # search matches whole words only and orders by BM25, not raw substring counts
+    assert search.search("fin") == []
+    ranked = search.search("product", 3)
+    assert ranked and len(ranked) <= 3
+    assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+    assert all("product" in tokenize(founder_profile_text(founder)) for founder, _ in ranked)
+
+    expert = founders[0]
+    changed = dict(expert, expertise=["Underwater Basket Weaving"], helpfulIn=[])
+    search.upsert(changed)
+    assert search.filter_by_expertise("basket weaving") == [changed]
+    assert search.filter_by_expertise("asket weav") == [changed]
+    search.remove(changed["id"])
+    assert search.filter_by_expertise("basket") == []
+    print("✓ Founder keyword search ranks, filters and updates")
+
+if __name__ == "__main__":
+    test_bm25_ranking()
+    test_updates_and_removal()
+    test_founder_search_on_database()
+    print("✅ Keyword index tests passed!")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Test script for the batched matching engine
+"""
+
+import os
+import tempfile
+import zlib
+
+import numpy as np
+
+from embedding_store import EmbeddingStore
+from matching_engine import MatchingEngine
+from vector_index import FlatIndex
+
+
+class CountingModel:
+    """Tiny stand-in for SentenceTransformer: bag-of-words vectors"""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), 64), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[i, hash(word) % 64] += 1.0
+        return vectors
+
+
+class RandomModel:
+    """Deterministic pseudo-random vector per label"""
+
+    def encode(self, texts):
+        return np.stack([np.random.default_rng(zlib.crc32(t.encode())).normal(size=16) for t in texts])
+
+
+NEEDS = [
+    {"id": "n1", "user_id": "u1", "label": "ML deployment help", "category": "technical"},
+    {"id": "n2", "user_id": "u2", "label": "fundraising pitch deck", "category": "fundraising"},
+]
+
+LEARNINGS = [
+    {"id": "l1", "user_id": "u2", "label": "Scaled ML deployment to production", "category": "technical"},
+    {"id": "l2", "user_id": "u3", "label": "Built a pitch deck for fundraising", "category": "fundraising"},
+    {"id": "l3", "user_id": "u1", "label": "fundraising pitch deck", "category": "fundraising"},
+    {"id": "l4", "user_id": "u3", "label": "ML deployment help", "category": "technical"},
+]
+
+
+def test_single_batched_encode():
+    """All labels are encoded in one call, each distinct label once"""
+    model = CountingModel()
+    engine = MatchingEngine(model)
+    engine.compute_matches(NEEDS, LEARNINGS, limit=2)
+
+    assert len(model.calls) == 1
+    assert len(model.calls[0]) == len(set(model.calls[0]))
+    print("✓ One batched encode() call per compute_matches")
+
+
+def test_top_matches_and_self_exclusion():
+    """Top-k per need is ordered by score and never matches a user with themselves"""
+    engine = MatchingEngine(CountingModel())
+    result = engine.compute_matches(NEEDS, LEARNINGS, limit=2)
+
+    by_need = {}
+    for match in result["matches"]:
+        by_need.setdefault(match["need_id"], []).append(match)
+
+    assert [m["expert_user_id"] for m in by_need["n1"]][0] == "u3"
+    assert all(m["expert_user_id"] != "u1" for m in by_need["n1"])
+    assert all(m["expert_user_id"] != "u2" for m in by_need["n2"])
+    for matches in by_need.values():
+        scores = [m["score"] for m in matches]
+        assert scores == sorted(scores, reverse=True)
+        assert len(matches) <= 2
+    assert result["total_matches"] == len(result["matches"])
+    # Same shape as the MCP compute_matches tool has always returned
+    assert all(set(m) == {"need_id", "expert_user_id", "score", "reason", "matched_learning"}
+               for m in result["matches"])
+    print(f"✓ {result['total_matches']} matches, ordered and without self-matches")
+
+
+def test_empty_inputs():
+    """No needs or no learnings yields no matches"""
+    engine = MatchingEngine(CountingModel())
+    assert engine.compute_matches([], LEARNINGS)["total_matches"] == 0
+    assert engine.compute_matches(NEEDS, [])["total_matches"] == 0
+    print("✓ Empty inputs handled")
+
+
+def test_embedding_store_survives_restart():
+    """A fresh engine on the same store file does not re-encode known labels"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "embeddings.sqlite3")
+
+        first_model = CountingModel()
+        MatchingEngine(first_model, embedding_store=EmbeddingStore(path)).compute_matches(NEEDS, LEARNINGS)
+        assert len(first_model.calls) == 1
+
+        second_model = CountingModel()
+        store = EmbeddingStore(path)
+        engine = MatchingEngine(second_model, embedding_store=store)
+        engine.compute_matches(NEEDS, LEARNINGS)
+        assert second_model.calls == []
+
+        engine.warm(["brand new label"])
+        assert second_model.calls == [["brand new label"]]
+
+        other_model_store = EmbeddingStore(path, model_name="another-model")
+        assert other_model_store.get_many(["brand new label"]) == {}
+    print("✓ Cached embeddings reused across restarts, keyed by model")
+
+
+def test_incremental_matching():
+    """Only new rows are scored and stored lists are topped up, not duplicated"""
+    engine = MatchingEngine(CountingModel())
+    new_need = {"id": "n9", "user_id": "u9", "label": "ML deployment at scale", "category": "technical"}
+    new_learning = {"id": "l9", "user_id": "u9", "label": "fundraising pitch deck coaching", "category": "fundraising"}
+
+    result = engine.compute_incremental_matches(
+        [new_need], [new_learning], NEEDS + [new_need], LEARNINGS + [new_learning], limit=2
+    )
+    need_ids = {m["need_id"] for m in result["matches"]}
+    assert "n9" in need_ids and "n2" in need_ids
+    assert all(m["expert_user_id"] == "u9" for m in result["matches"] if m["need_id"] != "n9")
+    assert all(m["expert_user_id"] != "u9" for m in result["matches"] if m["need_id"] == "n9")
+
+    existing = [
+        {"need_id": "n2", "expert_user_id": "u3", "score": 5.0},
+        {"need_id": "n2", "expert_user_id": "u4", "score": 4.0},
+        {"need_id": "n1", "expert_user_id": "u9", "score": 0.1},
+    ]
+    selected = MatchingEngine.select_new_candidates(result["matches"], existing, limit=2)
+    assert all(m["need_id"] != "n2" for m in selected)
+    assert ("n1", "u9") not in {(m["need_id"], m["expert_user_id"]) for m in selected}
+    assert any(m["need_id"] == "n9" for m in selected)
+    print(f"✓ Incremental matching selected {len(selected)} new suggestions")
+
+
+def test_surplus_matches():
+    """Pending suggestions beyond each need's top `limit` are surplus; acted-on ones are kept"""
+    stored = [
+        {"id": "m1", "need_id": "n1", "score": 0.9, "status": "pending"},
+        {"id": "m2", "need_id": "n1", "score": 0.8, "status": "pending"},
+        {"id": "m3", "need_id": "n1", "score": 0.7, "status": "accepted"},
+        {"id": "m4", "need_id": "n1", "score": 0.6, "status": "pending"},
+        {"id": "m5", "need_id": "n1", "score": 0.1, "status": "declined"},
+        {"id": "m6", "need_id": "n2", "score": 0.1, "status": "pending"},
+    ]
+    assert [m["id"] for m in MatchingEngine.surplus_matches(stored, limit=3)] == ["m4"]
+    assert [m["id"] for m in MatchingEngine.surplus_matches(stored, limit=1)] == ["m2", "m4"]
+    print("✓ Surplus suggestions are the pending ones beyond the top limit")
+
+
+def test_incremental_matching_with_learning_index():
+    """The index path agrees with brute force and tracks deactivated learnings"""
+    new_need = {"id": "n9", "user_id": "u9", "label": "ML deployment at scale", "category": "technical"}
+    brute = MatchingEngine(CountingModel()).compute_incremental_matches(
+        [new_need], [], NEEDS + [new_need], LEARNINGS, limit=2
+    )
+    engine = MatchingEngine(CountingModel(), learning_index=FlatIndex())
+    indexed = engine.compute_incremental_matches([new_need], [], NEEDS + [new_need], LEARNINGS, limit=2)
+
+    def pairs(result):
+        return [(m["need_id"], m["expert_user_id"], m["score"]) for m in result["matches"]]
+
+    assert pairs(indexed) == pairs(brute)
+
+    remaining = [l for l in LEARNINGS if l["id"] != "l4"]
+    engine.compute_incremental_matches([new_need], [], NEEDS + [new_need], remaining, limit=2)
+    assert "l4" not in engine.learning_index
+    print("✓ Learning index matches brute force and drops inactive learnings")
+
+
+def test_flat_index_matches_brute_force():
+    """Own learnings filling the first candidates and the category bonus never change the result"""
+    categories = ["technical", "fundraising", "marketing"]
+    needs = [{"id": f"n{i}", "user_id": f"u{i % 4}", "label": f"need {i}", "category": categories[i % 3]}
+             for i in range(12)]
+    learnings = [{"id": f"l{i}", "user_id": f"u{i % 7}", "label": f"learning {i}", "category": categories[i % 3]}
+                 for i in range(150)]
+    # u0 knows exactly what it needs 20 times over: the top-15 cosine hits are all its own
+    learnings += [{"id": f"own{i}", "user_id": "u0", "label": "need 0", "category": "marketing"}
+                  for i in range(20)]
+
+    def pairs(result):
+        return sorted((m["need_id"], m["expert_user_id"], m["score"]) for m in result["matches"])
+
+    for limit in (1, 3, 5):
+        brute = MatchingEngine(RandomModel()).compute_matches(needs, learnings, limit=limit)
+        engine = MatchingEngine(RandomModel(), learning_index=FlatIndex())
+        indexed = engine.compute_incremental_matches(needs, [], needs, learnings, limit=limit)
+        assert pairs(indexed) == pairs(brute)
+        assert sum(m["need_id"] == "n0" for m in indexed["matches"]) == limit
+    print("✓ Flat-index check-in matches equal brute force")
+
+
+if __name__ == "__main__":
+    test_single_batched_encode()
+    test_top_matches_and_self_exclusion()
+    test_empty_inputs()
+    test_embedding_store_survives_restart()
+    test_incremental_matching()
+    test_surplus_matches()
+    test_incremental_matching_with_learning_index()
+    test_flat_index_matches_brute_force()
+    print("✅ Matching engine tests passed!")
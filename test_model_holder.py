@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the lazy / background embedding model holder
+"""
+
+import threading
+
+import numpy as np
+
+from model_holder import ModelHolder, ModelNotReady
+
+
+class FakeModel:
+    def encode(self, texts, **kwargs):
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+def test_background_load_gates_encode():
+    """encode() waits for a background load; status() reports readiness"""
+    release = threading.Event()
+    calls = []
+
+    def slow_loader(name):
+        calls.append(name)
+        release.wait(5)
+        return FakeModel()
+
+    holder = ModelHolder("fake-model", loader=slow_loader)
+    assert holder.status()["state"] == "idle"
+    holder.start().start()
+    assert holder.status()["state"] == "loading" and not holder.ready
+    try:
+        holder.get(timeout=0.01)
+        assert False, "model should not be ready yet"
+    except ModelNotReady:
+        pass
+
+    release.set()
+    assert holder.encode(["a", "b"]).shape == (2, 4)
+    assert holder.ready and calls == ["fake-model"]
+    assert "load_seconds" in holder.status()
+    print("✓ Background load gates encode until ready")
+
+
+def test_lazy_load_and_failure():
+    """Without start() the first use loads; failures surface to callers"""
+    holder = ModelHolder("fake-model", loader=lambda name: FakeModel())
+    assert holder.encode(["a"]).shape == (1, 4)
+
+    def broken(name):
+        raise OSError("weights missing")
+
+    failed = ModelHolder("broken", loader=broken)
+    try:
+        failed.encode(["a"])
+        assert False, "load error should propagate"
+    except ModelNotReady as e:
+        assert "weights missing" in str(e)
+    assert failed.status()["state"] == "failed"
+    print("✓ Lazy loading works and failures are reported")
+
+
+def test_after_fork_resets_inflight_load():
+    """A child forked mid-load loads again; a loaded model is kept"""
+    holder = ModelHolder("fake-model", loader=lambda name: FakeModel())
+    holder._state = "loading"  # the parent's load thread is gone in the child
+    holder._after_fork()
+    assert holder.status()["state"] == "idle"
+    assert holder.encode(["a"]).shape == (1, 4)
+
+    model = holder.get()
+    holder._after_fork()
+    assert holder.ready and holder.get() is model
+    print("✓ Fork resets an in-flight load and keeps a loaded model")
+
+
+if __name__ == "__main__":
+    test_background_load_gates_encode()
+    test_lazy_load_and_failure()
+    test_after_fork_resets_inflight_load()
+    print("✅ Model holder tests passed!")
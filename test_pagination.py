@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for keyset pagination (cursors, JSON and SQLite backends, list endpoints)
+"""
+
+import json
+import os
+import tempfile
+
+from db_manager import DatabaseManager as JSONDatabaseManager
+from db_manager_sqlite import DatabaseManager as SQLiteDatabaseManager
+from pagination import decode_cursor, encode_cursor, iter_pages, sort_key
+
+
+def _rows():
+    # Shared timestamps force the id tie-break
+    return [
+        {"id": f"m{i:02d}", "need_id": "n1", "need_user_id": "u1", "expert_user_id": "u2",
+         "status": "pending" if i % 3 else "accepted", "created_at": f"2025-01-{1 + i // 4:02d}T00:00:00Z"}
+        for i in reversed(range(10))
+    ]
+
+
+def test_cursor_round_trip():
+    """Cursors are opaque, URL-safe and reject garbage"""
+    row = {"id": "n1", "created_at": "2025-01-01T00:00:00.123Z"}
+    cursor = encode_cursor(row)
+    assert "/" not in cursor and "+" not in cursor
+    assert decode_cursor(cursor) == sort_key(row)
+    # Fields that would rewrite the PostgREST filter they are spliced into
+    injected = [
+        encode_cursor({"id": "n1", "created_at": '2025-01-01",id.gt."'}),
+        encode_cursor({"id": 'n1"),status.eq.(resolved', "created_at": "2025-01-01T00:00:00Z"}),
+    ]
+    assert decode_cursor(encode_cursor({"id": "n1"})) == ("", "n1")
+    for bad in ["not-a-cursor", encode_cursor({"id": "x"})[:-2] + "!!"] + injected:
+        try:
+            decode_cursor(bad)
+            assert False, "invalid cursor should raise"
+        except ValueError:
+            pass
+    print("✓ Cursors round-trip and reject garbage")
+
+
+def _check_backend(db):
+    expected = sorted(_rows(), key=sort_key)
+    pages = list(iter_pages(lambda after, size: db.get_page("match_suggestions", size, after), 3))
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+    assert [row["id"] for page in pages for row in page] == [row["id"] for row in expected]
+
+    accepted = db.get_page("match_suggestions", 100, status="accepted")
+    assert [row["id"] for row in accepted] == [row["id"] for row in expected if row["status"] == "accepted"]
+
+
+def test_backends_page_in_keyset_order():
+    """JSON and SQLite backends return identical keyset pages"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data = {"users": [], "needs": [], "learnings": [], "match_suggestions": _rows(),
+                "coffee_chats": [], "proposed_slots": []}
+        json_path = os.path.join(tmp, "db.json")
+        with open(json_path, "w") as f:
+            json.dump(data, f)
+        _check_backend(JSONDatabaseManager(json_path))
+
+        sqlite_db = SQLiteDatabaseManager(os.path.join(tmp, "db.sqlite3"))
+        sqlite_db.import_data(data)
+        _check_backend(sqlite_db)
+
+        try:
+            sqlite_db.get_page("proposed_slots")
+            assert False, "unsupported table should raise"
+        except ValueError:
+            pass
+    print("✓ JSON and SQLite backends page in (created_at, id) order")
+
+
+if __name__ == "__main__":
+    test_cursor_round_trip()
+    test_backends_page_in_keyset_order()
+    print("✅ Pagination tests passed!")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for compact JSON serialization (encoders, fallback, JSON backend snapshots)
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+
+from db_manager import DatabaseManager
+from serialization import dumps, dumps_bytes, loads
+
+
+def test_compact_and_pretty():
+    """Compact by default, indented on request, both decode to the same value"""
+    obj = {"name": "Zoë", "expertise": ["AI", "B2B"], "stats": {"score": 1.5, "active": True, "bio": None}}
+    compact = dumps(obj)
+    pretty = dumps(obj, pretty=True)
+    assert "\n" not in compact and ", " not in compact and ": " not in compact
+    assert compact == json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    assert pretty == json.dumps(obj, indent=2, ensure_ascii=False)
+    assert len(compact) < len(pretty)
+    assert loads(compact) == loads(pretty.encode("utf-8")) == obj
+    assert dumps_bytes(obj) == compact.encode("utf-8")
+    print("✓ Compact by default, pretty on request, identical round-trip")
+
+
+def test_fallback_and_default():
+    """Values the fast encoder rejects fall back to the stdlib; default handles the rest"""
+    big = {"id": 2 ** 70}
+    assert loads(dumps(big)) == big
+
+    stamp = datetime(2025, 1, 2, 3, 4, 5)
+    encoded = dumps({"at": stamp, "tags": {"x"}}, default=lambda o: sorted(o) if isinstance(o, set) else str(o))
+    assert loads(encoded)["tags"] == ["x"]
+    assert loads(encoded)["at"] == str(stamp)
+    try:
+        dumps({"tags": {"x"}})
+        assert False, "unsupported type without default should raise"
+    except TypeError:
+        pass
+    print("✓ Stdlib fallback and default hook")
+
+
+def test_json_backend_snapshots():
+    """Snapshots are compact unless the manager is created with pretty=True"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for pretty in (False, True):
+            path = os.path.join(tmp, f"db-{pretty}.json")
+            db = DatabaseManager(path, pretty=pretty)
+            user = db.create_user("Ada", "ada@example.com", "Analytical")
+            db.compact()
+            with open(path) as f:
+                text = f.read()
+            assert ("\n  " in text) == pretty
+            assert DatabaseManager(path).get_user(user["id"])["email"] == "ada@example.com"
+    print("✓ JSON backend writes compact snapshots by default")
+
+
+if __name__ == "__main__":
+    test_compact_and_pretty()
+    test_fallback_and_default()
+    test_json_backend_snapshots()
+    print("✅ Serialization tests passed!")
@@ -3,6 +3,10 @@
 Test script to verify skill-based filtering functionality
 """
 
+import os
+import shutil
+import tempfile
+
 from db_manager import DatabaseManager
 
 def test_skill_based_filtering():
@@ -12,8 +16,13 @@ def test_skill_based_filtering():
     print("TESTING SKILL-BASED FILTERING FEATURE")
     print("=" * 80)
     
-    # Initialize database
-    db = DatabaseManager('database.json')
+    # Initialize database (a copy, so the test never writes to the fixture)
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy('database.json', os.path.join(tmp, 'database.json'))
+        _run_skill_filtering(DatabaseManager(os.path.join(tmp, 'database.json')))
+
+
+def _run_skill_filtering(db):
     
     # 1. Test user skills storage
     print("\n1. Testing User Skills Storage:")
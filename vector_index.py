@@ -0,0 +1,273 @@
+"""
+Vector Index for Founder Matching System
+Pluggable top-k cosine search over normalized embeddings (flat or IVF)
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows of a float32 matrix (zero rows are left as zeros)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first"""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < scores.shape[0]:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(scores.shape[0])
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class FlatIndex:
+    """Exact brute-force index: one normalized matrix, one product per query
+
+    Vectors live in a single contiguous, preallocated float32 buffer that
+    grows geometrically, so adds are amortized O(1) and a query is one
+    matrix-vector product plus argpartition. Norms are computed once, on
+    insert, and never again.
+    """
+
+    def __init__(self, dim: Optional[int] = None, capacity: int = 0):
+        self.dim = dim
+        self.ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._buffer = np.empty((capacity, dim or 0), dtype=np.float32)
+
+    @classmethod
+    def from_matrix(cls, ids: Sequence[str], vectors: np.ndarray) -> "FlatIndex":
+        """Wrap an already-normalized matrix without copying it
+
+        Meant for read-only memory maps (see EmbeddingMatrix); the matrix
+        is copied into a private buffer only if the index is later modified.
+        """
+        if len(ids) != vectors.shape[0]:
+            raise ValueError("ids and vectors must have the same length")
+        index = cls(dim=vectors.shape[1])
+        index.ids = list(ids)
+        index._row_of = {item_id: row for row, item_id in enumerate(index.ids)}
+        index._buffer = vectors
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._row_of
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """View of the live rows of the buffer (no copy)"""
+        return self._buffer[:len(self.ids)]
+
+    def _reserve(self, rows: int):
+        """Grow the buffer to hold at least `rows` vectors (copying a read-only one)"""
+        capacity = self._buffer.shape[0]
+        if rows <= capacity and self._buffer.shape[1] == self.dim and self._buffer.flags.writeable:
+            return
+        buffer = np.empty((max(rows, 2 * capacity, 16), self.dim), dtype=np.float32)
+        if self._buffer.shape[1] == self.dim:
+            buffer[:len(self.ids)] = self.vectors
+        self._buffer = buffer
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        """Insert or replace vectors for the given ids"""
+        vectors = normalize(vectors)
+        if len(ids) != vectors.shape[0]:
+            raise ValueError("ids and vectors must have the same length")
+        if not len(ids):
+            return
+        if self.dim is None or not len(self.ids):
+            self.dim = vectors.shape[1]
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+        self._reserve(len(self.ids) + len(ids))
+        for item_id, vector in zip(ids, vectors):
+            row = self._row_of.get(item_id)
+            if row is None:
+                row = len(self.ids)
+                self._row_of[item_id] = row
+                self.ids.append(item_id)
+            self._buffer[row] = vector
+
+    def remove(self, ids: Sequence[str]):
+        """Remove ids (unknown ids are ignored); the last row fills the gap"""
+        self._reserve(len(self.ids))
+        for item_id in ids:
+            row = self._row_of.pop(item_id, None)
+            if row is None:
+                continue
+            last = len(self.ids) - 1
+            if row != last:
+                moved_id = self.ids[last]
+                self.ids[row] = moved_id
+                self._buffer[row] = self._buffer[last]
+                self._row_of[moved_id] = row
+            self.ids.pop()
+
+    def get(self, item_id: str) -> Optional[np.ndarray]:
+        """Return the stored normalized vector for an id"""
+        row = self._row_of.get(item_id)
+        return None if row is None else self.vectors[row]
+
+    def search(self, query: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """Return up to k (id, cosine similarity) pairs, best first"""
+        if not self.ids:
+            return []
+        query = np.asarray(query, dtype=np.float32).ravel()
+        # Stored rows are unit length, so only the query's norm is needed
+        query_norm = float(np.sqrt(query @ query)) or 1.0
+        scores = self.vectors @ query
+        return [(self.ids[i], float(scores[i]) / query_norm) for i in _top_k(scores, k)]
+
+
+class IVFIndex:
+    """Inverted-file index: k-means cells, search probes the nprobe closest cells
+
+    Until `train_threshold` vectors have been added everything lives in a
+    single flat cell (exact search). After training, each query scores the
+    centroids plus the members of `nprobe` cells, which is sublinear in the
+    collection size.
+
+    IVF trades recall for speed: neighbours in cells that are not probed are
+    missed. When `nprobe` is None it is set from the number of cells
+    (3.5 * sqrt(nlist)), which keeps recall@10 at 0.9 or above in
+    benchmark_vector_index.py. Below a few tens of thousands of vectors the
+    flat index is both exact and faster.
+    """
+
+    def __init__(self, dim: Optional[int] = None, nlist: Optional[int] = None,
+                 nprobe: Optional[int] = None, train_threshold: int = 1024, seed: int = 0):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.cells: List[FlatIndex] = [FlatIndex(dim)]
+        self._cell_of: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._cell_of
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def probes(self) -> int:
+        """Cells scanned per query (the explicit nprobe, or the recall-oriented default)"""
+        if self.nprobe:
+            return self.nprobe
+        if not self.is_trained:
+            return 1
+        return math.ceil(3.5 * math.sqrt(len(self.centroids)))
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        """Insert or replace vectors, training the coarse quantizer when large enough"""
+        vectors = normalize(vectors)
+        if len(ids) != vectors.shape[0]:
+            raise ValueError("ids and vectors must have the same length")
+        if not len(ids):
+            return
+        self.dim = self.dim or vectors.shape[1]
+
+        self.remove([i for i in ids if i in self._cell_of])
+        cells = self._assign(vectors) if self.is_trained else np.zeros(len(ids), dtype=np.int64)
+        for cell in np.unique(cells):
+            members = np.flatnonzero(cells == cell)
+            self.cells[cell].add([ids[m] for m in members], vectors[members])
+            for m in members:
+                self._cell_of[ids[m]] = int(cell)
+
+        if not self.is_trained and len(self) >= self.train_threshold:
+            self.train()
+
+    def remove(self, ids: Sequence[str]):
+        """Remove ids (unknown ids are ignored)"""
+        for item_id in ids:
+            cell = self._cell_of.pop(item_id, None)
+            if cell is not None:
+                self.cells[cell].remove([item_id])
+
+    def get(self, item_id: str) -> Optional[np.ndarray]:
+        cell = self._cell_of.get(item_id)
+        return None if cell is None else self.cells[cell].get(item_id)
+
+    def train(self, iterations: int = 10):
+        """(Re)build the k-means cells from every stored vector"""
+        ids = [i for cell in self.cells for i in cell.ids]
+        if not ids:
+            return
+        vectors = np.vstack([cell.vectors for cell in self.cells if len(cell)])
+        nlist = self.nlist or max(1, int(np.sqrt(len(ids))))
+        nlist = min(nlist, len(ids))
+
+        rng = np.random.default_rng(self.seed)
+        centroids = vectors[rng.choice(len(ids), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = vectors[assignments == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = normalize(centroids)
+
+        self.centroids = centroids
+        self.cells = [FlatIndex(self.dim) for _ in range(nlist)]
+        self._cell_of = {}
+        assignments = self._assign(vectors)
+        for c in range(nlist):
+            members = np.flatnonzero(assignments == c)
+            if len(members):
+                self.cells[c].add([ids[m] for m in members], vectors[members])
+                for m in members:
+                    self._cell_of[ids[m]] = c
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1)
+
+    def search(self, query: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """Return up to k approximate (id, cosine similarity) pairs, best first"""
+        query = normalize(query)[0]
+        if self.is_trained:
+            probe = _top_k(self.centroids @ query, self.probes)
+        else:
+            probe = [0]
+
+        results = []
+        for cell in probe:
+            results.extend(self.cells[cell].search(query, k))
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results[:k]
+
+
+INDEX_BACKENDS = {
+    "flat": FlatIndex,
+    "ivf": IVFIndex,
+}
+
+
+def create_index(backend: str = "flat", **kwargs):
+    """Create a vector index by backend name ("flat" or "ivf")"""
+    try:
+        index_class = INDEX_BACKENDS[backend.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown vector index backend: {backend}. Choose from {sorted(INDEX_BACKENDS)}")
+    return index_class(**kwargs)